@@ -0,0 +1,90 @@
+"""
+Наибольшая задержка цикла событий asyncio при загрузке, сохранении
+и запросах к задачам: вызовы TaskManager прямо в цикле событий
+и через AsyncTaskManager.
+
+Запуск: python -m benchmarks.bench_async [размер ...]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import make_manager, print_table
+from task_async import AsyncTaskManager
+from task_manager import TaskManager
+from task_query import Query
+
+QUERY = Query().where(status='Не выполнена').order_by('-priority', 'id')
+
+
+async def measure(operation):
+    """
+    Выполняет операцию и возвращает ее время и наибольший интервал
+    между срабатываниями таймера с периодом 1 мс.
+    """
+    stalls = [0.0]
+    running = True
+
+    async def ticker():
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls[0] = max(stalls[0], now - last)
+            last = now
+
+    tick = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await operation()
+    elapsed = time.perf_counter() - start
+    running = False
+    await tick
+    return elapsed, stalls[0]
+
+
+async def run(file_name, rows, n):
+    async def sync_load():
+        sync_load.manager = TaskManager(file_name)
+
+    async def sync_save():
+        sync_load.manager.save_tasks(file_name)
+
+    async def sync_query():
+        sync_load.manager.query(QUERY)
+
+    async def async_load():
+        async_load.manager = await AsyncTaskManager.open(file_name)
+
+    async def async_save():
+        await async_load.manager.save_tasks()
+
+    async def async_query():
+        async for _ in async_load.manager.iter_query(QUERY):
+            pass
+
+    for name, operation in (('load', sync_load), ('save', sync_save),
+                            ('query', sync_query), ('load', async_load),
+                            ('save', async_save), ('query', async_query)):
+        kind = 'async' if operation.__name__.startswith('async') else 'sync'
+        elapsed, stall = await measure(operation)
+        rows.append((n, kind, name, f'{elapsed * 1000:.0f}',
+                     f'{stall * 1000:.1f}'))
+    await async_load.manager.close()
+
+
+def main(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            file_name = os.path.join(directory, f'tasks{n}.json')
+            make_manager(n).save_tasks(file_name)
+            asyncio.run(run(file_name, rows, n))
+    print_table(['tasks', 'manager', 'operation', 'ms', 'max stall ms'],
+                rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000])
@@ -0,0 +1,51 @@
+"""
+Сравнение добавления задач по одной через add_task, пакетом через
+add_tasks_bulk и импорта из файлов CSV и JSON Lines.
+
+Запуск: python -m benchmarks.bench_bulk [размер ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import make_task_dicts, print_table
+from task_manager import TaskManager
+from task_transfer import export_tasks, import_tasks
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            records = list(make_task_dicts(n))
+
+            def add_one_by_one():
+                manager = TaskManager('')
+                for data in records:
+                    manager.add_task(data['title'], data['description'],
+                                     data['category'], data['due_date'],
+                                     data['priority'])
+
+            manager = TaskManager('')
+            rows.append((n, 'add_task', f'{measure(add_one_by_one):.2f}'))
+            bulk = measure(lambda: manager.add_tasks_bulk(records))
+            rows.append((n, 'add_tasks_bulk', f'{bulk:.2f}'))
+            for extension in ('csv', 'jsonl'):
+                file_name = os.path.join(directory, f'tasks.{extension}')
+                export = measure(lambda: export_tasks(manager, file_name))
+                target = TaskManager('')
+                load = measure(lambda: import_tasks(target, file_name))
+                rows.append((n, f'import {extension}', f'{load:.2f}'))
+                rows.append((n, f'export {extension}', f'{export:.2f}'))
+    print_table(['tasks', 'operation', 'seconds'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,55 @@
+"""
+Повторные запросы меню (список категорий, все задачи, поиск
+по ключевому слову) с кэшем результатов запросов и без него.
+
+Запуск: python -m benchmarks.bench_cache [размер ...]
+"""
+import os
+import sys
+import tempfile
+
+from benchmarks.common import make_manager, print_table, timeit
+from task_manager import TaskManager
+
+
+def prompt(manager):
+    manager.get_categories()
+    manager.get_tasks()
+    manager.get_tasks_by_keyword('отчет')
+
+
+def change(manager):
+    task = manager.get_task(1)
+    task.priority = 'Высокий' if task.priority != 'Высокий' else 'Низкий'
+    prompt(manager)
+
+
+def main(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            source = make_manager(n)
+            for store in ('memory', 'columnar', 'sqlite'):
+                file_name = os.path.join(directory, f'{store}{n}.db')
+                if store == 'sqlite':
+                    source.save_tasks(file_name)
+                times = []
+                for cache in (False, True):
+                    if store == 'sqlite':
+                        manager = TaskManager(file_name, cache=cache)
+                    else:
+                        manager = make_manager(
+                            n, columnar=store == 'columnar', cache=cache)
+                    times.append(timeit(lambda: prompt(manager)))
+                    times.append(timeit(lambda: change(manager)))
+                    stats = manager.cache_stats
+                    manager.close()
+                rows.append((n, store,
+                             *(f'{time * 1000:.1f}' for time in times),
+                             f'{stats.hits}/{stats.misses}'))
+    print_table(['tasks', 'store', 'no cache, ms', 'change, ms',
+                 'cached, ms', 'change, ms', 'hits/misses'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,52 @@
+"""
+Время одного вызова командной строки (python -m task_cli)
+для файлов задач разных форматов, включая запуск интерпретатора.
+
+Запуск: python -m benchmarks.bench_cli [размер ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import make_manager, print_table
+
+EXTENSIONS = ('json', 'json.gz', 'snapshot', 'db')
+COMMANDS = (('list --status', ['list', '{}', '--status', 'Выполнена']),
+            ('list --limit 20', ['list', '{}', '--status', 'Выполнена',
+                                 '--limit', '20']),
+            ('stats', ['stats', '{}']))
+
+
+def invoke(args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'task_cli'] + args,
+                       check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes):
+    rows = []
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import task_cli'], check=True)
+    rows.append(('-', '-', 'import task_cli',
+                 f'{(time.perf_counter() - start) * 1000:.0f}'))
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            manager = make_manager(n)
+            for extension in EXTENSIONS:
+                file_name = os.path.join(directory, f'tasks{n}.{extension}')
+                manager.save_tasks(file_name)
+                for name, args in COMMANDS:
+                    args = [arg.format(file_name) for arg in args]
+                    rows.append((n, extension, name,
+                                 f'{invoke(args) * 1000:.0f}'))
+    print_table(['tasks', 'format', 'command', 'ms'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000])
@@ -0,0 +1,54 @@
+"""
+Сравнение размера, времени сохранения и загрузки файла задач
+без сжатия и со сжатием gzip, bz2 и xz.
+
+Запуск: python -m benchmarks.bench_codecs [размер ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import make_manager, print_table
+from task_json import iter_json_array, open_tasks
+from task_manager import TaskManager
+
+EXTENSIONS = ('.json', '.json.gz', '.json.bz2', '.json.xz')
+
+
+def main(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            manager = make_manager(n)
+            plain = None
+            for extension in EXTENSIONS:
+                file_name = os.path.join(directory, f'tasks{n}{extension}')
+                start = time.perf_counter()
+                manager.save_tasks(file_name)
+                save = time.perf_counter() - start
+                size = os.path.getsize(file_name)
+                plain = plain or size
+                start = time.perf_counter()
+                loaded = TaskManager(file_name)
+                load = time.perf_counter() - start
+                assert loaded.size == n
+                del loaded
+                # Пиковая память чтения без объектов задач: при потоковой
+                # распаковке она не зависит от размера файла.
+                tracemalloc.start()
+                with open_tasks(file_name) as file:
+                    for _ in iter_json_array(file):
+                        pass
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                rows.append((n, extension, f'{size / 2 ** 20:.1f}',
+                             f'{plain / size:.1f}', f'{save * 1000:.0f}',
+                             f'{load * 1000:.0f}', f'{peak / 2 ** 10:.0f}'))
+    print_table(['tasks', 'format', 'size, MiB', 'ratio', 'save, ms',
+                 'load, ms', 'read peak, KiB'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000])
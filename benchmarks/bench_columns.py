@@ -0,0 +1,39 @@
+"""
+Сравнение хранилища объектов Task и столбцового хранилища
+на запросах по категории и статусу.
+
+Запуск: python -m benchmarks.bench_columns [размер ...]
+"""
+import sys
+import tracemalloc
+
+from benchmarks.common import make_manager, print_table, timeit
+
+
+def build(n, columnar):
+    tracemalloc.start()
+    manager = make_manager(n, columnar=columnar, cache=False)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return manager, size
+
+
+def main(sizes):
+    rows = []
+    for n in sizes:
+        for columnar in (False, True):
+            manager, size = build(n, columnar)
+            category = timeit(lambda: manager.get_tasks('Дом'))
+            status = timeit(
+                lambda: manager.get_tasks_by_status('Выполнена'))
+            categories = timeit(manager.get_categories)
+            rows.append((n, 'columnar' if columnar else 'memory',
+                         f'{size / n:.0f}', f'{category * 1000:.1f}',
+                         f'{status * 1000:.1f}',
+                         f'{categories * 1000:.3f}'))
+    print_table(['tasks', 'store', 'bytes/task', 'category, ms',
+                 'status, ms', 'categories, ms'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,54 @@
+"""
+Разбор сроков выполнения: datetime.strptime по сравнению
+с task_date.parse_date (date.fromisoformat и запоминание дат),
+и загрузка файла задач JSON.
+
+Запуск: python -m benchmarks.bench_dates [размер ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.common import (make_manager, make_task_dicts, print_table,
+                               timeit)
+from task_date import parse_date
+from task_manager import TaskManager
+
+
+def strptime_all(values):
+    for value in values:
+        datetime.strptime(value, '%Y-%m-%d').toordinal()
+
+
+def parse_all(values, cold):
+    if cold:
+        parse_date.cache_clear()
+    for value in values:
+        parse_date(value)
+
+
+def main(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            values = [data['due_date'] for data in make_task_dicts(n)]
+            strptime = timeit(lambda: strptime_all(values), repeat=3)
+            cold = timeit(lambda: parse_all(values, True), repeat=3)
+            warm = timeit(lambda: parse_all(values, False), repeat=3)
+            file_name = os.path.join(directory, f'tasks{n}.json')
+            make_manager(n).save_tasks(file_name)
+            parse_date.cache_clear()
+            start = time.perf_counter()
+            TaskManager(file_name)
+            load = time.perf_counter() - start
+            rows.append((n, len(set(values)), f'{strptime * 1000:.0f}',
+                         f'{cold * 1000:.0f}', f'{warm * 1000:.0f}',
+                         f'{strptime / cold:.0f}x', f'{load * 1000:.0f}'))
+    print_table(['tasks', 'dates', 'strptime, ms', 'parse_date, ms',
+                 'memo warm, ms', 'speedup', 'json load, ms'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
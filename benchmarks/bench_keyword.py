@@ -0,0 +1,37 @@
+"""
+Сравнение поиска по ключевым словам полным перебором
+и через инвертированный индекс.
+
+Запуск: python -m benchmarks.bench_keyword [размер ...]
+"""
+import sys
+
+from benchmarks.common import make_manager, print_table, timeit
+
+QUERIES = ('отчет', 'клиен', 'купить молоко', 'server', 'e')
+
+
+def main(sizes):
+    rows = []
+    for n in sizes:
+        manager = make_manager(n, text_index=True, cache=False)
+        scan = make_manager(n, cache=False)
+        for keyword in QUERIES:
+            scan_time = timeit(lambda: scan.get_tasks_by_keyword(keyword))
+            index_time = timeit(
+                lambda: manager.get_tasks_by_keyword(keyword))
+            found = len(manager.get_tasks_by_keyword(keyword))
+            rows.append((n, repr(keyword), found,
+                         f'{scan_time * 1000:.1f}',
+                         f'{index_time * 1000:.1f}',
+                         f'{scan_time / index_time:.1f}x'))
+        prefix_time = timeit(lambda: manager.search_tasks('куп мол'))
+        rows.append((n, "search 'куп мол'",
+                     len(manager.search_tasks('куп мол')), '-',
+                     f'{prefix_time * 1000:.1f}', '-'))
+    print_table(['tasks', 'query', 'found', 'scan, ms', 'index, ms',
+                 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,40 @@
+"""
+Масштабирование поиска по ключевому слову в нескольких процессах
+(ParallelSearcher) по сравнению с поиском в хранилище в памяти.
+
+Запуск: python -m benchmarks.bench_parallel [размер [процессы]]
+"""
+import os
+import sys
+
+from benchmarks.common import make_manager, print_table, timeit
+from task_parallel import ParallelSearcher
+
+KEYWORDS = ('отчет', 'release', 'zzz')
+
+
+def main(n, max_workers):
+    manager = make_manager(n, parallel=False, cache=False)
+    tasks = manager._store.by_category()
+    rows = []
+    for keyword in KEYWORDS:
+        serial = timeit(lambda: manager.get_tasks_by_keyword(keyword))
+        rows.append((n, keyword, 'store', '-', f'{serial * 1000:.1f}', '1.0'))
+    for workers in range(1, max_workers + 1):
+        searcher = ParallelSearcher(workers)
+        build = timeit(lambda: searcher.build(tasks), repeat=1)
+        searcher.search(KEYWORDS[0])
+        for keyword in KEYWORDS:
+            serial = timeit(lambda: manager.get_tasks_by_keyword(keyword))
+            best = timeit(lambda: searcher.search(keyword))
+            rows.append((n, keyword, f'{workers} proc',
+                         f'{build * 1000:.0f}', f'{best * 1000:.1f}',
+                         f'{serial / best:.1f}'))
+        searcher.close()
+    print_table(['tasks', 'keyword', 'search', 'build ms', 'ms', 'speedup'],
+                rows)
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [200_000, os.cpu_count() or 1][len(args):]))
@@ -0,0 +1,107 @@
+"""
+Нагрузочный тест сервера задач (python -m task_server): число запросов
+в секунду и задержки p50/p99 при смешанной нагрузке из нескольких
+клиентов с keep-alive соединениями.
+
+Запуск: python -m benchmarks.bench_server [размер [клиенты [запросы]]]
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.client import HTTPConnection
+from statistics import quantiles
+from urllib.parse import quote
+
+from benchmarks.common import CATEGORIES, make_manager, print_table
+
+EXTENSIONS = ('json', 'db')
+# Доли запросов в смешанной нагрузке.
+MIX = (('GET /tasks/<id>', 0.4),
+       ('GET /tasks?category&limit', 0.4),
+       ('PATCH /tasks/<id>', 0.15),
+       ('POST /tasks', 0.05))
+
+
+def start_server(file_name, workers):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'task_server', file_name, '--port', '0',
+         '--workers', str(workers)],
+        stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    port = int(line.rsplit(':', 1)[1])
+    return process, port
+
+
+def client(port, n, requests, seed, latencies):
+    rng = random.Random(seed)
+    connection = HTTPConnection('127.0.0.1', port)
+    names = [name for name, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    headers = {'Content-Type': 'application/json'}
+    for name in rng.choices(names, weights, k=requests):
+        task_id = rng.randint(1, n)
+        if name == 'GET /tasks/<id>':
+            args = ('GET', f'/tasks/{task_id}')
+        elif name == 'GET /tasks?category&limit':
+            category = quote(rng.choice(CATEGORIES))
+            args = ('GET', f'/tasks?category={category}&limit=20')
+        elif name == 'PATCH /tasks/<id>':
+            body = {'priority': rng.choice(['Низкий', 'Высокий'])}
+            args = ('PATCH', f'/tasks/{task_id}', json.dumps(body))
+        else:
+            body = {'title': 'Новая', 'description': 'Нагрузка',
+                    'category': 'Нагрузка', 'due_date': '2025-01-01',
+                    'priority': 'Средний'}
+            args = ('POST', '/tasks', json.dumps(body))
+        start = time.perf_counter()
+        connection.request(*args, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        assert response.status < 300, (args, response.status)
+    connection.close()
+
+
+def run(port, n, clients, requests):
+    latencies = []
+    threads = [threading.Thread(target=client,
+                                args=(port, n, requests, seed, latencies))
+               for seed in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    percentiles = quantiles(latencies, n=100)
+    return (len(latencies) / elapsed, percentiles[49] * 1000,
+            percentiles[98] * 1000)
+
+
+def main(n, clients, requests):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        manager = make_manager(n)
+        for extension in EXTENSIONS:
+            file_name = os.path.join(directory, f'tasks.{extension}')
+            manager.save_tasks(file_name)
+            process, port = start_server(file_name, clients)
+            try:
+                rps, p50, p99 = run(port, n, clients, requests)
+            finally:
+                process.terminate()
+                process.wait()
+            rows.append((n, extension, clients, f'{rps:.0f}', f'{p50:.2f}',
+                         f'{p99:.2f}'))
+    print_table(['tasks', 'format', 'clients', 'req/s', 'p50 ms', 'p99 ms'],
+                rows)
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [10_000, 8, 500][len(args):]))
@@ -0,0 +1,42 @@
+"""
+Сравнение открытия файла задач JSON и двоичного снимка
+и времени первых запросов после открытия.
+
+Запуск: python -m benchmarks.bench_snapshot [размер ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import make_manager, print_table, timeit
+from task_manager import TaskManager
+
+
+def main(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            manager = make_manager(n)
+            for extension in ('json', 'snapshot'):
+                file_name = os.path.join(directory, f'tasks{n}.{extension}')
+                start = time.perf_counter()
+                manager.save_tasks(file_name)
+                save = time.perf_counter() - start
+                start = time.perf_counter()
+                loaded = TaskManager(file_name, cache=False)
+                load = time.perf_counter() - start
+                first = timeit(lambda: loaded.get_task(n // 2))
+                category = timeit(lambda: loaded.get_tasks('Дом'))
+                rows.append((n, extension,
+                             f'{os.path.getsize(file_name) / n:.0f}',
+                             f'{save * 1000:.0f}', f'{load * 1000:.1f}',
+                             f'{first * 1e6:.1f}',
+                             f'{category * 1000:.1f}'))
+                loaded.close()
+    print_table(['tasks', 'format', 'bytes/task', 'save, ms', 'open, ms',
+                 'get_task, µs', 'category, ms'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,49 @@
+"""
+Замер памяти на одну задачу и времени загрузки файла задач.
+
+Запуск: python -m benchmarks.bench_task_memory [размер ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import make_task_dicts, print_table
+from task import Task
+from task_manager import TaskManager
+
+
+def bytes_per_task(text: str) -> float:
+    """
+    Возвращает объем памяти, который удерживают задачи,
+    загруженные из JSON, в пересчете на одну задачу.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [Task.from_dict(data) for data in json.loads(text)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(tasks)
+
+
+def main(sizes):
+    rows = []
+    for n in sizes:
+        text = json.dumps(list(make_task_dicts(n)))
+        per_task = bytes_per_task(text)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tasks.json')
+            with open(path, 'w') as file:
+                file.write(text)
+            start = time.perf_counter()
+            manager = TaskManager(path)
+            load_time = time.perf_counter() - start
+            assert manager.size == n
+        rows.append((n, f'{per_task:.0f}', f'{load_time:.2f}'))
+    print_table(['tasks', 'bytes/task', 'load, s'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,76 @@
+"""
+Набор файлов задач по категориям (Workspace) по сравнению с одним
+файлом: первый запрос по категории, загрузка всех задач и сохранение
+после изменения одной задачи.
+
+Запуск: python -m benchmarks.bench_workspace [размер ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import make_manager, print_table
+from task_manager import TaskManager
+from task_workspace import Workspace, split_by_category
+
+EXTENSIONS = ('.json', '.snapshot')
+
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def change(tasks):
+    task = tasks[0]
+    task.priority = 'Низкий' if task.priority != 'Низкий' else 'Высокий'
+
+
+def bench_single(file_name):
+    load, manager = measure(lambda: TaskManager(file_name))
+    query, _ = measure(lambda: manager.get_tasks('Работа'))
+    change(manager.get_tasks('Работа'))
+    save, _ = measure(lambda: manager.save_tasks(file_name))
+    manager.close()
+    return load + query, load, save
+
+
+def bench_workspace(files, workers):
+    workspace = Workspace(files, by_category=True, workers=workers)
+    query, _ = measure(lambda: workspace.get_tasks('Работа'))
+    workspace.close()
+    workspace = Workspace(files, by_category=True, workers=workers)
+    load, _ = measure(workspace.load)
+    change(workspace.get_tasks('Работа'))
+    save, saved = measure(workspace.save)
+    assert len(saved) == 1
+    workspace.close()
+    return query, load, save
+
+
+def main(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            manager = make_manager(n)
+            for extension in EXTENSIONS:
+                file_name = os.path.join(directory, f'tasks{n}{extension}')
+                manager.save_tasks(file_name)
+                files = split_by_category(
+                    file_name, os.path.join(directory, f'shards{n}'),
+                    extension)
+                results = [('one file', bench_single(file_name))]
+                for workers in (1, 4):
+                    results.append((f'{len(files)} shards, {workers} thr',
+                                    bench_workspace(files, workers)))
+                for name, times in results:
+                    rows.append((n, extension, name,
+                                 *(f'{value * 1000:.0f}' for value in times)))
+    print_table(['tasks', 'format', 'storage', 'first category ms',
+                 'load all ms', 'save ms'], rows)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000])
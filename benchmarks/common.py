@@ -0,0 +1,88 @@
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from task_manager import TaskManager
+
+WORDS = ('купить', 'молоко', 'хлеб', 'отчет', 'позвонить', 'клиент',
+         'встреча', 'проект', 'сервер', 'релиз', 'ошибка', 'тест',
+         'документация', 'бюджет', 'договор', 'счет', 'оплата', 'ремонт',
+         'машина', 'врач', 'report', 'deploy', 'review', 'invoice',
+         'meeting', 'backup', 'release', 'migration', 'database', 'design')
+CATEGORIES = ('Работа', 'Дом', 'Учеба', 'Здоровье', 'Финансы',
+              'Покупки', 'Проекты', 'Разное')
+PRIORITIES = ('Низкий', 'Средний', 'Высокий')
+STATUSES = ('Не выполнена', 'Выполнена')
+
+
+def make_task_dicts(n: int, seed: int = 0) -> Iterator[Dict]:
+    """
+    Генерирует словари задач со случайными, но воспроизводимыми данными.
+
+    :param n: Количество задач.
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Итератор словарей в формате Task.to_dict.
+    """
+    rng = random.Random(seed)
+    for task_id in range(1, n + 1):
+        title = ' '.join(rng.choices(WORDS, k=3)) + f' {task_id % 997}'
+        description = ' '.join(rng.choices(WORDS, k=8))
+        yield {
+            'id': task_id,
+            'title': title.capitalize(),
+            'description': description.capitalize(),
+            'category': rng.choice(CATEGORIES),
+            'due_date': f'{rng.randint(2023, 2026)}-'
+                        f'{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'priority': rng.choice(PRIORITIES),
+            'status': rng.choice(STATUSES),
+        }
+
+
+def make_manager(n: int, seed: int = 0, **kwargs) -> TaskManager:
+    """
+    Создает менеджер задач, заполненный сгенерированными задачами.
+
+    :param n: Количество задач.
+    :param seed: Начальное значение генератора случайных чисел.
+    :param kwargs: Дополнительные параметры TaskManager.
+    :return: Менеджер задач.
+    """
+    manager = TaskManager('', **kwargs)
+    for data in make_task_dicts(n, seed):
+        manager.add_task(data['title'], data['description'],
+                         data['category'], data['due_date'],
+                         data['priority'])
+        if data['status'] != 'Не выполнена':
+            manager.get_task(data['id']).status = data['status']
+    return manager
+
+
+def timeit(func: Callable, repeat: int = 5) -> float:
+    """
+    Возвращает лучшее время выполнения функции в секундах.
+
+    :param func: Функция без аргументов.
+    :param repeat: Количество повторов.
+    :return: Минимальное время одного вызова.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_table(headers: List[str], rows: List[Tuple]) -> None:
+    """
+    Выводит результаты замеров в виде простой таблицы.
+
+    :param headers: Заголовки столбцов.
+    :param rows: Строки таблицы.
+    """
+    widths = [max(len(str(cell)) for cell in column)
+              for column in zip(headers, *rows)]
+    for row in [headers, *rows]:
+        print('  '.join(str(cell).rjust(width)
+                        for cell, width in zip(row, widths)))
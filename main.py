@@ -1,7 +1,15 @@
-from task_io import (print_tasks, input_category, input_date,
+import sys
+
+from task_io import (browse_tasks, input_category, input_date,
                      input_str, input_priority, input_task, input_status,
-                     print_menu, print_edit_menu, print_search_menu)
+                     print_menu, print_edit_menu, print_search_menu,
+                     print_load_progress, print_categories,
+                     input_optional_choice, input_optional_date)
+from task import PRIORITIES, STATUSES
 from task_manager import TaskManager
+from task_query import Query
+from task_snapshot import is_snapshot_file
+from task_sqlite import is_sqlite_file
 
 
 def handle_view_tasks(task_manager: TaskManager) -> None:
@@ -10,8 +18,7 @@ def handle_view_tasks(task_manager: TaskManager) -> None:
 
     :param task_manager: Экземпляр класса TaskManager, управляющий задачами.
     """
-    tasks = task_manager.get_tasks(category=None)
-    print_tasks(tasks)
+    browse_tasks(task_manager.iter_tasks(category=None))
 
 
 def handle_view_tasks_group_by_categories(task_manager: TaskManager) -> None:
@@ -20,11 +27,10 @@ def handle_view_tasks_group_by_categories(task_manager: TaskManager) -> None:
 
     :param task_manager: Экземпляр класса TaskManager, управляющий задачами.
     """
-    categories = task_manager.get_categories()
-    tasks = task_manager.get_tasks(category=None)
-    for i, category in enumerate(categories):
+    groups = task_manager.group_by('category')
+    for i, (category, tasks) in enumerate(groups.items()):
         print(f'\n{i + 1}. {category}')
-        print_tasks([task for task in tasks if task.category == category])
+        browse_tasks(tasks)
 
 
 def handle_add_task(task_manager: TaskManager) -> None:
@@ -55,41 +61,44 @@ def handle_edit_task(task_manager: TaskManager) -> None:
 
     :param task_manager: Экземпляр класса TaskManager, управляющий задачами.
     """
-    tasks = task_manager.get_tasks(category=None)
-    print_tasks(tasks)
+    browse_tasks(task_manager.iter_tasks(category=None))
     task = input_task('\nВведите id задачи, которую вы хотите изменить: ',
-                      tasks)
-    while True:
-        print_edit_menu(task)
-        edit_choice = input('\nВыберите действие: ')
-        match edit_choice:
-            case '1':
-                title = input_str('Введите название: ')
-                task.title = title
-            case '2':
-                description = input_str('\nВведите описание: ')
-                task.description = description
-            case '3':
-                categories = task_manager.get_categories()
-                category = input_category('\nВведите категорию: ', categories)
-                task.category = category
-            case '4':
-                due_date = input_date('\nВведите срок выполнения '
-                                      '(в формате ГГГГ-ММ-ДД): ')
-                task.due_date = due_date
-            case '5':
-                priority = input_priority('\nВведите приоритет (1 - низкий, '
-                                          '2 - средний, 3 - высокий): ')
-                task.priority = priority
-            case '6':
-                status = input_status('\nВведите статус (1 - "не выполнена",'
-                                      ' 2 - "выполнена"): ')
-                task.status = status
-            case '7':
-                print('\nРедактирование задачи завершено')
-                break
-            case _:
-                print('\nНекорректный ввод')
+                      task_manager)
+    with task_manager.batch():
+        while True:
+            print_edit_menu(task)
+            edit_choice = input('\nВыберите действие: ')
+            match edit_choice:
+                case '1':
+                    title = input_str('Введите название: ')
+                    task.title = title
+                case '2':
+                    description = input_str('\nВведите описание: ')
+                    task.description = description
+                case '3':
+                    categories = task_manager.get_categories()
+                    category = input_category('\nВведите категорию: ',
+                                              categories)
+                    task.category = category
+                case '4':
+                    due_date = input_date('\nВведите срок выполнения '
+                                          '(в формате ГГГГ-ММ-ДД): ')
+                    task.due_date = due_date
+                case '5':
+                    priority = input_priority('\nВведите приоритет '
+                                              '(1 - низкий, 2 - средний, '
+                                              '3 - высокий): ')
+                    task.priority = priority
+                case '6':
+                    status = input_status('\nВведите статус '
+                                          '(1 - "не выполнена", '
+                                          '2 - "выполнена"): ')
+                    task.status = status
+                case '7':
+                    print('\nРедактирование задачи завершено')
+                    break
+                case _:
+                    print('\nНекорректный ввод')
 
 
 def handle_delete_task(task_manager: TaskManager) -> None:
@@ -98,8 +107,7 @@ def handle_delete_task(task_manager: TaskManager) -> None:
 
     :param task_manager: Экземпляр класса TaskManager, управляющий задачами.
     """
-    tasks = task_manager.get_tasks(category=None)
-    print_tasks(tasks)
+    browse_tasks(task_manager.iter_tasks(category=None))
     while True:
         delete_str = input('\nВведите тип удаления (1 - по id задачи, '
                            '2 - по категории задачи): ')
@@ -107,7 +115,7 @@ def handle_delete_task(task_manager: TaskManager) -> None:
             case '1':
                 task = input_task('\nВведите id задачи, '
                                   'которую вы хотите удалить: ',
-                                  tasks)
+                                  task_manager)
                 task_manager.delete_task(task)
                 print(f'\nЗадача с id = {task.id} успешно удалена')
                 break
@@ -135,22 +143,58 @@ def handle_search_task(task_manager: TaskManager) -> None:
             case '1':
                 keyword = input_str('\nВведите ключевое слово: ')
                 tasks = task_manager.get_tasks_by_keyword(keyword=keyword)
-                print_tasks(tasks)
+                browse_tasks(tasks)
             case '2':
                 categories = task_manager.get_categories()
                 category = input_category('\nВведите категорию: ',
                                           categories, can_create=False)
-                tasks = task_manager.get_tasks(category=category)
-                print_tasks(tasks)
+                browse_tasks(task_manager.iter_tasks(category=category))
             case '3':
                 status = input_status('\nВведите статус (1 - "не выполнена",'
                                       ' 2 - "выполнена"): ')
                 tasks = task_manager.get_tasks_by_status(status=status)
-                print_tasks(tasks)
+                browse_tasks(tasks)
+            case '4':
+                browse_tasks(task_manager.query(input_query(task_manager)))
             case _:
                 print('\nНекорректный ввод')
 
 
+def input_query(task_manager: TaskManager) -> Query:
+    """
+    Запрашивает у пользователя условия поиска; любое условие
+    можно пропустить пустым вводом.
+
+    :param task_manager: Экземпляр класса TaskManager, управляющий задачами.
+    :return: Запрос со всеми введенными условиями.
+    """
+    query = Query()
+    keyword = input('\nВведите ключевое слово (Enter - пропустить): ')
+    if keyword:
+        query.keyword(keyword)
+    categories = task_manager.get_categories()
+    print_categories(categories)
+    category = input_optional_choice(
+        '\nВведите номер категории (Enter - пропустить): ', categories)
+    if category is not None:
+        query.where(category=category)
+    status = input_optional_choice('\nВведите статус (1 - "не выполнена", '
+                                   '2 - "выполнена", Enter - пропустить): ',
+                                   STATUSES)
+    if status is not None:
+        query.where(status=status)
+    priority = input_optional_choice('\nВведите приоритет (1 - низкий, '
+                                     '2 - средний, 3 - высокий, '
+                                     'Enter - пропустить): ', PRIORITIES)
+    if priority is not None:
+        query.where(priority=priority)
+    start = input_optional_date('\nВведите начало срока выполнения '
+                                '(ГГГГ-ММ-ДД, Enter - пропустить): ')
+    end = input_optional_date('\nВведите конец срока выполнения '
+                              '(ГГГГ-ММ-ДД, Enter - пропустить): ')
+    return query.due_between(start, end)
+
+
 def handle_save_tasks(task_manager: TaskManager) -> None:
     """
     Сохраняет список задач в указанный файл.
@@ -162,6 +206,19 @@ def handle_save_tasks(task_manager: TaskManager) -> None:
     task_manager.save_tasks(file_name)
 
 
+def handle_exit(task_manager: TaskManager) -> None:
+    """
+    Записывает несохраненные изменения и завершает программу.
+
+    Ожидание записи ограничено несколькими секундами.
+
+    :param task_manager: Экземпляр класса TaskManager, управляющий задачами.
+    """
+    if not task_manager.close():
+        print('\nНе все изменения успели сохраниться в файл задач')
+    exit()
+
+
 def main():
     """
     Основная функция программы.
@@ -172,7 +229,14 @@ def main():
     """
     storage_file = input('\nВведите название файла с '
                          'задачами (или оставьте пустым): ')
-    task_manager = TaskManager(storage_file)
+    task_manager = TaskManager(storage_file, on_progress=print_load_progress,
+                               shared=True)
+    if task_manager.load_error is not None:
+        print(f'\nФайл задач поврежден. {task_manager.load_error}. '
+              f'Загружено задач: {task_manager.size}')
+    elif (storage_file and not is_sqlite_file(storage_file)
+          and not is_snapshot_file(storage_file)):
+        task_manager.start_autosave()
     while True:
         print_menu(task_manager.size)
         choice = input('\nВыберите действие: ')
@@ -193,7 +257,7 @@ def main():
                 case '7':
                     handle_save_tasks(task_manager)
                 case '8':
-                    exit()
+                    handle_exit(task_manager)
                 case _:
                     print('\nНекорректный ввод.')
         else:
@@ -201,10 +265,13 @@ def main():
                 case '1':
                     handle_add_task(task_manager)
                 case '2':
-                    exit()
+                    handle_exit(task_manager)
                 case _:
                     print('\nНекорректный ввод.')
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        from task_cli import main as run_command
+        sys.exit(run_command())
     main()
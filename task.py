@@ -1,7 +1,46 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict
+import sys
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from task_date import parse_date, parse_stored_date
+
+PRIORITIES = ('Низкий', 'Средний', 'Высокий')
+STATUSES = ('Не выполнена', 'Выполнена')
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(PRIORITIES)}
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+def parse_due_date(value: str) -> int:
+    """
+    Проверяет срок выполнения и возвращает его порядковый номер дня.
+
+    :param value: Срок выполнения в формате 'ГГГГ-ММ-ДД'.
+    :return: Порядковый номер дня (date.toordinal).
+    :raise ValueError: Если срок выполнения не соответствует формату.
+    """
+    return _parse_due_date(value)[1]
+
+
+def _parse_due_date(value: str, stored: bool = False) -> Tuple[str, int]:
+    """
+    Проверяет срок выполнения и возвращает его вместе
+    с порядковым номером дня.
+
+    :param value: Срок выполнения в формате 'ГГГГ-ММ-ДД'.
+    :param stored: Если True, срок выполнения прочитан из файла
+    или записи импорта, и дата без ведущих нулей, допустимая
+    в прежних версиях, приводится к виду 'ГГГГ-ММ-ДД'
+    (parse_stored_date).
+    :return: Интернированная строка срока выполнения и порядковый
+    номер дня (date.toordinal).
+    :raise ValueError: Если срок выполнения не соответствует формату.
+    """
+    try:
+        return parse_stored_date(value) if stored else parse_date(value)
+    except ValueError:
+        raise ValueError('Срок выполнения задачи должен быть '
+                         'в формате ГГГГ-ММ-ДД')
 
 
 class Task:
@@ -10,8 +49,16 @@ class Task:
 
     Каждая задача имеет уникальный ID, название, описание, категорию,
     срок выполнения, приоритет и статус.
+
+    Для экономии памяти атрибуты хранятся в слотах, приоритет
+    и статус - в виде кодов, а срок выполнения дополнительно
+    хранится как порядковый номер дня для быстрой сортировки.
     """
 
+    __slots__ = ('_id', '_title', '_description', '_category', '_due_date',
+                 '_due_ordinal', '_priority', '_status', '_manager',
+                 '__weakref__')
+
     def __init__(self, task_id: int, title: str, description: str,
                  category: str, due_date: str, priority: str):
         """
@@ -25,12 +72,13 @@ class Task:
         :param priority: Приоритет задачи ('Низкий', 'Средний', 'Высокий').
         """
         self._id = task_id
+        self._manager = None
         self.title = title
         self.description = description
         self.category = category
         self.due_date = due_date
         self.priority = priority
-        self.status = 'Не выполнена'
+        self._status = 0
 
     @property
     def id(self) -> int:
@@ -60,7 +108,7 @@ class Task:
         """
         if not value:
             raise ValueError('Название задачи не может быть пустым')
-        self._title = value
+        self._update('title', '_title', value)
 
     @property
     def description(self) -> str:
@@ -81,7 +129,7 @@ class Task:
         """
         if not value:
             raise ValueError('Описание задачи не может быть пустым')
-        self._description = value
+        self._update('description', '_description', value)
 
     @property
     def category(self) -> str:
@@ -102,7 +150,7 @@ class Task:
         """
         if not value:
             raise ValueError('Категория задачи не может быть пустой')
-        self._category = value
+        self._update('category', '_category', sys.intern(value))
 
     @property
     def due_date(self) -> str:
@@ -113,6 +161,15 @@ class Task:
         """
         return self._due_date
 
+    @property
+    def due_ordinal(self) -> int:
+        """
+        Возвращает срок выполнения задачи как порядковый номер дня.
+
+        :return: Порядковый номер дня (date.toordinal).
+        """
+        return self._due_ordinal
+
     @due_date.setter
     def due_date(self, value: str):
         """
@@ -121,12 +178,8 @@ class Task:
         :param value: Новый срок выполнения задачи в формате 'ГГГГ-ММ-ДД'.
         :raise ValueError: Если срок выполнения не соответствует формату.
         """
-        try:
-            datetime.strptime(value, '%Y-%m-%d')
-            self._due_date = value
-        except ValueError:
-            raise ValueError('Срок выполнения задачи должен быть '
-                             'в формате ГГГГ-ММ-ДД')
+        value, ordinal = _parse_due_date(value)
+        self._update('due_date', '_due_date', value, _due_ordinal=ordinal)
 
     @property
     def priority(self) -> str:
@@ -135,7 +188,7 @@ class Task:
 
         :return: Приоритет задачи ('Низкий', 'Средний', 'Высокий').
         """
-        return self._priority
+        return PRIORITIES[self._priority]
 
     @priority.setter
     def priority(self, value: str):
@@ -146,10 +199,20 @@ class Task:
         :raise ValueError: Если приоритет не соответствует
         допустимым значениям.
         """
-        if value not in ('Низкий', 'Средний', 'Высокий'):
+        code = _PRIORITY_CODES.get(value)
+        if code is None:
             raise ValueError('Приоритет задачи должен '
                              'быть низким, средним или высоким')
-        self._priority = value
+        self._update('priority', '_priority', code)
+
+    @property
+    def priority_code(self) -> int:
+        """
+        Возвращает код приоритета задачи.
+
+        :return: Индекс приоритета в PRIORITIES (0 - низкий).
+        """
+        return self._priority
 
     @property
     def status(self) -> str:
@@ -158,7 +221,7 @@ class Task:
 
         :return: Статус задачи ('Не выполнена', 'Выполнена').
         """
-        return self._status
+        return STATUSES[self._status]
 
     @status.setter
     def status(self, value: str):
@@ -168,10 +231,42 @@ class Task:
         :param value: Новый статус задачи ('Не выполнена', 'Выполнена').
         :raise ValueError: Если статус не соответствует допустимым значениям.
         """
-        if value not in ('Не выполнена', 'Выполнена'):
+        code = _STATUS_CODES.get(value)
+        if code is None:
             raise ValueError('Задача должна быть '
                              'выполненной или не выполненной')
-        self._status = value
+        self._update('status', '_status', code)
+
+    @property
+    def status_code(self) -> int:
+        """
+        Возвращает код статуса задачи.
+
+        :return: Индекс статуса в STATUSES (0 - не выполнена).
+        """
+        return self._status
+
+    def _update(self, field: str, attr: str, value, **extra) -> None:
+        """
+        Записывает проверенное значение поля и сообщает
+        менеджеру задач об изменении.
+
+        :param field: Название свойства.
+        :param attr: Название слота, в котором хранится значение.
+        :param value: Новое значение слота.
+        :param extra: Производные слоты, обновляемые вместе с полем.
+        """
+        if self._manager is None:
+            setattr(self, attr, value)
+            for name, extra_value in extra.items():
+                setattr(self, name, extra_value)
+            return
+        old = getattr(self, field)
+        setattr(self, attr, value)
+        for name, extra_value in extra.items():
+            setattr(self, name, extra_value)
+        if old != getattr(self, field):
+            self._manager._task_changed(self, field, old)
 
     def to_dict(self) -> Dict:
         """
@@ -194,10 +289,108 @@ class Task:
         """
         Создает объект задачи из словаря.
 
+        Поля проверяются так же, как сеттерами, но за один проход
+        (from_record); статус, в отличие от записи импорта, обязателен.
+
         :param data: Словарь, содержащий данные задачи.
         :return: Новый объект Task.
+        :raise KeyError: Если в словаре нет поля.
+        :raise ValueError: Если значение поля недопустимо.
+        """
+        if not data['status']:
+            raise ValueError('Задача должна быть '
+                             'выполненной или не выполненной')
+        return cls.from_record(data['id'], data)
+
+    @classmethod
+    def restore(cls, task_id: int, title: str, description: str,
+                category: str, due_date: str, due_ordinal: int,
+                priority_code: int, status_code: int) -> Task:
+        """
+        Восстанавливает задачу из уже проверенных данных без
+        повторной проверки.
+
+        Используется хранилищами, которые держат данные задач
+        вне объектов Task.
+
+        :param task_id: Уникальный идентификатор задачи.
+        :param title: Название задачи.
+        :param description: Описание задачи.
+        :param category: Категория задачи.
+        :param due_date: Срок выполнения задачи в формате 'ГГГГ-ММ-ДД'.
+        :param due_ordinal: Срок выполнения как порядковый номер дня.
+        :param priority_code: Код приоритета (индекс в PRIORITIES).
+        :param status_code: Код статуса (индекс в STATUSES).
+        :return: Новый объект Task.
         """
-        task = Task(data['id'], data['title'], data['description'],
-                    data['category'], data['due_date'], data['priority'])
-        task.status = data['status']
+        task = cls.__new__(cls)
+        task._id = task_id
+        task._title = title
+        task._description = description
+        task._category = category
+        task._due_date = due_date
+        task._due_ordinal = due_ordinal
+        task._priority = priority_code
+        task._status = status_code
+        task._manager = None
         return task
+
+    @classmethod
+    def from_record(cls, task_id: int, data: Mapping[str, Any],
+                    dates: Optional[Dict[str, Tuple[str, int]]] = None
+                    ) -> Task:
+        """
+        Создает задачу из записи импорта, проверяя все поля за один
+        проход без вызова сеттеров.
+
+        Результат проверки срока выполнения запоминается в dates,
+        поэтому при разборе множества задач каждая дата разбирается
+        один раз. Дата без ведущих нулей из файлов прежних версий
+        приводится к виду 'ГГГГ-ММ-ДД'.
+
+        :param task_id: ID новой задачи.
+        :param data: Запись с полями title, description, category,
+        due_date, priority и необязательным status.
+        :param dates: Словарь уже проверенных дат: строка -> (та же
+        строка, порядковый номер дня).
+        :return: Новый объект Task.
+        :raise KeyError: Если в записи нет обязательного поля.
+        :raise ValueError: Если значение поля недопустимо.
+        """
+        title = data['title']
+        description = data['description']
+        category = data['category']
+        if not title:
+            raise ValueError('Название задачи не может быть пустым')
+        if not description:
+            raise ValueError('Описание задачи не может быть пустым')
+        if not category:
+            raise ValueError('Категория задачи не может быть пустой')
+        due_date = data['due_date']
+        cached = None if dates is None else dates.get(due_date)
+        if cached is None:
+            cached = _parse_due_date(due_date, stored=True)
+            if dates is not None:
+                dates[due_date] = cached
+        priority = _PRIORITY_CODES.get(data['priority'])
+        if priority is None:
+            raise ValueError('Приоритет задачи должен '
+                             'быть низким, средним или высоким')
+        status = _STATUS_CODES.get(data.get('status') or STATUSES[0])
+        if status is None:
+            raise ValueError('Задача должна быть '
+                             'выполненной или не выполненной')
+        return cls.restore(task_id, title, description, sys.intern(category),
+                           cached[0], cached[1], priority, status)
+
+
+class TaskChange(NamedTuple):
+    """
+    Событие изменения поля задачи, которое менеджер задач
+    передает подписчикам.
+    """
+
+    task: Task
+    field: str
+    old: Any
+    new: Any
@@ -0,0 +1,396 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from itertools import islice
+from typing import (Any, AsyncIterator, Callable, Dict, Iterable, Iterator,
+                    List, Mapping, Optional, Tuple)
+
+from task import Task, TaskChange
+from task_manager import TaskManager
+from task_query import FIELDS, Query
+
+
+class AsyncTaskManager:
+    """
+    Асинхронный фасад менеджера задач для программ на asyncio.
+
+    Каждый метод TaskManager доступен как сопрограмма. Вызовы
+    выполняются в отдельном потоке по одному, поэтому цикл событий
+    не ждет чтения и записи файла, сортировки и поиска, а менеджер
+    задач, который не рассчитан на одновременные вызовы из нескольких
+    потоков, используется только из этого потока. По той же причине
+    задачи следует изменять через update_task, а не присваиванием
+    полей в цикле событий.
+
+    Большие результаты перебираются асинхронными итераторами:
+    следующая порция задач выбирается только тогда, когда
+    предыдущая обработана. Как и при переборе iter_tasks, менять
+    задачи во время перебора не следует.
+    """
+
+    ITER_CHUNK_SIZE = 500
+    # Загрузки файлов, которые еще выполняются: ключ - цикл событий,
+    # путь к файлу и параметры менеджера.
+    _loading: Dict[Tuple, 'asyncio.Future[AsyncTaskManager]'] = {}
+
+    def __init__(self, task_manager: TaskManager,
+                 executor: Optional[Executor] = None):
+        """
+        Оборачивает существующий менеджер задач.
+
+        :param task_manager: Менеджер задач.
+        :param executor: Исполнитель вызовов менеджера. Он должен
+        выполнять вызовы по одному; если не задан, создается поток,
+        который останавливается в close.
+        """
+        self.task_manager = task_manager
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            1, thread_name_prefix='task-manager')
+
+    @classmethod
+    async def open(cls, storage_file: str,
+                   **options: Any) -> 'AsyncTaskManager':
+        """
+        Создает менеджер задач и загружает задачи из файла
+        в отдельном потоке.
+
+        Одновременные вызовы для одного файла с одинаковыми
+        параметрами ожидают одну загрузку и получают один и тот же
+        менеджер. Отмена одного из вызовов не прерывает загрузку
+        для остальных.
+
+        :param storage_file: Путь к файлу, в котором хранятся задачи.
+        :param options: Параметры TaskManager (text_index, columnar,
+        on_progress, journal); on_progress вызывается в потоке
+        загрузки.
+        :return: Асинхронный менеджер задач.
+        """
+        if not storage_file:
+            return await cls._load(storage_file, options)
+        key = (asyncio.get_running_loop(), os.path.abspath(storage_file),
+               tuple(sorted(options.items())))
+        future = cls._loading.get(key)
+        if future is None:
+            future = asyncio.ensure_future(cls._load(storage_file, options))
+            cls._loading[key] = future
+            future.add_done_callback(lambda _: cls._loading.pop(key, None))
+        return await asyncio.shield(future)
+
+    @classmethod
+    async def _load(cls, storage_file: str,
+                    options: Dict[str, Any]) -> 'AsyncTaskManager':
+        executor = ThreadPoolExecutor(1, thread_name_prefix='task-manager')
+        try:
+            task_manager = await asyncio.get_running_loop().run_in_executor(
+                executor, partial(TaskManager, storage_file, **options))
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        async_manager = cls(task_manager, executor)
+        async_manager._own_executor = True
+        return async_manager
+
+    async def _run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Выполняет вызов в потоке менеджера и возвращает его результат.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs))
+
+    async def _iterate(self, make_iterator: Callable[[], Iterable[Task]],
+                       chunk_size: Optional[int]) -> AsyncIterator[Task]:
+        """
+        Перебирает задачи итератора, выбирая их порциями
+        в потоке менеджера.
+
+        :param make_iterator: Функция, возвращающая итератор задач;
+        вызывается в потоке менеджера.
+        :param chunk_size: Размер порции или None для ITER_CHUNK_SIZE.
+        """
+        chunk_size = chunk_size or self.ITER_CHUNK_SIZE
+        tasks: Iterator[Task] = await self._run(
+            lambda: iter(make_iterator()))
+        while True:
+            chunk = await self._run(lambda: list(islice(tasks, chunk_size)))
+            for task in chunk:
+                yield task
+            if len(chunk) < chunk_size:
+                return
+
+    @property
+    def storage_file(self) -> str:
+        return self.task_manager.storage_file
+
+    @property
+    def load_error(self):
+        return self.task_manager.load_error
+
+    async def tasks(self) -> List[Task]:
+        """
+        Возвращает список всех задач.
+        """
+        return await self._run(lambda: self.task_manager.tasks)
+
+    async def size(self) -> int:
+        """
+        Возвращает число задач.
+        """
+        return await self._run(lambda: self.task_manager.size)
+
+    def load_tasks(self, chunk_size: Optional[int] = None
+                   ) -> AsyncIterator[Task]:
+        """
+        Загружает задачи из файла по мере перебора, не читая файл
+        целиком (см. TaskManager.load_tasks).
+
+        :param chunk_size: Число задач, читаемых за один вызов потока.
+        :return: Асинхронный итератор объектов Task.
+        """
+        return self._iterate(self.task_manager.load_tasks, chunk_size)
+
+    def iter_tasks(self, category: Optional[str] = None,
+                   chunk_size: Optional[int] = None) -> AsyncIterator[Task]:
+        """
+        Перебирает задачи категории (если указана) в порядке срока
+        выполнения, не собирая их в список.
+
+        :param category: Категория или None для всех задач.
+        :param chunk_size: Число задач, выбираемых за один вызов потока.
+        :return: Асинхронный итератор задач.
+        """
+        return self._iterate(
+            partial(self.task_manager.iter_tasks, category), chunk_size)
+
+    def iter_query(self, query: Query, chunk_size: Optional[int] = None
+                   ) -> AsyncIterator[Task]:
+        """
+        Выполняет запрос, выбирая подходящие задачи порциями
+        по мере перебора.
+
+        :param query: Запрос.
+        :param chunk_size: Число задач, выбираемых за один вызов потока.
+        :return: Асинхронный итератор задач в порядке запроса.
+        """
+        return self._iterate(
+            partial(self.task_manager.iter_query, query), chunk_size)
+
+    async def add_task(self, title: str, description: str, category: str,
+                       due_date: str, priority: str) -> Task:
+        """
+        Добавляет новую задачу.
+
+        :return: Добавленная задача.
+        :raise ValueError: Если поле задачи некорректно.
+        """
+        def add() -> Task:
+            self.task_manager.add_task(title, description, category,
+                                       due_date, priority)
+            return self.task_manager.get_task(self.task_manager.task_id - 1)
+
+        return await self._run(add)
+
+    async def add_tasks_bulk(self, records: Iterable[Mapping[str, Any]]
+                             ) -> range:
+        """
+        Добавляет задачи пакетом (см. TaskManager.add_tasks_bulk).
+
+        :return: Диапазон ID добавленных задач.
+        """
+        return await self._run(self.task_manager.add_tasks_bulk, records)
+
+    async def update_task(self, task_id: int, **fields: Any) -> Task:
+        """
+        Изменяет поля задачи одним пакетом изменений: если значение
+        одного из полей некорректно, задача не изменяется.
+
+        :param task_id: ID задачи.
+        :param fields: Новые значения полей (title, description,
+        category, due_date, priority, status).
+        :return: Измененная задача.
+        :raise ValueError: Если задача не найдена или значение
+        поля некорректно.
+        :raise TypeError: Если значение поля имеет неверный тип.
+        """
+        for field in fields:
+            if field == 'id' or field not in FIELDS:
+                raise ValueError(f'Неизвестное поле задачи {field!r}')
+
+        def update() -> Task:
+            task = self.task_manager.get_task(task_id)
+            if task is None:
+                raise ValueError(f'Задача №{task_id} не найдена')
+            old = {field: getattr(task, field) for field in fields}
+            with self.task_manager.batch():
+                try:
+                    for field, value in fields.items():
+                        setattr(task, field, value)
+                except (TypeError, ValueError):
+                    # Изменения пакета сливаются, поэтому возврат
+                    # прежних значений не доходит до подписчиков.
+                    for field, value in old.items():
+                        setattr(task, field, value)
+                    raise
+            return task
+
+        return await self._run(update)
+
+    async def delete_task(self, value: Task | str) -> None:
+        """
+        Удаляет задачу или все задачи категории.
+        """
+        await self._run(self.task_manager.delete_task, value)
+
+    async def delete_tasks(self, task_ids: Iterable[int]) -> None:
+        """
+        Удаляет задачи по ID.
+        """
+        await self._run(self.task_manager.delete_tasks, task_ids)
+
+    async def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Возвращает задачу по ID или None.
+        """
+        return await self._run(self.task_manager.get_task, task_id)
+
+    async def get_categories(self) -> List[str]:
+        """
+        Возвращает список категорий.
+        """
+        return await self._run(self.task_manager.get_categories)
+
+    async def get_tasks(self, category: Optional[str] = None) -> List[Task]:
+        """
+        Возвращает задачи категории или все задачи.
+        """
+        return await self._run(self.task_manager.get_tasks, category)
+
+    async def group_by(self, field: str) -> Dict[str, List[Task]]:
+        """
+        Группирует задачи по значению поля.
+        """
+        return await self._run(self.task_manager.group_by, field)
+
+    async def next_due(self, n: int) -> List[Task]:
+        """
+        Возвращает n ближайших по сроку невыполненных задач.
+        """
+        return await self._run(self.task_manager.next_due, n)
+
+    async def overdue(self, as_of: Optional[str] = None) -> List[Task]:
+        """
+        Возвращает просроченные невыполненные задачи.
+        """
+        return await self._run(self.task_manager.overdue, as_of)
+
+    async def due_between(self, start: str, end: str) -> List[Task]:
+        """
+        Возвращает задачи со сроком выполнения в диапазоне.
+        """
+        return await self._run(self.task_manager.due_between, start, end)
+
+    async def get_tasks_by_status(self, status: str) -> List[Task]:
+        """
+        Возвращает задачи с указанным статусом.
+        """
+        return await self._run(self.task_manager.get_tasks_by_status,
+                               status)
+
+    async def get_tasks_by_keyword(self, keyword: str) -> List[Task]:
+        """
+        Возвращает задачи, содержащие ключевое слово.
+        """
+        return await self._run(self.task_manager.get_tasks_by_keyword,
+                               keyword)
+
+    async def search_tasks(self, query: str,
+                           prefix: bool = True) -> List[Task]:
+        """
+        Ищет задачи по словам запроса.
+        """
+        return await self._run(self.task_manager.search_tasks, query,
+                               prefix)
+
+    async def query(self, query: Query) -> List[Task]:
+        """
+        Выполняет запрос с несколькими условиями.
+        """
+        return await self._run(self.task_manager.query, query)
+
+    async def save_tasks(self, file_name: Optional[str] = None) -> None:
+        """
+        Сохраняет все задачи в файл.
+
+        :param file_name: Название файла или None для файла задач.
+        """
+        await self._run(self.task_manager.save_tasks,
+                        file_name or self.storage_file)
+
+    async def start_autosave(self, interval: float = 5.0,
+                             max_changes: int = 100) -> None:
+        """
+        Включает фоновое сохранение изменений в файл задач.
+        """
+        await self._run(self.task_manager.start_autosave, interval,
+                        max_changes)
+
+    async def unsaved_changes(self) -> int:
+        """
+        Возвращает число изменений, еще не записанных автосохранением.
+        """
+        return await self._run(lambda: self.task_manager.unsaved_changes)
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ждет, пока автосохранение запишет все изменения.
+        """
+        return await self._run(self.task_manager.flush, timeout)
+
+    def subscribe(self, callback: Callable[[List[TaskChange]], None]
+                  ) -> Callable[[], None]:
+        """
+        Подписывает функцию на изменения полей задач.
+
+        Функция вызывается в цикле событий, из которого сделана
+        подписка, а не в потоке менеджера.
+
+        :param callback: Функция, принимающая список изменений.
+        :return: Функция, отменяющая подписку.
+        """
+        loop = asyncio.get_running_loop()
+        return self.task_manager.subscribe(
+            lambda changes: loop.call_soon_threadsafe(callback, changes))
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator['AsyncTaskManager']:
+        """
+        Объединяет изменения задач внутри блока в одно уведомление
+        подписчиков (см. TaskManager.batch).
+
+        :return: Этот же менеджер задач.
+        """
+        context = self.task_manager.batch()
+        await self._run(context.__enter__)
+        try:
+            yield self
+        finally:
+            await self._run(context.__exit__, None, None, None)
+
+    async def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Освобождает ресурсы менеджера и останавливает его поток.
+
+        :return: True, если все изменения автосохранения записаны.
+        """
+        saved = await self._run(self.task_manager.close, timeout)
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+        return saved
+
+    async def __aenter__(self) -> 'AsyncTaskManager':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
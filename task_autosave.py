@@ -0,0 +1,203 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from task import Task
+from task_json import write_records
+from task_sync import SharedTaskFile, merge_records
+
+
+class AutoSaver:
+    """
+    Фоновое сохранение задач в JSON-файл.
+
+    Менеджер задач передает в mark только измененные задачи,
+    а словари задач создает поток записи: при первой записи - для
+    копии задач хранилища (TaskStore.copy_tasks), затем - только для
+    измененных задач. Вызывающий поток не тратит время на
+    преобразование всех задач ни при включении автосохранения, ни
+    при изменениях. Поток хранит словари всех задач и, когда
+    с последней записи прошло interval секунд или накопилось
+    max_changes изменений, атомарно перезаписывает файл. Блокировка
+    удерживается только на время обмена измененными задачами,
+    а не на время записи на диск.
+
+    Если файл задач общий для нескольких процессов (shared), запись
+    выполняется под блокировкой файла, и изменения, сделанные
+    другими процессами, объединяются с изменениями этого процесса
+    (см. SharedTaskFile).
+    """
+
+    def __init__(self, file_name: str, tasks: Iterable[Task],
+                 interval: float = 5.0, max_changes: int = 100,
+                 shared: Optional[SharedTaskFile] = None,
+                 unsaved: Optional[Dict[int, Optional[Task]]] = None):
+        """
+        :param file_name: Путь к файлу задач.
+        :param tasks: Текущие задачи в порядке их добавления; перебор
+        должен быть возможен в потоке записи (TaskStore.copy_tasks).
+        :param interval: Наибольшее время в секундах между изменением
+        и его записью.
+        :param max_changes: Число изменений, после которого запись
+        выполняется, не дожидаясь interval.
+        :param shared: Общий файл задач или None, если файл
+        изменяет только этот процесс.
+        :param unsaved: Изменения задач, сделанные до включения
+        автосохранения и еще не записанные: задача или None
+        для удаленной задачи.
+        """
+        self.file_name = file_name
+        self.shared = shared
+        # Изменения, еще не записанные в файл; при слиянии
+        # с изменениями других процессов они заменяют версии из файла.
+        self._unsynced: Dict[int, Optional[Dict]] = {}
+        self.interval = interval
+        self.max_changes = max_changes
+        # Ошибка последней записи или None.
+        self.error: Optional[Exception] = None
+        # Словари задач создаются потоком записи при первой записи.
+        self._tasks: Optional[Iterable[Task]] = tasks
+        self._records: Dict[int, Dict] = {}
+        self._pending: Dict[int, Optional[Task]] = dict(unsaved or {})
+        self._changes = 0
+        self._saved = 0
+        self._urgent = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='autosave',
+                                        daemon=True)
+        self._thread.start()
+
+    def mark(self, task_id: int, task: Optional[Task]) -> None:
+        """
+        Запоминает изменение задачи для следующей записи.
+
+        :param task_id: ID задачи.
+        :param task: Измененная задача или None, если задача удалена.
+        """
+        with self._condition:
+            self._pending[task_id] = task
+            self._changes += 1
+            if self._changes - self._saved >= self.max_changes:
+                self._condition.notify_all()
+
+    @property
+    def unsaved(self) -> int:
+        """
+        Возвращает число изменений, еще не записанных в файл.
+        """
+        with self._condition:
+            return self._changes - self._saved
+
+    def _run(self) -> None:
+        with self._condition:
+            while True:
+                self._condition.wait_for(
+                    lambda: self._stopping or self._urgent
+                    or self._changes - self._saved >= self.max_changes,
+                    timeout=self.interval)
+                if self._changes > self._saved:
+                    self._write()
+                if self._changes == self._saved:
+                    self._urgent = False
+                self._condition.notify_all()
+                if self._stopping:
+                    return
+                if self.error is not None:
+                    self._condition.wait_for(lambda: self._stopping,
+                                             timeout=self.interval)
+
+    def _write(self) -> None:
+        """
+        Записывает накопленные изменения в файл.
+
+        Вызывается потоком записи с захваченной блокировкой, которая
+        отпускается на время преобразования задач в словари и записи
+        на диск. Задача, измененная во время преобразования, снова
+        попадает в следующую запись. При ошибке записи или чтения
+        общего файла изменения остаются несохраненными до следующей
+        попытки, а ошибка доступна в error.
+        """
+        pending, self._pending = self._pending, {}
+        changes = self._changes
+        self._condition.release()
+        try:
+            if self._tasks is not None:
+                self._records = {task.id: task.to_dict()
+                                 for task in self._tasks}
+                self._tasks = None
+            changed = {task_id: None if task is None else task.to_dict()
+                       for task_id, task in pending.items()}
+            for task_id, record in changed.items():
+                if record is None:
+                    self._records.pop(task_id, None)
+                else:
+                    self._records[task_id] = record
+            self._unsynced.update(changed)
+            if self.shared is None:
+                write_records(self.file_name, list(self._records.values()))
+            else:
+                self._records = self._write_shared(self._records,
+                                                   self._unsynced)
+            error = None
+        except (OSError, ValueError) as exc:
+            # Ошибки чтения общего файла (TaskFileError) тоже
+            # не останавливают поток: запись повторяется позже.
+            error = exc
+        finally:
+            self._condition.acquire()
+        self.error = error
+        if error is None:
+            self._saved = changes
+            self._unsynced = {}
+
+    def _write_shared(self, records: Dict[int, Dict],
+                      unsynced: Dict[int, Optional[Dict]]
+                      ) -> Dict[int, Dict]:
+        """
+        Записывает общий файл задач под его блокировкой, объединяя
+        изменения с изменениями других процессов.
+
+        :param records: Словари задач этого процесса по ID.
+        :param unsynced: Изменения, еще не записанные в файл.
+        :return: Записанные словари задач по ID.
+        """
+        with self.shared.lock() as meta:
+            if meta['generation'] != self.shared.generation:
+                remote = {task_id: task.to_dict() for task_id, task
+                          in self.shared.read_tasks().items()}
+                records = merge_records(remote, unsynced)
+            write_records(self.file_name, list(records.values()))
+            meta['generation'] += 1
+            self.shared.generation = meta['generation']
+        return records
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Запрашивает немедленную запись и ждет ее завершения.
+
+        :param timeout: Наибольшее время ожидания в секундах
+        или None, чтобы ждать без ограничения.
+        :return: True, если все изменения до вызова записаны.
+        """
+        with self._condition:
+            target = self._changes
+            self._urgent = True
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: self._saved >= target or not self._thread.is_alive(),
+                timeout=timeout) and self._saved >= target
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Записывает оставшиеся изменения и останавливает поток записи.
+
+        :param timeout: Наибольшее время ожидания в секундах
+        или None, чтобы ждать без ограничения.
+        :return: True, если все изменения записаны.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        with self._condition:
+            return self._changes == self._saved
@@ -0,0 +1,178 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, NamedTuple
+
+from task import Task
+
+_MISSING = object()
+
+# Число задач результата, по которым оценивается средний размер
+# их строк.
+SIZE_SAMPLE = 32
+
+
+class CacheStats(NamedTuple):
+    """
+    Статистика кэша результатов запросов.
+    """
+    # Число запросов, результат которых взят из кэша.
+    hits: int
+    # Число запросов, выполненных в хранилище.
+    misses: int
+    # Число результатов, вытесненных из-за ограничений кэша.
+    evictions: int
+    # Число сбросов кэша после изменения задач.
+    invalidations: int
+    # Число результатов в кэше.
+    entries: int
+    # Оценка памяти, занятой результатами, в байтах.
+    size: int
+
+
+def _tasks_size(tasks: List[Any]) -> int:
+    """
+    Оценивает память объектов Task списка и их названий и описаний
+    по выборке из SIZE_SAMPLE задач.
+    """
+    if not tasks or not isinstance(tasks[0], Task):
+        return 0
+    step = max(1, len(tasks) // SIZE_SAMPLE)
+    sample = tasks[::step]
+    strings = sum(sys.getsizeof(task.title) + sys.getsizeof(task.description)
+                  for task in sample)
+    return len(tasks) * (sys.getsizeof(tasks[0]) + strings // len(sample))
+
+
+def _size_of(value: Any, count_tasks: bool) -> int:
+    """
+    Оценивает память результата запроса.
+
+    Учитываются списки и словари самого результата, а если
+    count_tasks - и задачи в нем: хранилища, создающие задачи
+    по запросу (столбцовое, SQLite, снимок), держат их только через
+    слабые ссылки, и задачи результата живут, пока он в кэше.
+    """
+    lists = list(value.values()) if isinstance(value, dict) else [value]
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(item) for item in lists)
+    if count_tasks:
+        size += sum(_tasks_size(item) for item in lists)
+    return size
+
+
+def _copy(value: Any) -> Any:
+    """
+    Возвращает копию результата, которую вызывающий код может
+    изменять, не затрагивая кэш.
+    """
+    if isinstance(value, dict):
+        return {key: list(item) for key, item in value.items()}
+    return list(value)
+
+
+class QueryCache:
+    """
+    Кэш результатов запросов к задачам с вытеснением давно
+    не использованных (LRU).
+
+    Результаты хранятся по ключу (метод, аргументы) вместе с номером
+    версии задач, для которой они получены. Любое изменение задач
+    увеличивает номер версии (TaskManager.generation), и первое
+    обращение с новым номером сбрасывает весь кэш: изменение одной
+    задачи может затронуть результат любого запроса.
+
+    Число результатов ограничено max_entries, а их суммарный размер -
+    max_size байт; результат больше max_size не кэшируется. Задачи
+    результата учитываются в размере, если хранилище не держит их
+    само (count_tasks в get).
+    Кэш можно использовать из нескольких потоков.
+    """
+
+    def __init__(self, max_entries: int = 128,
+                 max_size: int = 32 * 1024 * 1024):
+        """
+        :param max_entries: Наибольшее число результатов.
+        :param max_size: Наибольший суммарный размер результатов
+        в байтах.
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: dict = {}
+        self._size = 0
+        self._generation: Hashable = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _check(self, generation: Hashable) -> None:
+        if generation != self._generation:
+            if self._entries:
+                self._invalidations += 1
+                self._entries.clear()
+                self._sizes.clear()
+                self._size = 0
+            self._generation = generation
+
+    def get(self, key: Hashable, generation: Hashable,
+            compute: Callable[[], Any], count_tasks: bool = False) -> Any:
+        """
+        Возвращает результат запроса из кэша или вычисляет
+        и запоминает его.
+
+        Результат запоминается, только если версия задач
+        не изменилась во время вычисления.
+
+        :param key: Ключ запроса: метод и аргументы.
+        :param generation: Текущая версия задач.
+        :param compute: Функция, выполняющая запрос в хранилище.
+        :param count_tasks: Если True, размер задач результата
+        учитывается в его размере.
+        :return: Копия результата (список или словарь списков).
+        """
+        with self._lock:
+            self._check(generation)
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _copy(value)
+            self._misses += 1
+        value = compute()
+        size = _size_of(value, count_tasks)
+        if size > self.max_size or self.max_entries <= 0:
+            return value
+        with self._lock:
+            if generation != self._generation or key in self._entries:
+                return _copy(value)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._size += size
+            while (len(self._entries) > self.max_entries
+                   or self._size > self.max_size):
+                old, _ = self._entries.popitem(last=False)
+                self._size -= self._sizes.pop(old)
+                self._evictions += 1
+        return _copy(value)
+
+    def clear(self) -> None:
+        """
+        Удаляет все результаты из кэша.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Возвращает статистику обращений к кэшу.
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              self._invalidations, len(self._entries),
+                              self._size)
@@ -0,0 +1,303 @@
+import argparse
+import io
+import json
+import sys
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from task import PRIORITIES, STATUSES, Task
+from task_json import iter_tasks, open_tasks
+from task_manager import TaskManager, gc_paused
+from task_query import SORT_KEYS, Query
+from task_render import render_table, task_row
+from task_snapshot import is_snapshot_file
+from task_sqlite import is_sqlite_file
+
+
+def read_tasks(file_name: str) -> List[Task]:
+    """
+    Читает все задачи JSON-файла для одной операции.
+
+    Файл разбирается целиком одним вызовом json.loads, что быстрее
+    потокового чтения, а задачи создаются через Task.from_dict
+    с теми же проверками, что и в TaskManager, но без построения
+    индексов хранилища. Если файл поврежден, он перечитывается
+    загрузчиком TaskManager (task_json.iter_tasks), чтобы ошибка
+    была той же и содержала позицию некорректной записи.
+
+    :param file_name: Путь к файлу задач; если файла нет, задач нет.
+    :return: Список задач.
+    :raise TaskFileError: Если файл поврежден; ошибка содержит
+    позицию некорректной записи.
+    """
+    try:
+        with open_tasks(file_name) as file:
+            text = file.read()
+    except FileNotFoundError:
+        return []
+    try:
+        records = json.loads(text) if text.strip() else []
+        if isinstance(records, list):
+            return [Task.from_dict(record) for record in records]
+    except (KeyError, TypeError, ValueError):
+        pass
+    return list(iter_tasks(io.StringIO(text)))
+
+
+def run_query(file_name: str, query: Query) -> List[Task]:
+    """
+    Выполняет запрос к файлу задач для одной операции.
+
+    JSON-файл читается через read_tasks и проверяется без индексов,
+    а базы SQLite и снимки открываются менеджером задач, запрос
+    к которым использует их индексы.
+
+    :param file_name: Путь к файлу задач.
+    :param query: Запрос.
+    :return: Список подходящих задач.
+    :raise ValueError: Если файл поврежден.
+    """
+    if not (is_sqlite_file(file_name) or is_snapshot_file(file_name)):
+        return query.select(read_tasks(file_name))
+    task_manager = TaskManager(file_name)
+    try:
+        return task_manager.query(query)
+    finally:
+        task_manager.close()
+
+
+def iter_all(file_name: str) -> Iterator[Task]:
+    """
+    Перебирает все задачи файла в любом порядке.
+
+    :param file_name: Путь к файлу задач.
+    :return: Итератор задач.
+    :raise ValueError: Если файл поврежден.
+    """
+    if not (is_sqlite_file(file_name) or is_snapshot_file(file_name)):
+        yield from read_tasks(file_name)
+        return
+    task_manager = TaskManager(file_name)
+    try:
+        yield from task_manager.iter_tasks()
+    finally:
+        task_manager.close()
+
+
+def print_tasks(tasks: List[Task], as_json: bool) -> None:
+    """
+    Выводит задачи таблицей или массивом JSON.
+
+    :param tasks: Задачи.
+    :param as_json: Если True, вывод - массив словарей задач.
+    """
+    if as_json:
+        # json.dumps целиком в несколько раз быстрее json.dump,
+        # который пишет в поток множеством мелких фрагментов.
+        sys.stdout.write(json.dumps([task.to_dict() for task in tasks],
+                                    ensure_ascii=False))
+        sys.stdout.write('\n')
+    elif tasks:
+        sys.stdout.write('\n'.join(render_table(map(task_row, tasks))))
+        sys.stdout.write('\n')
+    else:
+        print('Задачи не найдены')
+
+
+def task_stats(tasks: Iterable[Task], today: Optional[date] = None) -> Dict:
+    """
+    Подсчитывает задачи по категориям, статусам и приоритетам.
+
+    :param tasks: Задачи.
+    :param today: Текущая дата для подсчета просроченных задач.
+    :return: Словарь со значениями total, overdue, categories,
+    statuses и priorities.
+    """
+    today_ordinal = (today or date.today()).toordinal()
+    total = overdue = 0
+    categories: Counter = Counter()
+    statuses: Counter = Counter()
+    priorities: Counter = Counter()
+    for task in tasks:
+        total += 1
+        categories[task.category] += 1
+        statuses[task.status] += 1
+        priorities[task.priority] += 1
+        if task.status == STATUSES[0] and task.due_ordinal < today_ordinal:
+            overdue += 1
+    return {'total': total, 'overdue': overdue,
+            'categories': dict(categories.most_common()),
+            'statuses': {status: statuses[status] for status in STATUSES},
+            'priorities': {priority: priorities[priority]
+                           for priority in PRIORITIES}}
+
+
+def print_stats(stats: Dict, as_json: bool) -> None:
+    """
+    Выводит статистику задач.
+
+    :param stats: Результат task_stats.
+    :param as_json: Если True, вывод - объект JSON.
+    """
+    if as_json:
+        print(json.dumps(stats, ensure_ascii=False))
+        return
+    print(f'Всего задач: {stats["total"]}')
+    print(f'Просрочено: {stats["overdue"]}')
+    for title, key in (('Категории', 'categories'), ('Статусы', 'statuses'),
+                       ('Приоритеты', 'priorities')):
+        print(f'{title}:')
+        for name, count in stats[key].items():
+            print(f'  {name}: {count}')
+
+
+def _query(args: argparse.Namespace) -> Query:
+    query = Query()
+    fields = {field: getattr(args, field) for field in
+              ('category', 'status', 'priority')
+              if getattr(args, field, None) is not None}
+    query.where(**fields)
+    if args.due_from is not None or args.due_to is not None:
+        query.due_between(args.due_from, args.due_to)
+    if getattr(args, 'keyword', None) is not None:
+        query.keyword(args.keyword)
+    if args.sort:
+        query.order_by(*args.sort)
+    return query.limit(args.limit)
+
+
+def _change(args: argparse.Namespace) -> Tuple[Dict, str]:
+    """
+    Выполняет команду, изменяющую задачи, и сохраняет файл.
+
+    :param args: Аргументы команды add, done или delete.
+    :return: Пара (результат для вывода в JSON, сообщение).
+    :raise ValueError: Если данные задачи некорректны или задача
+    не найдена.
+    """
+    task_manager = TaskManager(args.storage, shared=True)
+    try:
+        if task_manager.load_error is not None:
+            raise task_manager.load_error
+        if args.command == 'add':
+            task_manager.add_task(args.title, args.description,
+                                  args.category, args.due_date,
+                                  args.priority)
+            task = task_manager.get_task(task_manager.task_id - 1)
+            result = task.to_dict()
+            message = f'Добавлена задача с id = {task.id}'
+        else:
+            tasks = [task_manager.get_task(task_id) for task_id in args.ids]
+            missing = [task_id for task_id, task in zip(args.ids, tasks)
+                       if task is None]
+            if missing:
+                raise ValueError('Задачи не найдены: '
+                                 + ', '.join(map(str, missing)))
+            result = {'ids': args.ids}
+            if args.command == 'done':
+                with task_manager.batch():
+                    for item in tasks:
+                        item.status = STATUSES[1]
+                message = f'Выполнено задач: {len(tasks)}'
+            else:
+                task_manager.delete_tasks(args.ids)
+                message = f'Удалено задач: {len(tasks)}'
+        task_manager.save_tasks(args.storage)
+        return result, message
+    finally:
+        task_manager.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Создает разбор аргументов командной строки.
+
+    :return: Парсер с подкомандами list, add, done, delete,
+    search и stats.
+    """
+    parser = argparse.ArgumentParser(
+        prog='task_cli',
+        description='Выполнение одной операции с задачами без меню.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def command(name: str, help_text: str) -> argparse.ArgumentParser:
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument('storage', help='файл задач (JSON, снимок '
+                                         'или база SQLite)')
+        sub.add_argument('--json', action='store_true',
+                         help='вывод в формате JSON')
+        return sub
+
+    for name, help_text in (('list', 'вывести задачи'),
+                            ('search', 'найти задачи по ключевому слову')):
+        sub = command(name, help_text)
+        if name == 'search':
+            sub.add_argument('keyword', help='ключевое слово')
+        sub.add_argument('--category', help='категория')
+        sub.add_argument('--status', choices=STATUSES, help='статус')
+        sub.add_argument('--priority', choices=PRIORITIES, help='приоритет')
+        sub.add_argument('--due-from', metavar='ГГГГ-ММ-ДД',
+                         help='первый срок выполнения')
+        sub.add_argument('--due-to', metavar='ГГГГ-ММ-ДД',
+                         help='последний срок выполнения')
+        sub.add_argument('--sort', metavar='КЛЮЧИ',
+                         type=lambda value: value.split(','),
+                         help='ключи сортировки через запятую: '
+                              f'{", ".join(SORT_KEYS)}; ключ с минусом '
+                              'сортирует по убыванию '
+                              '(--sort=-priority,due_date)')
+        sub.add_argument('--limit', type=int, help='наибольшее число задач')
+    sub = command('add', 'добавить задачу')
+    sub.add_argument('title', help='название')
+    sub.add_argument('description', help='описание')
+    sub.add_argument('category', help='категория')
+    sub.add_argument('due_date', metavar='due_date',
+                     help='срок выполнения в формате ГГГГ-ММ-ДД')
+    sub.add_argument('priority', choices=PRIORITIES, help='приоритет')
+    for name, help_text in (('done', 'отметить задачи выполненными'),
+                            ('delete', 'удалить задачи')):
+        sub = command(name, help_text)
+        sub.add_argument('ids', nargs='+', type=int, metavar='id',
+                         help='ID задачи')
+    command('stats', 'вывести статистику задач')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Выполняет одну операцию с задачами по аргументам командной
+    строки и завершается.
+
+    На время операции сборщик циклического мусора
+    приостанавливается: его обходы при создании большого числа задач
+    занимают больше времени, чем сама загрузка.
+
+    :param argv: Аргументы командной строки.
+    :return: Код завершения.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        with gc_paused():
+            if args.command in ('list', 'search'):
+                print_tasks(run_query(args.storage, _query(args)), args.json)
+            elif args.command == 'stats':
+                print_stats(task_stats(iter_all(args.storage)), args.json)
+            else:
+                result, message = _change(args)
+                if args.json:
+                    print(json.dumps(result, ensure_ascii=False))
+                else:
+                    print(message)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    except OSError as error:
+        # Например, файл недоступен для чтения или диск заполнен.
+        print(f'Ошибка работы с файлом задач: {error}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,337 @@
+import weakref
+from array import array
+from itertools import compress
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from task import STATUSES, Task
+from task_search import task_tokens, tokenize, words_match
+from task_store import TaskStore
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnarTaskStore(TaskStore):
+    """
+    Хранилище задач по столбцам.
+
+    ID и сроки выполнения хранятся в массивах array, категории,
+    приоритеты и статусы - в виде кодов, а строки - в списках.
+    Фильтры выполняются над столбцами (средствами NumPy, если он
+    установлен), а объекты Task создаются только для возвращаемых
+    строк и переиспользуются, пока на них есть ссылки.
+    """
+
+    def __init__(self, owner, tasks: Iterable[Task] = ()):
+        """
+        Инициализирует хранилище и заполняет его задачами.
+
+        :param owner: Менеджер задач, которому сообщают
+        об изменениях задачи.
+        :param tasks: Начальный набор задач.
+        """
+        super().__init__(owner)
+        self._ids = array('q')
+        self._due = array('i')
+        self._priority = array('b')
+        self._status = array('b')
+        self._category = array('i')
+        self._alive = bytearray()
+        self._titles: List[str] = []
+        self._descriptions: List[str] = []
+        self._due_dates: List[str] = []
+        self._rows: Dict[int, int] = {}
+        self._category_names: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self._category_counts: List[int] = []
+        self._cache: weakref.WeakValueDictionary = (
+            weakref.WeakValueDictionary())
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Task]:
+        for row in self._alive_rows():
+            yield self._task(row)
+
+    def _alive_rows(self) -> List[int]:
+        return list(compress(range(len(self._alive)), self._alive))
+
+    def _category_code(self, category: str) -> int:
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self._category_names)
+            self._category_names.append(category)
+            self._category_counts.append(0)
+        return code
+
+    def _task(self, row: int) -> Task:
+        """
+        Возвращает объект задачи для строки, создавая его при необходимости.
+
+        :param row: Номер строки.
+        :return: Задача.
+        """
+        task_id = self._ids[row]
+        task = self._cache.get(task_id)
+        if task is None:
+            task = Task.restore(task_id, self._titles[row],
+                                self._descriptions[row],
+                                self._category_names[self._category[row]],
+                                self._due_dates[row], self._due[row],
+                                self._priority[row], self._status[row])
+            task._manager = self.owner
+            self._cache[task_id] = task
+        return task
+
+    def _tasks(self, rows: List[int]) -> List[Task]:
+        """
+        Возвращает задачи строк, отсортированные по сроку выполнения.
+
+        :param rows: Номера строк.
+        :return: Список задач.
+        """
+        due, ids = self._due, self._ids
+        rows.sort(key=lambda row: (due[row], ids[row]))
+        return [self._task(row) for row in rows]
+
+    def _find_rows(self, column: Optional[array] = None, code: int = 0,
+                   start: Optional[int] = None, end: Optional[int] = None,
+                   urgency: bool = False) -> List[int]:
+        """
+        Выбирает живые строки, у которых значение столбца равно коду,
+        а срок выполнения попадает в диапазон, и упорядочивает их
+        по столбцам, не создавая объектов Task.
+
+        :param column: Столбец кодов или None, чтобы не проверять код.
+        :param code: Искомый код.
+        :param start: Первый день диапазона или None.
+        :param end: Последний день диапазона включительно или None.
+        :param urgency: Если True, строки упорядочиваются по срочности
+        (urgency_key), иначе - по сроку выполнения и ID.
+        :return: Номера строк.
+        """
+        if numpy is not None and self._alive:
+            mask = numpy.frombuffer(self._alive, dtype=numpy.bool_)
+            if column is not None:
+                values = numpy.frombuffer(column, dtype=column.typecode)
+                mask = mask & (values == code)
+            due = numpy.frombuffer(self._due, dtype='i')
+            if start is not None:
+                mask = mask & (due >= start)
+            if end is not None:
+                mask = mask & (due <= end)
+            rows = numpy.flatnonzero(mask)
+            keys = [numpy.frombuffer(self._ids, dtype='q')[rows]]
+            if urgency:
+                priority = numpy.frombuffer(self._priority, dtype='b')
+                keys.append(-priority[rows])
+            keys.append(due[rows])
+            return rows[numpy.lexsort(keys)].tolist()
+        due, ids, priority = self._due, self._ids, self._priority
+        rows = [row for row in self._alive_rows()
+                if (column is None or column[row] == code)
+                and (start is None or due[row] >= start)
+                and (end is None or due[row] <= end)]
+        if urgency:
+            rows.sort(key=lambda row: (due[row], -priority[row], ids[row]))
+        else:
+            rows.sort(key=lambda row: (due[row], ids[row]))
+        return rows
+
+    def _select(self, column: Optional[array] = None,
+                code: int = 0) -> List[Task]:
+        """
+        Выбирает живые строки, у которых значение столбца равно коду.
+
+        :param column: Столбец кодов или None, чтобы выбрать все строки.
+        :param code: Искомый код.
+        :return: Задачи, отсортированные по сроку выполнения.
+        """
+        return [self._task(row) for row in self._find_rows(column, code)]
+
+    def _select_text(self, predicate: Callable[[str, str], bool]
+                     ) -> List[Task]:
+        """
+        Выбирает живые строки по условию на название и описание.
+
+        :param predicate: Условие от названия и описания.
+        :return: Задачи, отсортированные по сроку выполнения.
+        """
+        titles, descriptions = self._titles, self._descriptions
+        return self._tasks([row for row in self._alive_rows()
+                            if predicate(titles[row], descriptions[row])])
+
+    def _compact(self) -> None:
+        """
+        Удаляет из столбцов строки удаленных задач.
+        """
+        rows = self._alive_rows()
+        for name in ('_ids', '_due', '_priority', '_status', '_category'):
+            column = getattr(self, name)
+            setattr(self, name,
+                    array(column.typecode, (column[row] for row in rows)))
+        for name in ('_titles', '_descriptions', '_due_dates'):
+            column = getattr(self, name)
+            setattr(self, name, [column[row] for row in rows])
+        self._alive = bytearray(b'\x01') * len(rows)
+        self._rows = {task_id: row for row, task_id in enumerate(self._ids)}
+
+    def get(self, task_id: int) -> Optional[Task]:
+        row = self._rows.get(task_id)
+        return None if row is None else self._task(row)
+
+    def add(self, task: Task) -> None:
+        if task.id in self._rows:
+            self.remove([task.id])
+        code = self._category_code(task.category)
+        self._category_counts[code] += 1
+        self._rows[task.id] = len(self._ids)
+        self._ids.append(task.id)
+        self._due.append(task.due_ordinal)
+        self._priority.append(task.priority_code)
+        self._status.append(task.status_code)
+        self._category.append(code)
+        self._alive.append(1)
+        self._titles.append(task.title)
+        self._descriptions.append(task.description)
+        self._due_dates.append(task.due_date)
+        task._manager = self.owner
+        self._cache[task.id] = task
+
+    def remove(self, task_ids: Iterable[int]) -> None:
+        """
+        Удаляет задачи с указанными ID.
+
+        Строки помечаются удаленными, а когда их становится больше
+        половины, столбцы уплотняются за один проход.
+
+        :param task_ids: ID задач.
+        """
+        for task_id in task_ids:
+            row = self._rows.pop(task_id, None)
+            if row is None:
+                continue
+            self._alive[row] = 0
+            self._category_counts[self._category[row]] -= 1
+            self._titles[row] = self._descriptions[row] = ''
+            task = self._cache.pop(task_id, None)
+            if task is not None:
+                task._manager = None
+        if len(self._rows) * 2 < len(self._alive):
+            self._compact()
+
+    def remove_category(self, category: str) -> None:
+        code = self._category_codes.get(category)
+        if code is None or not self._category_counts[code]:
+            return
+        self.remove([self._ids[row] for row in self._alive_rows()
+                     if self._category[row] == code])
+
+    def changed(self, task: Task, field: str, old) -> None:
+        row = self._rows[task.id]
+        if field == 'title':
+            self._titles[row] = task.title
+        elif field == 'description':
+            self._descriptions[row] = task.description
+        elif field == 'category':
+            self._category_counts[self._category[row]] -= 1
+            code = self._category_code(task.category)
+            self._category_counts[code] += 1
+            self._category[row] = code
+        elif field == 'due_date':
+            self._due[row] = task.due_ordinal
+            self._due_dates[row] = task.due_date
+        elif field == 'priority':
+            self._priority[row] = task.priority_code
+        elif field == 'status':
+            self._status[row] = task.status_code
+
+    def copy_tasks(self) -> Iterator[Task]:
+        # Копии столбцов: объекты Task для всех строк создаются уже
+        # при переборе, без изменения кэша задач хранилища.
+        alive = self._alive[:]
+        ids, due, priority, status, category = (
+            self._ids[:], self._due[:], self._priority[:], self._status[:],
+            self._category[:])
+        titles, descriptions, due_dates = (
+            self._titles[:], self._descriptions[:], self._due_dates[:])
+        names = self._category_names[:]
+        return (Task.restore(ids[row], titles[row], descriptions[row],
+                             names[category[row]], due_dates[row], due[row],
+                             priority[row], status[row])
+                for row in compress(range(len(alive)), alive))
+
+    def max_id(self) -> int:
+        return max(self._rows, default=0)
+
+    def categories(self) -> List[str]:
+        return [name for name, count
+                in zip(self._category_names, self._category_counts)
+                if count]
+
+    def by_category(self, category: Optional[str] = None) -> List[Task]:
+        if category is None:
+            return self._select()
+        code = self._category_codes.get(category)
+        if code is None or not self._category_counts[code]:
+            return []
+        return self._select(self._category, code)
+
+    def iter_category(self, category: Optional[str] = None
+                      ) -> Iterator[Task]:
+        # Строки упорядочиваются сразу, а объекты Task создаются
+        # по мере перебора.
+        if category is None:
+            return map(self._task, self._find_rows())
+        code = self._category_codes.get(category)
+        if code is None or not self._category_counts[code]:
+            return iter(())
+        return map(self._task, self._find_rows(self._category, code))
+
+    def iter_due(self, start: Optional[int],
+                 end: Optional[int]) -> Iterator[Task]:
+        return map(self._task, self._find_rows(start=start, end=end))
+
+    def next_due(self, count: int) -> List[Task]:
+        if count <= 0:
+            return []
+        # Код 0 - статус невыполненной задачи (STATUSES[0]).
+        rows = self._find_rows(self._status, 0, urgency=True)
+        return [self._task(row) for row in rows[:count]]
+
+    def open_between(self, start: Optional[int],
+                     end: Optional[int]) -> List[Task]:
+        return [self._task(row) for row in
+                self._find_rows(self._status, 0, start, end, urgency=True)]
+
+    def count(self, field: str, value: str) -> Optional[int]:
+        if field != 'category':
+            return None
+        code = self._category_codes.get(value)
+        return 0 if code is None else self._category_counts[code]
+
+    def by_status(self, status: str) -> List[Task]:
+        try:
+            code = STATUSES.index(status)
+        except ValueError:
+            return []
+        return self._select(self._status, code)
+
+    def by_keyword(self, keyword: str) -> List[Task]:
+        keyword = keyword.lower()
+        return self._select_text(
+            lambda title, description: keyword in title.lower()
+            or keyword in description.lower())
+
+    def search(self, query: str, prefix: bool = True) -> List[Task]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        return self._select_text(
+            lambda title, description: words_match(
+                terms, task_tokens(title, description), prefix))
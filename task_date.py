@@ -0,0 +1,70 @@
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Tuple
+
+# Наибольшее число запоминаемых дат: больше 20 лет по одному
+# сроку выполнения на день.
+MEMO_SIZE = 8192
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def parse_date(value: str) -> Tuple[str, int]:
+    """
+    Проверяет дату в формате 'ГГГГ-ММ-ДД' и возвращает ее
+    порядковый номер дня.
+
+    Допустимы только строки ровно этого вида из цифр ASCII
+    (без пропуска ведущих нулей); они разбираются через
+    date.fromisoformat, которая значительно быстрее
+    datetime.strptime. Результаты запоминаются: в реальных списках
+    задач немного различных сроков выполнения, и каждый разбирается
+    один раз.
+
+    :param value: Дата.
+    :return: Интернированная строка даты и порядковый номер дня
+    (date.toordinal).
+    :raise ValueError: Если строка не является датой в этом формате.
+    """
+    if not (len(value) == 10 and value[4] == value[7] == '-'
+            and value.isascii() and value[:4].isdigit()
+            and value[5:7].isdigit() and value[8:].isdigit()):
+        raise ValueError(f'Дата {value!r} не в формате ГГГГ-ММ-ДД')
+    return sys.intern(value), date.fromisoformat(value).toordinal()
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def parse_stored_date(value: str) -> Tuple[str, int]:
+    """
+    Проверяет дату из файла задач или записи импорта.
+
+    Прежние версии принимали даты без ведущих нулей (например,
+    '2024-1-5'), и такие даты могут встречаться в сохраненных
+    файлах. Даты строгого вида разбираются parse_date, а остальные -
+    datetime.strptime по формату '%Y-%m-%d' и приводятся к виду
+    'ГГГГ-ММ-ДД'.
+
+    :param value: Дата.
+    :return: Интернированная строка даты в виде 'ГГГГ-ММ-ДД'
+    и порядковый номер дня.
+    :raise ValueError: Если строка не является датой.
+    """
+    try:
+        return parse_date(value)
+    except ValueError:
+        day = datetime.strptime(value, '%Y-%m-%d').date()
+    return sys.intern(day.isoformat()), day.toordinal()
+
+
+def is_date(value: str) -> bool:
+    """
+    Проверяет, что строка является датой в формате 'ГГГГ-ММ-ДД'.
+
+    :param value: Строка.
+    :return: True, если строка - допустимая дата.
+    """
+    try:
+        parse_date(value)
+    except (TypeError, ValueError):
+        return False
+    return True
@@ -0,0 +1,177 @@
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from task import PRIORITIES, Task, parse_due_date
+
+
+def due_date_key(task: Task, due_date: Optional[str] = None) -> Tuple:
+    """
+    Возвращает ключ сортировки задачи по сроку выполнения.
+
+    Срок сравнивается как порядковый номер дня, а ID задачи в ключе
+    делает порядок задач с одинаковым сроком детерминированным.
+
+    :param task: Задача.
+    :param due_date: Срок выполнения, который следует использовать
+    вместо текущего (например, прежнее значение при изменении задачи).
+    :return: Ключ сортировки.
+    """
+    if due_date is None:
+        return task.due_ordinal, task.id
+    return parse_due_date(due_date), task.id
+
+
+def urgency_key(task: Task, due_date: Optional[str] = None,
+                priority: Optional[str] = None) -> Tuple:
+    """
+    Возвращает ключ сортировки задачи по срочности: по сроку
+    выполнения, а при равных сроках - по убыванию приоритета.
+
+    :param task: Задача.
+    :param due_date: Срок выполнения, который следует использовать
+    вместо текущего.
+    :param priority: Приоритет, который следует использовать
+    вместо текущего.
+    :return: Ключ сортировки.
+    """
+    ordinal = (task.due_ordinal if due_date is None
+               else parse_due_date(due_date))
+    code = (task.priority_code if priority is None
+            else PRIORITIES.index(priority))
+    return ordinal, -code, task.id
+
+
+class SortedTaskList:
+    """
+    Список задач, постоянно упорядоченный по ключу
+    (по умолчанию - по сроку выполнения).
+
+    Вставка и удаление выполняются бинарным поиском,
+    поэтому чтение не требует повторной сортировки.
+    Первым элементом ключа должен быть срок выполнения
+    в виде порядкового номера дня.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = (),
+                 key: Callable[[Task], Tuple] = due_date_key):
+        """
+        Инициализирует список, сортируя переданные задачи один раз.
+
+        :param tasks: Начальный набор задач.
+        :param key: Функция ключа сортировки задачи.
+        """
+        self._key = key
+        self._keys: List[Tuple] = []
+        self._tasks: List[Task] = []
+        self.update(tasks)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks)
+
+    def head(self, count: int) -> List[Task]:
+        """
+        Возвращает первые задачи списка.
+
+        :param count: Число задач.
+        :return: Список не более чем из count задач.
+        """
+        return self._tasks[:max(count, 0)]
+
+    def add(self, task: Task) -> None:
+        """
+        Вставляет задачу, сохраняя порядок.
+
+        :param task: Задача для вставки.
+        """
+        key = self._key(task)
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._tasks.insert(i, task)
+
+    def update(self, tasks: Iterable[Task]) -> None:
+        """
+        Вставляет набор задач за одну сортировку.
+
+        Новые задачи сортируются отдельно и сливаются с уже
+        упорядоченными, что выполняется за линейное время.
+
+        :param tasks: Задачи для вставки.
+        """
+        pairs = sorted(((self._key(task), task) for task in tasks),
+                       key=itemgetter(0))
+        if not pairs:
+            return
+        if self._keys:
+            pairs = list(zip(self._keys, self._tasks)) + pairs
+            pairs.sort(key=itemgetter(0))
+        self._keys = [key for key, _ in pairs]
+        self._tasks = [task for _, task in pairs]
+
+    def remove(self, task: Task, key: Optional[Tuple] = None) -> None:
+        """
+        Удаляет задачу из списка.
+
+        :param task: Задача для удаления.
+        :param key: Ключ, под которым задача была вставлена.
+        Если None, ключ вычисляется по текущим данным задачи.
+        :raise ValueError: Если задача отсутствует в списке.
+        """
+        if key is None:
+            key = self._key(task)
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._tasks[i] is not task:
+            raise ValueError('Задача отсутствует в индексе')
+        del self._keys[i]
+        del self._tasks[i]
+
+    def _bounds(self, start: Optional[int],
+                end: Optional[int]) -> Tuple[int, int]:
+        lo = 0 if start is None else bisect_left(self._keys, (start,))
+        hi = (len(self._keys) if end is None
+              else bisect_left(self._keys, (end + 1,)))
+        return lo, max(lo, hi)
+
+    def count_between(self, start: Optional[int],
+                      end: Optional[int]) -> int:
+        """
+        Возвращает число задач со сроком выполнения в диапазоне.
+
+        :param start: Первый день диапазона (порядковый номер)
+        или None, если диапазон не ограничен снизу.
+        :param end: Последний день диапазона включительно
+        или None, если диапазон не ограничен сверху.
+        :return: Число задач.
+        """
+        lo, hi = self._bounds(start, end)
+        return hi - lo
+
+    def between(self, start: Optional[int],
+                end: Optional[int]) -> Iterator[Task]:
+        """
+        Перебирает задачи со сроком выполнения в диапазоне
+        в порядке сроков, находя границы бинарным поиском.
+
+        :param start: Первый день диапазона (порядковый номер)
+        или None, если диапазон не ограничен снизу.
+        :param end: Последний день диапазона включительно
+        или None, если диапазон не ограничен сверху.
+        :return: Итератор задач.
+        """
+        lo, hi = self._bounds(start, end)
+        tasks = self._tasks
+        return (tasks[i] for i in range(lo, hi))
+
+    def remove_if(self, predicate: Callable[[Task], bool]) -> None:
+        """
+        Удаляет все задачи, удовлетворяющие условию, за один проход.
+
+        :param predicate: Условие удаления задачи.
+        """
+        kept = [i for i, task in enumerate(self._tasks)
+                if not predicate(task)]
+        self._keys = [self._keys[i] for i in kept]
+        self._tasks = [self._tasks[i] for i in kept]
@@ -1,9 +1,11 @@
-from datetime import datetime
-from typing import List
-
-from tabulate import tabulate
+from typing import Iterable, List, Optional, Sequence
 
 from task import Task
+from task_date import is_date
+from task_manager import TaskManager
+from task_render import Pager, column_widths, render_table, task_row
+
+PAGE_SIZE = 20
 
 
 def print_menu(size: int) -> None:
@@ -27,24 +29,66 @@ def print_menu(size: int) -> None:
         print('2. Выход')
 
 
-def print_tasks(tasks: List[Task]) -> None:
+def print_load_progress(task_manager: TaskManager) -> None:
+    """
+    Выводит количество задач, загруженных на данный момент.
+
+    :param task_manager: Загружающийся менеджер задач.
+    """
+    print(f'\rЗагружено задач: {task_manager.size}', end='', flush=True)
+
+
+def print_tasks(tasks: Iterable[Task]) -> None:
     """
     Выводит список задач в табличном формате.
 
-    :param tasks: Список задач для отображения.
+    Таблица выводится построчно, а ширина столбцов подбирается
+    по первым задачам, поэтому вывод начинается сразу.
+
+    :param tasks: Задачи для отображения.
     """
-    table = [[
-        task.id,
-        task.title,
-        task.description,
-        task.category,
-        task.due_date,
-        task.priority,
-        task.status
-    ] for task in tasks]
-    headers = ['ID', 'Название', 'Описание', 'Категория',
-               'Срок выполнения', 'Приоритет', 'Статус']
-    print(tabulate(table, headers=headers, tablefmt='grid'))
+    for line in render_table(map(task_row, tasks)):
+        print(line)
+
+
+def browse_tasks(tasks: Iterable[Task], page_size: int = PAGE_SIZE) -> None:
+    """
+    Выводит задачи постранично с переходом по страницам.
+
+    Задачи запрашиваются у итератора только для показываемых страниц.
+    Если задачи помещаются на одну страницу, они просто выводятся.
+
+    :param tasks: Задачи для отображения.
+    :param page_size: Число задач на странице.
+    """
+    pager = Pager(tasks, page_size)
+    while True:
+        rows = [task_row(task) for task in pager.items()]
+        for line in render_table(rows, column_widths(rows)):
+            print(line)
+        has_next = pager.has_next()
+        if pager.page == 0 and not has_next:
+            return
+        total = pager.page_count or f'{pager.loaded_pages}+'
+        print(f'Страница {pager.page + 1} из {total}')
+        while True:
+            choice = input('\nEnter - следующая страница, "-" - предыдущая, '
+                           'номер - перейти к странице, 0 - выход: ')
+            if choice in ('', '+'):
+                if pager.next():
+                    break
+                print('\nЭто последняя страница')
+            elif choice == '-':
+                if pager.prev():
+                    break
+                print('\nЭто первая страница')
+            elif choice == '0':
+                return
+            elif choice.isdigit():
+                pager.jump(int(choice))
+                break
+            else:
+                print('\nНекорректный ввод')
 
 
 def print_categories(categories: List[str]) -> None:
@@ -85,6 +129,7 @@ def print_search_menu() -> None:
     print('1. Поиск по ключевым словам')
     print('2. Поиск по категории')
     print('3. Поиск по статусу')
+    print('4. Поиск по нескольким условиям')
 
 
 def input_str(prompt: str) -> str:
@@ -112,12 +157,46 @@ def input_date(prompt: str) -> str:
     """
     while True:
         date_str = input(prompt)
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')
+        if is_date(date_str):
             return date_str
-        except ValueError:
-            print('\nНекорректная дата. Пожалуйста, '
-                  'введите дату в формате ГГГГ-ММ-ДД')
+        print('\nНекорректная дата. Пожалуйста, '
+              'введите дату в формате ГГГГ-ММ-ДД')
+
+
+def input_optional_date(prompt: str) -> Optional[str]:
+    """
+    Запрашивает у пользователя дату, которую можно не вводить.
+
+    :param prompt: Текст запроса.
+    :return: Дата в формате 'ГГГГ-ММ-ДД' или None для пустого ввода.
+    """
+    while True:
+        date_str = input(prompt)
+        if not date_str:
+            return None
+        if is_date(date_str):
+            return date_str
+        print('\nНекорректная дата. Пожалуйста, '
+              'введите дату в формате ГГГГ-ММ-ДД')
+
+
+def input_optional_choice(prompt: str,
+                          options: Sequence[str]) -> Optional[str]:
+    """
+    Запрашивает у пользователя выбор варианта по номеру,
+    который можно не делать.
+
+    :param prompt: Текст запроса.
+    :param options: Варианты, нумеруемые с 1.
+    :return: Выбранный вариант или None для пустого ввода.
+    """
+    while True:
+        choice = input(prompt)
+        if not choice:
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(options):
+            return options[int(choice) - 1]
+        print(f'\nНекорректный ввод. Введите число от 1 до {len(options)}')
 
 
 def input_priority(prompt: str) -> str:
@@ -160,23 +239,22 @@ def input_status(prompt: str) -> str:
                 print('\nНекорректный ввод. Введите число от 1 до 2')
 
 
-def input_task(prompt: str, tasks: List[Task]) -> Task:
+def input_task(prompt: str, task_manager: TaskManager) -> Task:
     """
     Запрашивает у пользователя ввод ID задачи
     и возвращает соответствующую задачу.
 
     :param prompt: Текст запроса.
-    :param tasks: Список задач для поиска.
+    :param task_manager: Менеджер задач, в котором ищется задача.
     :return: Задача с введенным ID.
     """
     while True:
         task_str = input(prompt)
         try:
-            task_id = int(task_str)
-            for task in tasks:
-                if task.id == task_id:
-                    return task
-            raise ValueError
+            task = task_manager.get_task(int(task_str))
+            if task is None:
+                raise ValueError
+            return task
         except ValueError:
             print('\nНекорректный ввод')
 
@@ -0,0 +1,107 @@
+import json
+import os
+from typing import Dict, Iterator, Tuple
+
+from task_json import TaskFileError, fsync_directory
+
+
+class TaskJournal:
+    """
+    Журнал изменений задач, дописываемый после последнего снимка.
+
+    Каждая запись - одна строка JSON, которая сбрасывается на диск
+    через fsync. Оборванная при сбое последняя строка при чтении
+    отбрасывается.
+
+    Журнал следует сжать в новый снимок, когда он больше MIN_SIZE
+    байт и больше доли RATIO от размера снимка.
+    """
+
+    MIN_SIZE = 1 << 20
+    RATIO = 0.5
+
+    def __init__(self, file_name: str):
+        """
+        Открывает журнал.
+
+        :param file_name: Путь к файлу журнала.
+        """
+        self.file_name = file_name
+        self._file = None
+        try:
+            self.size = os.path.getsize(file_name)
+        except FileNotFoundError:
+            self.size = 0
+
+    def records(self) -> Iterator[Tuple[int, Dict]]:
+        """
+        Читает записи журнала.
+
+        Оборванная последняя запись обрезается из файла.
+
+        :return: Итератор пар (позиция записи в байтах, запись).
+        :raise TaskFileError: Если запись в середине журнала повреждена.
+        """
+        try:
+            file = open(self.file_name, 'rb')
+        except FileNotFoundError:
+            return
+        offset = 0
+        with file:
+            for index, line in enumerate(file, 1):
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    raise TaskFileError(offset, index, str(exc))
+                yield offset, record
+                offset += len(line)
+        if offset < self.size:
+            with open(self.file_name, 'r+b') as file:
+                file.truncate(offset)
+                os.fsync(file.fileno())
+            self.size = offset
+
+    def append(self, record: Dict) -> None:
+        """
+        Дописывает запись в журнал и сбрасывает ее на диск.
+
+        :param record: Запись.
+        """
+        if self._file is None:
+            created = not os.path.exists(self.file_name)
+            self._file = open(self.file_name, 'ab')
+            if created:
+                fsync_directory(self.file_name)
+        line = json.dumps(record).encode() + b'\n'
+        self._file.write(line)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.size += len(line)
+
+    def needs_compaction(self, snapshot_size: int) -> bool:
+        """
+        Проверяет, пора ли сжать журнал в новый снимок.
+
+        :param snapshot_size: Размер файла снимка в байтах.
+        :return: True, если журнал превысил порог.
+        """
+        return self.size > max(self.MIN_SIZE, self.RATIO * snapshot_size)
+
+    def clear(self) -> None:
+        """
+        Очищает журнал после записи нового снимка.
+        """
+        self.close()
+        with open(self.file_name, 'wb') as file:
+            os.fsync(file.fileno())
+        self.size = 0
+
+    def close(self) -> None:
+        """
+        Закрывает файл журнала.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,256 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterable, Iterator, TextIO, Tuple
+
+from task import Task
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Модули сжатия по расширению файла задач (например, tasks.json.gz).
+CODECS = {'.gz': gzip, '.bz2': bz2, '.xz': lzma}
+# Параметры сжатия при записи. Уровень gzip 9 по умолчанию сжимает
+# в несколько раз медленнее уровня 6, а файл меньше лишь на 10 %.
+_WRITE_OPTIONS = {gzip: {'compresslevel': 6}}
+
+
+def codec_of(file_name: str):
+    """
+    Возвращает модуль сжатия файла задач по его расширению.
+
+    :param file_name: Путь к файлу.
+    :return: Модуль gzip, bz2 или lzma либо None для файла без сжатия.
+    """
+    return CODECS.get(os.path.splitext(file_name)[1].lower())
+
+
+def open_tasks(file_name: str) -> TextIO:
+    """
+    Открывает файл задач для чтения в текстовом режиме.
+
+    Сжатые файлы (.gz, .bz2, .xz) распаковываются потоково
+    по мере чтения, а не целиком в память.
+
+    :param file_name: Путь к файлу.
+    :return: Открытый файл.
+    :raise FileNotFoundError: Если файл не найден.
+    """
+    codec = codec_of(file_name)
+    if codec is None:
+        return open(file_name, 'r')
+    return codec.open(file_name, 'rt', encoding='utf-8')
+
+
+def fsync_directory(path: str) -> None:
+    """
+    Сбрасывает на диск запись каталога, чтобы переименование
+    или создание файла в нем пережило сбой.
+
+    На системах, где каталог нельзя открыть, ничего не делает.
+
+    :param path: Путь к файлу, каталог которого сбрасывается.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class TaskFileError(ValueError):
+    """
+    Ошибка чтения файла задач.
+
+    Содержит позицию (в символах от начала файла) и порядковый
+    номер записи, на которой чтение было прервано.
+    """
+
+    def __init__(self, offset: int, index: int, reason: str):
+        """
+        :param offset: Позиция некорректной записи в файле.
+        :param index: Порядковый номер записи, начиная с 1.
+        :param reason: Описание ошибки.
+        """
+        super().__init__(f'Некорректная запись №{index} '
+                         f'(позиция {offset}): {reason}')
+        self.offset = offset
+        self.index = index
+        self.reason = reason
+
+
+def iter_json_array(file: TextIO,
+                    chunk_size: int = 1 << 16) -> Iterator[Tuple[int, Any]]:
+    """
+    Читает JSON-массив из файла по одному элементу, не загружая
+    файл целиком.
+
+    Пустой файл считается пустым массивом.
+
+    :param file: Файл, открытый в текстовом режиме.
+    :param chunk_size: Размер читаемого за раз фрагмента в символах.
+    :return: Итератор пар (позиция элемента в файле, элемент).
+    :raise TaskFileError: Если файл не является JSON-массивом.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    base = pos = 0
+    eof = False
+    index = 0
+
+    def fill() -> bool:
+        nonlocal buffer, base, pos, eof
+        if eof:
+            return False
+        chunk = file.read(max(chunk_size, len(buffer) - pos))
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        base += pos
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ''
+
+    def error(reason: str) -> TaskFileError:
+        return TaskFileError(base + pos, index + 1, reason)
+
+    char = next_char()
+    if not char:
+        return
+    if char != '[':
+        raise error('ожидался массив задач')
+    pos += 1
+    if next_char() == ']':
+        pos += 1
+    else:
+        while True:
+            if not next_char():
+                raise error('неожиданный конец файла')
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    if fill():
+                        continue
+                    raise error(exc.msg)
+                if end < len(buffer) or not fill():
+                    break
+            yield base + pos, value
+            index += 1
+            pos = end
+            char = next_char()
+            if char not in (',', ']'):
+                raise error('ожидалась запятая или конец массива')
+            pos += 1
+            if char == ']':
+                break
+    if next_char():
+        raise error('лишние данные после массива задач')
+
+
+def iter_tasks(file: TextIO) -> Iterator[Task]:
+    """
+    Читает задачи из JSON-файла по одной.
+
+    :param file: Файл, открытый в текстовом режиме.
+    :return: Итератор задач.
+    :raise TaskFileError: Если файл поврежден или содержит
+    некорректную задачу.
+    """
+    for index, (offset, data) in enumerate(iter_json_array(file), 1):
+        try:
+            yield Task.from_dict(data)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise TaskFileError(offset, index, str(exc) or repr(exc))
+
+
+def write_tasks(file_name: str, tasks: Iterable[Task]) -> None:
+    """
+    Атомарно записывает задачи в JSON-файл.
+
+    :param file_name: Путь к файлу.
+    :param tasks: Задачи для записи.
+    """
+    write_records(file_name, (task.to_dict() for task in tasks))
+
+
+@contextmanager
+def atomic_file(file_name: str, mode: str = 'w',
+                **options: Any) -> Iterator[IO]:
+    """
+    Открывает временный файл рядом с целевым, который после
+    успешного выхода из блока сбрасывается на диск через fsync
+    и переименовывается поверх целевого.
+
+    При сбое на диске остается либо старый, либо новый файл,
+    а при исключении временный файл удаляется. Имя временного
+    файла уникально для процесса и потока. Если у целевого файла
+    расширение сжатия (.gz, .bz2, .xz), данные сжимаются потоково
+    по мере записи.
+
+    :param file_name: Путь к целевому файлу.
+    :param mode: Режим открытия ('w' или 'wb').
+    :param options: Параметры открытия текстового файла
+    (encoding, newline).
+    :return: Открытый временный файл.
+    """
+    temp_name = f'{file_name}.{os.getpid()}.{threading.get_ident()}.tmp'
+    codec = codec_of(file_name)
+    try:
+        with open(temp_name, 'wb' if codec else mode,
+                  **({} if codec else options)) as raw:
+            if codec is None:
+                yield raw
+            else:
+                options = {**_WRITE_OPTIONS.get(codec, {}), **options}
+                if 'b' not in mode:
+                    mode += 't'
+                    options.setdefault('encoding', 'utf-8')
+                with codec.open(raw, mode, **options) as file:
+                    yield file
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_name, file_name)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    fsync_directory(file_name)
+
+
+def write_records(file_name: str, records: Iterable[Dict]) -> None:
+    """
+    Атомарно записывает словари задач в JSON-файл.
+
+    Записи пишутся по одной, не собирая файл в памяти.
+
+    :param file_name: Путь к файлу.
+    :param records: Словари задач (Task.to_dict).
+    """
+    with atomic_file(file_name) as file:
+        separator = '['
+        for record in records:
+            file.write(separator)
+            file.write(json.dumps(record))
+            separator = ', '
+        file.write('[]' if separator == '[' else ']')
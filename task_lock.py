@@ -0,0 +1,104 @@
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: блокировка файлов через msvcrt.
+    fcntl = None
+    import msvcrt
+
+
+class ReadWriteLock:
+    """
+    Блокировка с разделяемым доступом для чтения
+    и исключительным доступом для записи.
+
+    Любое число потоков может одновременно удерживать блокировку
+    для чтения, а поток записи ждет, пока они ее отпустят. Ожидающий
+    поток записи не пропускает вперед новых читателей, поэтому
+    постоянный поток чтений не откладывает запись бесконечно.
+    Блокировка не реентерабельна: поток, удерживающий ее, не должен
+    захватывать ее повторно.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Удерживает блокировку для чтения на время блока.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._writer and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Удерживает блокировку для записи на время блока.
+        """
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                self._condition.wait_for(
+                    lambda: not self._writer and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+@contextmanager
+def locked_file(file_name: str) -> Iterator[IO[bytes]]:
+    """
+    Открывает файл (создавая его, если нужно) и удерживает
+    на время блока исключительную рекомендательную блокировку,
+    общую для всех процессов: fcntl.flock в Unix и msvcrt.locking
+    в Windows.
+
+    Файл открыт в режиме 'a+b'; чтобы прочитать его, нужно
+    перейти в начало.
+
+    :param file_name: Путь к файлу.
+    :return: Открытый файл.
+    """
+    with open(file_name, 'a+b') as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK сдается после 10 попыток раз в секунду.
+                    pass
+        try:
+            yield file
+        finally:
+            file.flush()
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
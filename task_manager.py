@@ -1,7 +1,36 @@
+import gc
 import json
+import os
+from contextlib import contextmanager
+from datetime import date
 
-from task import Task
-from typing import List, Optional
+from task import Task, TaskChange, parse_due_date
+from task_autosave import AutoSaver
+from task_cache import CacheStats, QueryCache
+from task_journal import TaskJournal
+from task_json import TaskFileError, iter_tasks, open_tasks, write_tasks
+from task_query import Query
+from task_snapshot import (SnapshotTaskStore, is_snapshot_file,
+                           write_snapshot)
+from task_sqlite import SqliteTaskStore, is_sqlite_file, write_sqlite
+from task_store import MemoryTaskStore, TaskStore
+from task_sync import SharedTaskFile
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Mapping,
+                    Optional, Set, Tuple)
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Приостанавливает сборщик циклического мусора на время блока.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 class TaskManager:
@@ -15,15 +44,157 @@ class TaskManager:
     а также сохранять изменения в файл.
     """
 
-    def __init__(self, storage_file: str):
+    LOAD_BATCH_SIZE = 1000
+    # Число задач, начиная с которого поиск по ключевому слову
+    # по умолчанию выполняется в нескольких процессах.
+    PARALLEL_THRESHOLD = 50_000
+    # Ограничения кэша результатов запросов: число результатов
+    # и их суммарный размер в байтах.
+    CACHE_ENTRIES = 128
+    CACHE_SIZE = 32 * 1024 * 1024
+
+    def __init__(self, storage_file: str, text_index: bool = False,
+                 columnar: bool = False,
+                 on_progress: Optional[Callable[['TaskManager'],
+                                                None]] = None,
+                 journal: bool = False,
+                 parallel: Optional[bool] = None,
+                 shared: bool = False,
+                 cache: bool = True):
         """
         Инициализирует объект менеджера задач.
 
+        Задачи загружаются из файла порциями, после каждой из которых
+        менеджер уже готов к запросам. Если файл поврежден, загруженные
+        до ошибки задачи сохраняются, а ошибка доступна в load_error.
+
+        Если у файла расширение базы SQLite (.db, .sqlite, .sqlite3),
+        задачи не загружаются в память: они хранятся в базе
+        в SqliteTaskStore, а запросы выполняются средствами SQL.
+        Параметры text_index, columnar и journal в этом случае
+        не используются.
+
+        Двоичный снимок (.snapshot) отображается в память через mmap
+        и открывается без разбора задач; задачи декодируются
+        при обращении к ним в SnapshotTaskStore. Изменения хранятся
+        в памяти до сохранения в файл.
+
         :param storage_file: Путь к файлу, в котором хранятся задачи.
+        :param text_index: Если True, поиск по ключевым словам
+        использует инвертированный индекс слов задач.
+        :param columnar: Если True, задачи хранятся по столбцам
+        в ColumnarTaskStore, а объекты Task создаются только
+        для возвращаемых задач.
+        :param on_progress: Функция, которая вызывается с менеджером
+        после загрузки каждой порции задач.
+        :param journal: Если True, каждое изменение дописывается
+        в журнал storage_file + '.journal', который при загрузке
+        применяется поверх файла задач и периодически сжимается
+        в новый файл задач.
+        :param parallel: Поиск по ключевому слову в нескольких
+        процессах (ParallelSearcher) для хранилища в памяти без
+        индекса слов: True - всегда, False - никогда, None -
+        начиная с PARALLEL_THRESHOLD задач.
+        :param shared: Если True, JSON-файл задач могут одновременно
+        изменять несколько процессов: сохранение выполняется
+        под блокировкой файла и объединяет изменения этого процесса
+        с изменениями, сохраненными другими процессами, а ID новых
+        задач выдаются через общий файл метаданных (см.
+        SharedTaskFile).
+        :param cache: Если True, результаты запросов запоминаются
+        в QueryCache до следующего изменения задач, и повторный
+        запрос без изменений не выполняется в хранилище заново.
         """
         self.storage_file = storage_file
-        self.tasks = self.load_tasks()
-        self.task_id = max((task.id for task in self.tasks), default=0) + 1
+        self.load_error: Optional[TaskFileError] = None
+        # Номер версии задач, увеличивается при каждом изменении.
+        self.generation = 0
+        self._searcher = None
+        self._searched_generation: Optional[int] = None
+        # Кэш включается после загрузки, чтобы запросы из on_progress
+        # не запоминали частично загруженные задачи.
+        self._cache: Optional[QueryCache] = None
+        self._shared: Optional[SharedTaskFile] = None
+        # ID задач, измененных после загрузки или сохранения общего
+        # файла задач.
+        self._dirty: Set[int] = set()
+        self._journal: Optional[TaskJournal] = None
+        self._autosaver: Optional[AutoSaver] = None
+        self._subscribers: List[Callable[[List[TaskChange]], None]] = []
+        self._batch_depth = 0
+        self._pending: Dict[Tuple[int, str], TaskChange] = {}
+        self._store: TaskStore
+        self._parallel: Optional[bool] = False
+        if is_sqlite_file(storage_file):
+            self._store = SqliteTaskStore(self, storage_file)
+        elif is_snapshot_file(storage_file):
+            self._store = SnapshotTaskStore(self, storage_file)
+        else:
+            if columnar:
+                # Импортируется здесь, чтобы NumPy загружался только
+                # для столбцового хранилища.
+                from task_columns import ColumnarTaskStore
+                self._store = ColumnarTaskStore(self)
+            else:
+                self._store = MemoryTaskStore(self, text_index=text_index)
+            if shared and storage_file:
+                self._shared = SharedTaskFile(storage_file)
+                self._shared.generation = self._shared.read_generation()
+            self._load(on_progress)
+            if not (columnar or text_index):
+                self._parallel = parallel
+            if journal:
+                self._open_journal()
+        self.task_id = self._store.max_id() + 1
+        if cache:
+            self._cache = QueryCache(self.CACHE_ENTRIES, self.CACHE_SIZE)
+
+    def _load(self, on_progress: Optional[Callable[['TaskManager'],
+                                                   None]]) -> None:
+        """
+        Загружает задачи из файла в хранилище порциями.
+
+        Размер порции удваивается, поэтому первые задачи доступны
+        почти сразу, а общее время загрузки остается O(n log n).
+
+        :param on_progress: Функция, которая вызывается с менеджером
+        после загрузки каждой порции задач.
+        """
+        batch: List[Task] = []
+        batch_size = self.LOAD_BATCH_SIZE
+        try:
+            for task in self.load_tasks():
+                batch.append(task)
+                if len(batch) == batch_size:
+                    self._store.extend(batch)
+                    batch = []
+                    batch_size *= 2
+                    if on_progress is not None:
+                        on_progress(self)
+        except TaskFileError as error:
+            self.load_error = error
+        self._store.extend(batch)
+
+    @property
+    def tasks(self) -> List[Task]:
+        """
+        Возвращает список задач в порядке их добавления.
+
+        :return: Список задач.
+        """
+        return list(self._store)
+
+    @property
+    def concurrent_reads(self) -> bool:
+        """
+        Проверяет, можно ли выполнять запросы к задачам
+        из нескольких потоков одновременно.
+
+        Изменения задач всегда требуют исключительного доступа.
+
+        :return: True для хранилища объектов Task в памяти.
+        """
+        return self._store.concurrent_reads
 
     @property
     def size(self) -> int:
@@ -32,22 +203,255 @@ class TaskManager:
 
         :return: Количество задач.
         """
-        return len(self.tasks)
+        return len(self._store)
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """
+        Возвращает статистику кэша результатов запросов.
+
+        :return: Число попаданий, промахов, вытеснений и сбросов,
+        а также число и размер результатов в кэше; None, если кэш
+        выключен.
+        """
+        return None if self._cache is None else self._cache.stats()
+
+    def _cached(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Возвращает результат запроса из кэша или выполняет запрос.
+
+        Версия задач для кэша включает версию данных хранилища,
+        поэтому изменения базы SQLite другим процессом тоже
+        сбрасывают кэш. Если хранилище не держит задачи само, их
+        размер учитывается в ограничении памяти кэша.
+
+        :param key: Метод и аргументы запроса.
+        :param compute: Функция, выполняющая запрос в хранилище.
+        :return: Результат запроса.
+        """
+        if self._cache is None:
+            return compute()
+        return self._cache.get(
+            key, (self.generation, self._store.data_version()), compute,
+            not self._store.owns_tasks)
+
+    def _open_journal(self) -> None:
+        """
+        Применяет журнал изменений к загруженным задачам и включает
+        запись в него.
+
+        Если журнал поврежден, ошибка сохраняется в load_error,
+        а журналирование остается выключенным, чтобы новые записи
+        не оказались после поврежденной.
+        """
+        if not self.storage_file:
+            raise ValueError('Для журнала нужен файл задач')
+        journal = TaskJournal(self.storage_file + '.journal')
+        try:
+            for offset, record in journal.records():
+                try:
+                    self._apply(record)
+                except (KeyError, TypeError, ValueError) as exc:
+                    raise TaskFileError(offset, 0, str(exc) or repr(exc))
+        except TaskFileError as error:
+            self.load_error = error
+            return
+        try:
+            self._snapshot_size = os.path.getsize(self.storage_file)
+        except FileNotFoundError:
+            self._snapshot_size = 0
+        self._journal = journal
+
+    def _apply(self, record: Dict) -> None:
+        """
+        Применяет запись журнала к хранилищу.
+
+        Повторное применение записи не меняет результат, поэтому
+        журнал можно применить поверх более нового файла задач.
+
+        :param record: Запись журнала.
+        """
+        op = record['op']
+        if op == 'add':
+            self._store.extend([Task.from_dict(record['task'])])
+        elif op == 'set':
+            task = self._store.get(record['id'])
+            if task is not None:
+                setattr(task, record['field'], record['value'])
+        elif op == 'delete':
+            self._store.remove(record['ids'])
+        elif op == 'delete_category':
+            self._store.remove_category(record['category'])
+        else:
+            raise ValueError(f'Неизвестная операция {op!r}')
+
+    def _record(self, record: Dict) -> None:
+        """
+        Учитывает изменение в generation, дописывает его в журнал,
+        если он включен, и сжимает журнал в новый файл задач
+        при превышении порога.
+
+        :param record: Запись журнала.
+        """
+        self.generation += 1
+        if self._journal is None:
+            return
+        self._journal.append(record)
+        if self._journal.needs_compaction(self._snapshot_size):
+            self.save_tasks(self.storage_file)
+
+    def _task_changed(self, task: Task, field: str, old) -> None:
+        """
+        Обновляет хранилище после изменения поля задачи
+        и уведомляет подписчиков.
+
+        Вызывается сеттерами Task.
+
+        :param task: Измененная задача.
+        :param field: Название измененного поля.
+        :param old: Прежнее значение поля.
+        """
+        self._store.changed(task, field, old)
+        new = getattr(task, field)
+        self._record({'op': 'set', 'id': task.id, 'field': field,
+                      'value': new})
+        self._mark_dirty([task.id])
+        if self._autosaver is not None:
+            self._autosaver.mark(task.id, task)
+        if not self._subscribers:
+            return
+        key = (task.id, field)
+        if key in self._pending:
+            old = self._pending[key].old
+        self._pending[key] = TaskChange(task, field, old, new)
+        if not self._batch_depth:
+            self._flush_changes()
+
+    def _mark_dirty(self, task_ids: Iterable[int]) -> None:
+        """
+        Запоминает задачи, измененные после загрузки или сохранения
+        общего файла задач, для слияния при сохранении. При включенном
+        автосохранении изменения запоминает поток автосохранения.
+
+        :param task_ids: ID измененных, добавленных или удаленных задач.
+        """
+        if self._shared is not None and self._autosaver is None:
+            self._dirty.update(task_ids)
+
+    def _save_shared(self) -> None:
+        """
+        Сохраняет общий файл задач под его блокировкой.
+
+        Если после загрузки или сохранения файл изменил другой процесс,
+        сначала в хранилище переносятся его версии задач, которые
+        этот процесс не изменял, а затем файл перезаписывается.
+        """
+        shared = self._shared
+        with shared.lock() as meta:
+            if meta['generation'] != shared.generation:
+                self._merge_remote(shared.read_tasks())
+            write_tasks(self.storage_file, self._store)
+            meta['generation'] += 1
+            shared.generation = meta['generation']
+        self._dirty.clear()
+
+    def _merge_remote(self, remote: Dict[int, Task]) -> None:
+        """
+        Переносит в хранилище задачи из общего файла, кроме задач,
+        измененных этим процессом: новые задачи добавляются,
+        измененные заменяются, а удаленные в файле удаляются.
+
+        :param remote: Задачи из файла по ID.
+        """
+        stale = [task.id for task in self._store
+                 if task.id not in remote and task.id not in self._dirty]
+        added = []
+        for task_id, task in remote.items():
+            if task_id in self._dirty:
+                continue
+            local = self._store.get(task_id)
+            if local is None:
+                added.append(task)
+            elif local.to_dict() != task.to_dict():
+                stale.append(task_id)
+                added.append(task)
+        if stale:
+            self._store.remove(stale)
+        if added:
+            self._store.extend(added)
+        self.task_id = max(self.task_id, self._store.max_id() + 1)
+        self.generation += 1
+
+    def _flush_changes(self) -> None:
+        """
+        Передает накопленные изменения подписчикам.
+
+        Поля, вернувшиеся к прежнему значению, не передаются.
+        """
+        changes = [change for change in self._pending.values()
+                   if change.old != change.new]
+        self._pending = {}
+        if changes:
+            for callback in list(self._subscribers):
+                callback(changes)
+
+    def subscribe(self, callback: Callable[[List[TaskChange]], None]
+                  ) -> Callable[[], None]:
+        """
+        Подписывает функцию на изменения полей задач.
+
+        Функция получает список событий TaskChange: по одному
+        на каждое изменение или, внутри batch, все изменения пакета.
+
+        :param callback: Функция, принимающая список изменений.
+        :return: Функция, отменяющая подписку.
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    @contextmanager
+    def batch(self) -> Iterator['TaskManager']:
+        """
+        Объединяет изменения задач в одно уведомление подписчиков.
+
+        Хранилище и журнал обновляются сразу, поэтому запросы внутри
+        пакета видят изменения. Подписчики получают изменения при выходе
+        из внешнего пакета; несколько изменений одного поля задачи
+        сливаются в одно (от первого прежнего значения к последнему).
+        Пакеты могут быть вложенными.
+
+        :return: Этот же менеджер задач.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_changes()
 
-    def load_tasks(self) -> List[Task]:
+    def load_tasks(self) -> Iterator[Task]:
         """
-        Загружает задачи из файла.
+        Загружает задачи из файла по одной, не читая файл целиком.
 
-        Если файл не найден или поврежден, возвращает пустой список.
+        Если файл не найден, задач нет. Файлы с расширением сжатия
+        (.json.gz, .json.bz2, .json.xz) распаковываются по мере чтения.
 
-        :return: Список объектов Task.
+        :return: Итератор объектов Task.
+        :raise TaskFileError: Если файл поврежден; ошибка содержит
+        позицию некорректной записи.
         """
         try:
-            with open(self.storage_file, 'r') as file:
-                data = json.load(file)
-                return [Task.from_dict(task) for task in data]
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+            file = open_tasks(self.storage_file)
+        except FileNotFoundError:
+            return
+        with file:
+            yield from iter_tasks(file)
 
     def add_task(self, title: str, description: str,
                  category: str, due_date: str, priority: str) -> None:
@@ -62,8 +466,69 @@ class TaskManager:
         """
         task = Task(self.task_id, title, description,
                     category, due_date, priority)
-        self.task_id += 1
-        self.tasks.append(task)
+        if self._shared is not None:
+            task._id = self._shared.allocate_ids(1, self.task_id)
+        self.task_id = task.id + 1
+        self._store.add(task)
+        # Словарь задачи нужен только журналу: в файл задач его
+        # записывает поток автосохранения или save_tasks.
+        record = None if self._journal is None else task.to_dict()
+        self._record({'op': 'add', 'task': record})
+        self._mark_dirty([task.id])
+        if self._autosaver is not None:
+            self._autosaver.mark(task.id, task)
+
+    def add_tasks_bulk(self, records: Iterable[Mapping[str, Any]]) -> range:
+        """
+        Добавляет множество задач за один вызов.
+
+        Записи проверяются за один проход, причем каждая дата
+        разбирается один раз, новым задачам выдается непрерывный
+        диапазон ID, а индексы хранилища обновляются один раз
+        в конце. Сборщик циклического мусора на это время
+        приостанавливается: новые задачи и ключи индексов не образуют
+        циклов, а его повторные обходы растущей кучи занимают больше
+        времени, чем сама вставка. Если хотя бы одна запись
+        некорректна, ни одна задача не добавляется. Если включен
+        журнал, вместо записи каждой задачи в журнал файл задач
+        перезаписывается целиком.
+
+        :param records: Записи с полями title, description, category,
+        due_date, priority и необязательным status; поле id
+        не используется.
+        :return: Диапазон ID добавленных задач.
+        :raise ValueError: Если запись некорректна; в сообщении указан
+        ее порядковый номер, начиная с 1.
+        """
+        dates: Dict[str, Tuple[str, int]] = {}
+        tasks: List[Task] = []
+        start = task_id = self.task_id
+        with gc_paused():
+            for index, record in enumerate(records, 1):
+                try:
+                    tasks.append(Task.from_record(task_id, record, dates))
+                except KeyError as exc:
+                    raise ValueError(f'Запись №{index}: нет поля {exc}')
+                except (TypeError, ValueError) as exc:
+                    raise ValueError(f'Запись №{index}: {exc}')
+                task_id += 1
+            if self._shared is not None and tasks:
+                shared_start = self._shared.allocate_ids(len(tasks), start)
+                if shared_start != start:
+                    for offset, task in enumerate(tasks):
+                        task._id = shared_start + offset
+                    start = shared_start
+                    task_id = start + len(tasks)
+            self._store.extend(tasks)
+        self.task_id = task_id
+        self.generation += 1
+        self._mark_dirty(range(start, task_id))
+        if self._autosaver is not None:
+            for task in tasks:
+                self._autosaver.mark(task.id, task)
+        if self._journal is not None and tasks:
+            self.save_tasks(self.storage_file)
+        return range(start, task_id)
 
     def delete_task(self, value: Task | str) -> None:
         """
@@ -73,12 +538,46 @@ class TaskManager:
         для удаления всех задач этой категории.
         """
         if isinstance(value, Task):
-            self.tasks.remove(value)
+            if value._manager is not self:
+                raise ValueError('Задача не найдена')
+            self.delete_tasks([value.id])
         else:
-            category_tasks = [task for task in self.tasks
-                              if task.category == value]
-            for task in category_tasks:
-                self.tasks.remove(task)
+            if self._autosaver is not None or self._shared is not None:
+                task_ids = [task.id
+                            for task in self._store.iter_category(value)]
+                if self._autosaver is not None:
+                    for task_id in task_ids:
+                        self._autosaver.mark(task_id, None)
+                self._mark_dirty(task_ids)
+            self._store.remove_category(value)
+            self._record({'op': 'delete_category', 'category': value})
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> None:
+        """
+        Удаляет задачи с указанными ID.
+
+        Индексы обновляются за один проход, поэтому удаление
+        большого числа задач выполняется за линейное время.
+        Несуществующие ID игнорируются.
+
+        :param task_ids: ID задач для удаления.
+        """
+        task_ids = list(task_ids)
+        self._store.remove(task_ids)
+        self._record({'op': 'delete', 'ids': task_ids})
+        self._mark_dirty(task_ids)
+        if self._autosaver is not None:
+            for task_id in task_ids:
+                self._autosaver.mark(task_id, None)
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Возвращает задачу по ID.
+
+        :param task_id: ID задачи.
+        :return: Задача или None, если задачи с таким ID нет.
+        """
+        return self._store.get(task_id)
 
     def get_categories(self) -> List[str]:
         """
@@ -86,8 +585,7 @@ class TaskManager:
 
         :return: Список категорий.
         """
-        categories = set(task.category for task in self.tasks)
-        return list(categories)
+        return self._cached(('categories',), self._store.categories)
 
     def get_tasks(self, category: Optional[str] = None) -> List[Task]:
         """
@@ -99,11 +597,85 @@ class TaskManager:
         Если None, возвращаются все задачи.
         :return: Список задач.
         """
-        filtered_tasks = sorted((task for task in self.tasks
-                                 if category is None
-                                 or task.category == category),
-                                key=lambda task: task.due_date)
-        return filtered_tasks
+        return self._cached(('by_category', category),
+                            lambda: self._store.by_category(category))
+
+    def iter_tasks(self, category: Optional[str] = None) -> Iterator[Task]:
+        """
+        Перебирает задачи категории (если указана) в порядке срока
+        выполнения, не собирая их в список.
+
+        Подходит для постраничного вывода: первые задачи доступны
+        сразу, независимо от общего числа задач. Менять задачи
+        во время перебора не следует.
+
+        :param category: Категория для фильтрации задач.
+        Если None, перебираются все задачи.
+        :return: Итератор задач.
+        """
+        return self._store.iter_category(category)
+
+    def group_by(self, field: str) -> Dict[str, List[Task]]:
+        """
+        Группирует задачи по категории, приоритету или статусу.
+
+        Группы по категории следуют в порядке get_categories,
+        по приоритету и статусу - в порядке возрастания значения.
+        Пустые группы не включаются.
+
+        :param field: Поле группировки ('category', 'priority'
+        или 'status').
+        :return: Словарь значения поля в задачи, отсортированные
+        по сроку выполнения.
+        :raise ValueError: Если по полю нельзя группировать.
+        """
+        return self._cached(('group_by', field),
+                            lambda: self._store.group_by(field))
+
+    def next_due(self, n: int) -> List[Task]:
+        """
+        Возвращает n самых срочных невыполненных задач.
+
+        Задачи упорядочены по сроку выполнения, а при равных сроках -
+        по убыванию приоритета. Хранилище в памяти поддерживает
+        для этого отдельный индекс невыполненных задач.
+
+        :param n: Число задач.
+        :return: Список не более чем из n задач.
+        """
+        return self._cached(('next_due', n),
+                            lambda: self._store.next_due(n))
+
+    def overdue(self, as_of: Optional[str] = None) -> List[Task]:
+        """
+        Возвращает невыполненные задачи, срок выполнения которых
+        наступил раньше указанной даты.
+
+        :param as_of: Дата в формате 'ГГГГ-ММ-ДД'; по умолчанию сегодня.
+        :return: Задачи в порядке срочности.
+        :raise ValueError: Если дата не соответствует формату.
+        """
+        ordinal = (date.today().toordinal() if as_of is None
+                   else parse_due_date(as_of))
+        return self._open_between(None, ordinal - 1)
+
+    def due_between(self, start: str, end: str) -> List[Task]:
+        """
+        Возвращает невыполненные задачи со сроком выполнения
+        от start до end включительно.
+
+        :param start: Первая дата в формате 'ГГГГ-ММ-ДД'.
+        :param end: Последняя дата в формате 'ГГГГ-ММ-ДД'.
+        :return: Задачи в порядке срочности.
+        :raise ValueError: Если дата не соответствует формату.
+        """
+        return self._open_between(parse_due_date(start),
+                                  parse_due_date(end))
+
+    def _open_between(self, start: Optional[int],
+                      end: Optional[int]) -> List[Task]:
+        return self._cached(('open_between', start, end),
+                            lambda: self._store.open_between(start, end))
 
     def get_tasks_by_status(self, status: str) -> List[Task]:
         """
@@ -115,10 +687,8 @@ class TaskManager:
         ('Не выполнена' или 'Выполнена').
         :return: Список задач.
         """
-        filtered_tasks = sorted((task for task in self.tasks
-                                 if task.status == status),
-                                key=lambda task: task.due_date)
-        return filtered_tasks
+        return self._cached(('by_status', status),
+                            lambda: self._store.by_status(status))
 
     def get_tasks_by_keyword(self, keyword: str) -> List[Task]:
         """
@@ -130,24 +700,195 @@ class TaskManager:
         :param keyword: Ключевое слово для поиска.
         :return: Список задач.
         """
-        keyword = keyword.lower()
-        filtered_tasks = sorted(
-            (task for task in self.tasks
-             if keyword in task.title.lower()
-             or keyword in task.description.lower()),
-            key=lambda task: task.due_date)
-        return filtered_tasks
+        return self._cached(('by_keyword', keyword),
+                            lambda: self._by_keyword(keyword))
+
+    def _by_keyword(self, keyword: str) -> List[Task]:
+        searcher = self._keyword_searcher(keyword)
+        if searcher is None:
+            return self._store.by_keyword(keyword)
+        return searcher.search(keyword)
+
+    def _keyword_searcher(self, keyword: str):
+        """
+        Возвращает параллельный поиск, построенный для текущей версии
+        задач, или None, если искать нужно в хранилище.
+
+        В автоматическом режиме после изменения задач первый поиск
+        выполняется в хранилище, а файл текста строится заново
+        только при повторном поиске, поэтому чередование изменений
+        и поиска не замедляется.
+
+        :param keyword: Ключевое слово для поиска.
+        """
+        if not self._parallel and (self._parallel is False
+                                   or self.size < self.PARALLEL_THRESHOLD):
+            return None
+        if not keyword or '\0' in keyword:
+            return None
+        if self._searcher is None:
+            # Импортируется здесь, чтобы модуль и multiprocessing
+            # загружались только для параллельного поиска.
+            from task_parallel import ParallelSearcher
+            self._searcher = ParallelSearcher()
+        if self._searcher.generation != self.generation:
+            if (self._parallel is None
+                    and self._searched_generation != self.generation):
+                self._searched_generation = self.generation
+                return None
+            self._searcher.build(self._store.by_category(), self.generation)
+        return self._searcher
+
+    def search_tasks(self, query: str, prefix: bool = True) -> List[Task]:
+        """
+        Возвращает задачи, в названии или описании которых
+        встречаются все слова запроса.
+
+        Регистр не учитывается. Задачи сортируются по сроку выполнения.
+
+        :param query: Слова запроса через пробел.
+        :param prefix: Если True, слово запроса совпадает
+        с любым словом задачи, которое с него начинается.
+        :return: Список задач.
+        """
+        return self._cached(('search', query, prefix),
+                            lambda: self._store.search(query, prefix))
+
+    def query(self, query: Query) -> List[Task]:
+        """
+        Выполняет запрос с несколькими условиями.
+
+        Планировщик запроса выбирает самый избирательный индекс
+        хранилища, а остальные условия проверяет по мере перебора.
+
+        :param query: Запрос.
+        :return: Список подходящих задач в порядке запроса.
+        """
+        return list(self.iter_query(query))
+
+    def iter_query(self, query: Query) -> Iterator[Task]:
+        """
+        Выполняет запрос, перебирая подходящие задачи по мере
+        необходимости. Менять задачи во время перебора не следует.
+
+        :param query: Запрос.
+        :return: Итератор подходящих задач в порядке запроса.
+        """
+        return query.run(self._store)
 
     def save_tasks(self, file_name: str) -> None:
         """
         Сохраняет все задачи в файл.
 
+        Формат определяется расширением файла: базы SQLite
+        (.db, .sqlite, .sqlite3), двоичного снимка (.snapshot) или JSON,
+        который сжимается при записи, если у файла расширение сжатия
+        (.json.gz, .json.bz2, .json.xz). Файл заменяется атомарно.
+        Если включено автосохранение, сохранение в файл задач
+        дожидается записи всех изменений потоком автосохранения.
+        Если включен журнал и задачи сохраняются в файл задач,
+        журнал после сохранения очищается. В базу, из которой задачи
+        загружены, изменения уже записаны, и сохранять их не нужно.
+
         :param file_name: Название файла для сохранения задач.
         :raise json.JSONDecodeError: Если произошла ошибка при сохранении.
         """
-        try:
-            with open(file_name, 'w') as file:
-                tasks_json = [task.to_dict() for task in self.tasks]
-                json.dump(tasks_json, file)
-        except json.JSONDecodeError:
-            print('Сохранить задачи не удалось')
+        if is_sqlite_file(file_name):
+            if not (isinstance(self._store, SqliteTaskStore)
+                    and file_name == self.storage_file):
+                write_sqlite(file_name, self._store)
+            return
+        if is_snapshot_file(file_name):
+            write_snapshot(file_name, self._store)
+            return
+        if self._autosaver is not None and file_name == self.storage_file:
+            if not self._autosaver.flush():
+                print('Сохранить задачи не удалось')
+                return
+        else:
+            try:
+                if (self._shared is not None
+                        and file_name == self.storage_file):
+                    self._save_shared()
+                else:
+                    write_tasks(file_name, self._store)
+            except json.JSONDecodeError:
+                print('Сохранить задачи не удалось')
+                return
+        if self._journal is not None and file_name == self.storage_file:
+            self._journal.clear()
+            self._snapshot_size = os.path.getsize(file_name)
+
+    def start_autosave(self, interval: float = 5.0,
+                       max_changes: int = 100) -> None:
+        """
+        Включает фоновое сохранение изменений в файл задач.
+
+        Измененные задачи запоминаются при каждом изменении, а поток
+        записи преобразует их в словари и атомарно перезаписывает файл
+        задач не позже чем через interval секунд после изменения или
+        сразу после max_changes изменений. Вызывающий поток
+        не преобразует задачи и на запись на диск не ждет.
+
+        :param interval: Наибольшее время в секундах между изменением
+        и его записью.
+        :param max_changes: Число изменений, после которого запись
+        выполняется, не дожидаясь interval.
+        :raise ValueError: Если файл задач не задан или не является
+        файлом JSON: база SQLite сохраняет изменения сразу, а снимок
+        перезаписывается только целиком при сохранении.
+        """
+        if not self.storage_file:
+            raise ValueError('Для автосохранения нужен файл задач')
+        if isinstance(self._store, SqliteTaskStore):
+            raise ValueError('База SQLite сохраняет изменения сразу')
+        if isinstance(self._store, SnapshotTaskStore):
+            raise ValueError('Снимок задач сохраняется только целиком')
+        if self._autosaver is None:
+            unsaved = {task_id: self._store.get(task_id)
+                       for task_id in self._dirty}
+            self._autosaver = AutoSaver(self.storage_file,
+                                        self._store.copy_tasks(),
+                                        interval, max_changes,
+                                        self._shared, unsaved)
+            self._dirty.clear()
+
+    @property
+    def unsaved_changes(self) -> int:
+        """
+        Возвращает число изменений, которые автосохранение
+        еще не записало в файл (0, если оно выключено).
+        """
+        return 0 if self._autosaver is None else self._autosaver.unsaved
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ждет, пока автосохранение запишет все изменения.
+
+        :param timeout: Наибольшее время ожидания в секундах
+        или None, чтобы ждать без ограничения.
+        :return: True, если все изменения записаны
+        или автосохранение выключено.
+        """
+        return self._autosaver is None or self._autosaver.flush(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Освобождает ресурсы менеджера: записывает оставшиеся изменения
+        автосохранения, закрывает журнал и хранилище.
+
+        :param timeout: Наибольшее время ожидания записи в секундах
+        или None, чтобы ждать без ограничения.
+        :return: True, если все изменения автосохранения записаны.
+        """
+        saved = True
+        if self._autosaver is not None:
+            saved = self._autosaver.stop(timeout)
+            self._autosaver = None
+        if self._journal is not None:
+            self._journal.close()
+        if self._searcher is not None:
+            self._searcher.close()
+            self._searcher = None
+        self._store.close()
+        return saved
@@ -0,0 +1,75 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from task_manager import TaskManager
+from task_snapshot import is_snapshot_file
+from task_sqlite import is_sqlite_file
+from task_sync import SharedTaskFile
+
+
+def migrate(source: str, target: str) -> int:
+    """
+    Переносит задачи из одного файла задач в другой.
+
+    Формат каждого файла определяется его расширением: базы SQLite
+    (.db, .sqlite, .sqlite3), двоичного снимка (.snapshot) или JSON.
+    Целевой файл JSON записывается под блокировкой общего файла
+    задач (SharedTaskFile), а его версия увеличивается, поэтому
+    процессы, открывшие его с shared=True, при следующем сохранении
+    объединяют свои изменения с перенесенными задачами, а не
+    перезаписывают их.
+
+    :param source: Путь к исходному файлу.
+    :param target: Путь к файлу, содержимое которого заменяется задачами.
+    :return: Количество перенесенных задач.
+    :raise TaskFileError: Если исходный файл поврежден.
+    :raise ValueError: Если исходный и целевой файлы совпадают.
+    """
+    if os.path.abspath(source) == os.path.abspath(target):
+        raise ValueError('Исходный и целевой файлы совпадают')
+    task_manager = TaskManager(source)
+    try:
+        if task_manager.load_error is not None:
+            raise task_manager.load_error
+        if is_sqlite_file(target) or is_snapshot_file(target):
+            task_manager.save_tasks(target)
+        else:
+            shared = SharedTaskFile(target)
+            with shared.lock() as meta:
+                task_manager.save_tasks(target)
+                meta['generation'] += 1
+                meta['next_id'] = max(meta['next_id'], task_manager.task_id)
+        return task_manager.size
+    finally:
+        task_manager.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Переносит задачи между файлами JSON, снимками и базами SQLite.
+
+    :param argv: Аргументы командной строки.
+    :return: Код завершения.
+    """
+    parser = argparse.ArgumentParser(
+        description='Перенос задач между файлами JSON, двоичными '
+                    'снимками и базами SQLite.')
+    parser.add_argument('source', help='исходный файл задач')
+    parser.add_argument('target', help='файл, в который переносятся задачи')
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.source):
+        print(f'Файл {args.source} не найден', file=sys.stderr)
+        return 1
+    try:
+        count = migrate(args.source, args.target)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f'Перенесено задач: {count}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+from task import Task
+
+_COUNT = struct.Struct('<Q')
+# Отображенный файл текста в процессе: путь, mmap, начала строк
+# и смещение текста. Процесс держит открытым только последний файл.
+_mapped: Optional[Tuple[str, mmap.mmap, memoryview, int]] = None
+
+
+def _open_text(file_name: str) -> Tuple[mmap.mmap, memoryview, int]:
+    """
+    Отображает файл текста задач в память процесса или возвращает
+    уже отображенный.
+
+    :param file_name: Путь к файлу текста.
+    :return: Отображение, начала строк и смещение текста.
+    """
+    global _mapped
+    if _mapped is not None and _mapped[0] == file_name:
+        return _mapped[1:]
+    if _mapped is not None:
+        _mapped[2].release()
+        _mapped[1].close()
+        _mapped = None
+    with open(file_name, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    (count,) = _COUNT.unpack_from(data)
+    base = _COUNT.size + (count + 1) * 8
+    starts = memoryview(data)[_COUNT.size:base].cast('Q')
+    _mapped = (file_name, data, starts, base)
+    return data, starts, base
+
+
+def search_rows(file_name: str, start: int, end: int,
+                keyword: bytes) -> List[int]:
+    """
+    Находит строки файла текста из диапазона, содержащие ключевое
+    слово. Выполняется в процессе-исполнителе.
+
+    :param file_name: Путь к файлу текста.
+    :param start: Первая строка диапазона.
+    :param end: Строка, следующая за последней.
+    :param keyword: Ключевое слово в нижнем регистре в UTF-8.
+    :return: Номера строк по возрастанию.
+    """
+    data, starts, base = _open_text(file_name)
+    rows = []
+    position = base + starts[start]
+    stop = base + starts[end]
+    while True:
+        position = data.find(keyword, position, stop)
+        if position < 0:
+            return rows
+        row = bisect_right(starts, position - base, start, end) - 1
+        rows.append(row)
+        position = base + starts[row + 1]
+
+
+class ParallelSearcher:
+    """
+    Поиск задач по ключевому слову в нескольких процессах.
+
+    Названия и описания задач в нижнем регистре записываются
+    во временный файл текста в кодировке UTF-8 - по строке на задачу
+    в порядке срока выполнения, поля и строки разделены нулевым
+    символом. Процессы ProcessPoolExecutor отображают файл в память
+    один раз и затем просматривают свои диапазоны строк поиском
+    подстроки по байтам, так что задачи не передаются между
+    процессами при каждом запросе, а текст не переводится в нижний
+    регистр заново. Номера найденных строк каждого диапазона
+    упорядочены по сроку выполнения и объединяются через heapq.merge.
+
+    Файл описывает задачи на момент build; после изменения задач
+    его нужно построить заново.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        :param workers: Число процессов; по умолчанию число
+        процессоров. При одном процессе поиск выполняется в текущем.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.generation: Optional[int] = None
+        self._tasks: List[Task] = []
+        self._file_name: Optional[str] = None
+        self._builds = 0
+        self._directory = tempfile.TemporaryDirectory(
+            prefix='tasks-', ignore_cleanup_errors=True)
+        self._pool = None
+
+    def build(self, tasks: Iterable[Task],
+              generation: Optional[int] = None) -> None:
+        """
+        Записывает файл текста задач.
+
+        :param tasks: Задачи в порядке срока выполнения.
+        :param generation: Номер версии задач, для которой построен
+        файл (TaskManager.generation).
+        """
+        self._tasks = list(tasks)
+        starts = array('Q', [0])
+        parts = []
+        size = 0
+        for task in self._tasks:
+            text = f'{task.title.lower()}\0{task.description.lower()}\0'
+            data = text.encode()
+            parts.append(data)
+            size += len(data)
+            starts.append(size)
+        previous = self._file_name
+        self._builds += 1
+        self._file_name = os.path.join(self._directory.name,
+                                       f'text{self._builds}')
+        with open(self._file_name, 'wb') as file:
+            file.write(_COUNT.pack(len(self._tasks)))
+            file.write(starts.tobytes())
+            file.write(b''.join(parts))
+        self.generation = generation
+        if previous is not None:
+            try:
+                os.remove(previous)
+            except OSError:
+                # В Windows отображенный файл удалить нельзя; он будет
+                # удален вместе с временным каталогом.
+                pass
+
+    def search(self, keyword: str) -> List[Task]:
+        """
+        Возвращает задачи, содержащие ключевое слово в названии
+        или описании без учета регистра, в порядке срока выполнения.
+
+        :param keyword: Ключевое слово.
+        :return: Список задач.
+        :raise ValueError: Если файл текста не построен или ключевое
+        слово содержит нулевой символ.
+        """
+        if self._file_name is None:
+            raise ValueError('Файл текста задач не построен')
+        if '\0' in keyword:
+            raise ValueError('Ключевое слово содержит нулевой символ')
+        if not keyword:
+            return list(self._tasks)
+        data = keyword.lower().encode()
+        count = len(self._tasks)
+        if self.workers == 1:
+            rows: Iterable[int] = search_rows(self._file_name, 0, count,
+                                              data)
+        else:
+            shards = self.workers * 2
+            bounds = [count * i // shards for i in range(shards + 1)]
+            futures = [self._executor().submit(search_rows, self._file_name,
+                                               start, end, data)
+                       for start, end in zip(bounds, bounds[1:])
+                       if start < end]
+            rows = heapq.merge(*(future.result() for future in futures))
+        tasks = self._tasks
+        return [tasks[row] for row in rows]
+
+    def _executor(self):
+        if self._pool is None:
+            # Импортируется здесь, чтобы при одном процессе
+            # multiprocessing не загружался.
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(self.workers)
+        return self._pool
+
+    def close(self) -> None:
+        """
+        Останавливает процессы и удаляет файл текста.
+        """
+        global _mapped
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if _mapped is not None and _mapped[0] == self._file_name:
+            _mapped[2].release()
+            _mapped[1].close()
+            _mapped = None
+        self._file_name = None
+        self._tasks = []
+        self._directory.cleanup()
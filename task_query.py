@@ -0,0 +1,278 @@
+import heapq
+from itertools import islice
+from operator import attrgetter, mul
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+from task import Task, parse_due_date
+from task_store import TaskStore
+
+FIELDS = ('id', 'title', 'description', 'category', 'due_date',
+          'priority', 'status')
+# Ключи сортировки и атрибуты задачи, по которым сравниваются значения.
+SORT_KEYS = {'due_date': 'due_ordinal', 'priority': 'priority_code',
+             'id': 'id'}
+# Порядок, в котором задачи возвращает любое хранилище.
+_STORE_ORDER = (('due_date', False), ('id', False))
+
+
+class Query:
+    """
+    Запрос к задачам с несколькими условиями, сортировкой
+    и ограничением числа результатов.
+
+    Условия добавляются цепочкой вызовов и объединяются через И::
+
+        Query().where(category='Работа', status='Не выполнена')
+               .due_between(end='2024-12-31').keyword('отчет')
+               .order_by('-priority', 'due_date').limit(10)
+
+    При выполнении планировщик выбирает самый избирательный
+    из доступных индексов хранилища, остальные условия проверяются
+    лениво по мере перебора, а для limit без полной сортировки
+    используется heapq.
+    """
+
+    def __init__(self):
+        self._equals: Dict[str, Any] = {}
+        self._due_start: Optional[int] = None
+        self._due_end: Optional[int] = None
+        self._keywords: List[str] = []
+        self._predicates: List[Callable[[Task], bool]] = []
+        self._order: Tuple[Tuple[str, bool], ...] = (('due_date', False),)
+        self._limit: Optional[int] = None
+        self._offset = 0
+
+    def where(self, **fields: Any) -> 'Query':
+        """
+        Добавляет условия равенства полей задачи.
+
+        Повторное условие на то же поле заменяет прежнее.
+
+        :param fields: Значения полей (id, title, description,
+        category, due_date, priority, status).
+        :return: Этот же запрос.
+        :raise ValueError: Если поле неизвестно.
+        """
+        for field in fields:
+            if field not in FIELDS:
+                raise ValueError(f'Неизвестное поле задачи {field!r}')
+        self._equals.update(fields)
+        return self
+
+    def due_between(self, start: Optional[str] = None,
+                    end: Optional[str] = None) -> 'Query':
+        """
+        Ограничивает срок выполнения диапазоном дат включительно.
+
+        Диапазон пересекается с заданным ранее.
+
+        :param start: Первая дата в формате 'ГГГГ-ММ-ДД' или None.
+        :param end: Последняя дата в формате 'ГГГГ-ММ-ДД' или None.
+        :return: Этот же запрос.
+        :raise ValueError: Если дата не соответствует формату.
+        """
+        if start is not None:
+            ordinal = parse_due_date(start)
+            if self._due_start is None or ordinal > self._due_start:
+                self._due_start = ordinal
+        if end is not None:
+            ordinal = parse_due_date(end)
+            if self._due_end is None or ordinal < self._due_end:
+                self._due_end = ordinal
+        return self
+
+    def keyword(self, keyword: str) -> 'Query':
+        """
+        Добавляет условие, что название или описание содержит
+        ключевое слово без учета регистра.
+
+        :param keyword: Ключевое слово.
+        :return: Этот же запрос.
+        """
+        self._keywords.append(keyword)
+        return self
+
+    def filter(self, predicate: Callable[[Task], bool]) -> 'Query':
+        """
+        Добавляет произвольное условие на задачу.
+
+        :param predicate: Функция, возвращающая True для подходящих задач.
+        :return: Этот же запрос.
+        """
+        self._predicates.append(predicate)
+        return self
+
+    def order_by(self, *keys: str) -> 'Query':
+        """
+        Задает порядок результатов.
+
+        При равенстве ключей задачи упорядочиваются по ID.
+
+        :param keys: Ключи сортировки ('due_date', 'priority', 'id');
+        ключ с минусом впереди сортирует по убыванию.
+        :return: Этот же запрос.
+        :raise ValueError: Если ключ неизвестен.
+        """
+        order = []
+        for key in keys:
+            descending = key.startswith('-')
+            name = key[1:] if descending else key
+            if name not in SORT_KEYS:
+                raise ValueError(f'Неизвестный ключ сортировки {key!r}')
+            order.append((name, descending))
+        self._order = tuple(order)
+        return self
+
+    def limit(self, count: Optional[int]) -> 'Query':
+        """
+        Ограничивает число результатов.
+
+        :param count: Наибольшее число задач или None.
+        :return: Этот же запрос.
+        """
+        self._limit = count
+        return self
+
+    def offset(self, count: int) -> 'Query':
+        """
+        Пропускает первые результаты.
+
+        :param count: Число пропускаемых задач.
+        :return: Этот же запрос.
+        """
+        self._offset = count
+        return self
+
+    def _conditions(self, indexed: str = ''
+                    ) -> List[Callable[[Task], bool]]:
+        """
+        Составляет список проверок условий запроса.
+
+        :param indexed: Условие, которое уже обеспечено выбранным
+        индексом и не требует проверки.
+        :return: Список функций, возвращающих True для подходящих задач.
+        """
+        conditions: List[Callable[[Task], bool]] = []
+        for field, value in self._equals.items():
+            if field != indexed:
+                conditions.append(
+                    lambda task, get=attrgetter(field), value=value:
+                    get(task) == value)
+        start, end = self._due_start, self._due_end
+        if indexed != 'due_date' and (start is not None or end is not None):
+            conditions.append(
+                lambda task: (start is None or task.due_ordinal >= start)
+                and (end is None or task.due_ordinal <= end))
+        keywords = [keyword.lower() for keyword in self._keywords]
+        if indexed == 'keyword':
+            del keywords[0]
+        for keyword in keywords:
+            conditions.append(
+                lambda task, keyword=keyword: keyword in task.title.lower()
+                or keyword in task.description.lower())
+        return conditions + self._predicates
+
+    def matches(self, task: Task) -> bool:
+        """
+        Проверяет, удовлетворяет ли задача всем условиям запроса.
+
+        :param task: Задача.
+        :return: True, если задача подходит.
+        """
+        return all(condition(task) for condition in self._conditions())
+
+    def plan(self, store: TaskStore) -> Tuple[str, Iterable[Task]]:
+        """
+        Выбирает источник задач-кандидатов.
+
+        Из условий на ID, категорию, статус и срок выполнения
+        выбирается то, которому по индексу хранилища соответствует
+        меньше всего задач. Без таких индексов кандидатов дает поиск
+        по ключевому слову или перебор всех задач. Кандидаты всегда
+        упорядочены по сроку выполнения.
+
+        :param store: Хранилище задач.
+        :return: Пара (название выбранного индекса, кандидаты).
+        """
+        if 'id' in self._equals:
+            task = store.get(self._equals['id'])
+            return 'id', [] if task is None else [task]
+        options = []
+        for field in ('category', 'status'):
+            if field in self._equals:
+                count = store.count(field, self._equals[field])
+                if count is not None:
+                    options.append((count, field))
+        if self._due_start is not None or self._due_end is not None:
+            count = store.count_due(self._due_start, self._due_end)
+            if count is not None:
+                options.append((count, 'due_date'))
+        if options:
+            _, field = min(options)
+            if field == 'category':
+                return field, store.iter_category(self._equals[field])
+            if field == 'status':
+                return field, store.by_status(self._equals[field])
+            return field, store.iter_due(self._due_start, self._due_end)
+        if self._keywords:
+            return 'keyword', store.by_keyword(self._keywords[0])
+        return 'scan', store.iter_category()
+
+    def _sort_key(self) -> Callable[[Task], Tuple]:
+        get = attrgetter(*(SORT_KEYS[name] for name, _ in self._order), 'id')
+        if not any(descending for _, descending in self._order):
+            return get
+        signs = tuple(-1 if descending else 1
+                      for _, descending in self._order) + (1,)
+        return lambda task: tuple(map(mul, signs, get(task)))
+
+    def run(self, store: TaskStore) -> Iterator[Task]:
+        """
+        Выполняет запрос.
+
+        Если порядок совпадает с порядком хранилища (по сроку
+        выполнения), результаты выдаются лениво по мере проверки
+        кандидатов. Иначе при заданном limit выбираются только первые
+        offset + limit задач через heapq, без полной сортировки.
+
+        :param store: Хранилище задач.
+        :return: Итератор подходящих задач.
+        """
+        indexed, candidates = self.plan(store)
+        conditions = self._conditions(indexed)
+        tasks: Iterable[Task] = candidates
+        if len(conditions) == 1:
+            tasks = filter(conditions[0], tasks)
+        elif conditions:
+            tasks = (task for task in tasks
+                     if all(condition(task) for condition in conditions))
+        stop = None if self._limit is None else self._offset + self._limit
+        if self._order == _STORE_ORDER[:len(self._order)]:
+            return islice(tasks, self._offset, stop)
+        if stop is not None:
+            return iter(heapq.nsmallest(stop, tasks,
+                                        key=self._sort_key())[self._offset:])
+        return iter(sorted(tasks, key=self._sort_key())[self._offset:])
+
+    def select(self, tasks: Iterable[Task]) -> List[Task]:
+        """
+        Выполняет запрос над произвольным набором задач
+        без индексов хранилища.
+
+        Используется, когда строить индексы ради одного запроса
+        дороже, чем проверить все задачи (например, в командной
+        строке). При заданном limit выбираются только первые
+        offset + limit задач через heapq.
+
+        :param tasks: Задачи в любом порядке.
+        :return: Список подходящих задач в порядке запроса.
+        """
+        conditions = self._conditions()
+        if conditions:
+            tasks = (task for task in tasks
+                     if all(condition(task) for condition in conditions))
+        if self._limit is not None:
+            return heapq.nsmallest(self._offset + self._limit, tasks,
+                                   key=self._sort_key())[self._offset:]
+        return sorted(tasks, key=self._sort_key())[self._offset:]
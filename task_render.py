@@ -0,0 +1,187 @@
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from task import Task
+
+HEADERS = ('ID', 'Название', 'Описание', 'Категория',
+           'Срок выполнения', 'Приоритет', 'Статус')
+# Наибольшая ширина столбцов; более длинные значения обрезаются.
+MAX_WIDTHS = (8, 30, 40, 20, 15, 9, 12)
+# Число строк, по которым подбирается ширина столбцов.
+SAMPLE_SIZE = 100
+
+
+def task_row(task: Task) -> Tuple[str, ...]:
+    """
+    Возвращает значения столбцов таблицы для задачи.
+
+    :param task: Задача.
+    :return: Кортеж строк в порядке HEADERS.
+    """
+    return (str(task.id), task.title, task.description, task.category,
+            task.due_date, task.priority, task.status)
+
+
+def column_widths(rows: Iterable[Sequence[str]],
+                  headers: Sequence[str] = HEADERS,
+                  max_widths: Sequence[int] = MAX_WIDTHS) -> List[int]:
+    """
+    Подбирает ширину столбцов по заголовкам и переданным строкам.
+
+    :param rows: Строки таблицы, обычно небольшая выборка.
+    :param headers: Заголовки столбцов.
+    :param max_widths: Наибольшая ширина каждого столбца.
+    :return: Список ширин столбцов.
+    """
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+    return [max(min(width, limit), len(header))
+            for width, limit, header in zip(widths, max_widths, headers)]
+
+
+def _cell(value: str, width: int, right: bool) -> str:
+    value = value.replace('\n', ' ')
+    if len(value) > width:
+        return value[:width - 1] + '…'
+    return value.rjust(width) if right else value.ljust(width)
+
+
+def render_table(rows: Iterable[Sequence[str]],
+                 widths: Optional[Sequence[int]] = None,
+                 headers: Sequence[str] = HEADERS) -> Iterator[str]:
+    """
+    Формирует таблицу с рамками построчно, не собирая ее целиком.
+
+    Если ширина столбцов не задана, она подбирается по первым
+    SAMPLE_SIZE строкам, поэтому первая строка таблицы готова
+    за время, не зависящее от числа строк.
+
+    :param rows: Строки таблицы.
+    :param widths: Ширина столбцов.
+    :param headers: Заголовки столбцов.
+    :return: Итератор строк текста таблицы.
+    """
+    rows = iter(rows)
+    if widths is None:
+        sample = list(islice(rows, SAMPLE_SIZE))
+        widths = column_widths(sample, headers)
+        rows = chain(sample, rows)
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+    def line(row: Sequence[str]) -> str:
+        return '| ' + ' | '.join(
+            _cell(value, width, i == 0 and row is not headers)
+            for i, (value, width) in enumerate(zip(row, widths))) + ' |'
+
+    yield border
+    yield line(headers)
+    yield border.replace('-', '=')
+    for row in rows:
+        yield line(row)
+        yield border
+
+
+class Pager:
+    """
+    Постраничный просмотр элементов итератора.
+
+    Элементы запрашиваются у итератора только по мере перехода
+    к следующим страницам и запоминаются для возврата назад,
+    поэтому первая страница готова за время, не зависящее
+    от общего числа элементов.
+    """
+
+    def __init__(self, items: Iterable, page_size: int = 20):
+        """
+        :param items: Элементы для просмотра.
+        :param page_size: Число элементов на странице.
+        :raise ValueError: Если размер страницы меньше 1.
+        """
+        if page_size < 1:
+            raise ValueError('Размер страницы должен быть положительным')
+        self.page_size = page_size
+        self.page = 0
+        self._items: List = []
+        self._source: Optional[Iterator] = iter(items)
+
+    def _fill(self, count: int) -> None:
+        """
+        Запрашивает у итератора элементы, пока их не станет count.
+
+        :param count: Нужное число элементов.
+        """
+        if self._source is not None and len(self._items) < count:
+            self._items.extend(islice(self._source, count - len(self._items)))
+            if len(self._items) < count:
+                self._source = None
+
+    @property
+    def page_count(self) -> Optional[int]:
+        """
+        Возвращает число страниц или None, если оно еще неизвестно.
+        """
+        if self._source is not None:
+            return None
+        return max(1, -(-len(self._items) // self.page_size))
+
+    @property
+    def loaded_pages(self) -> int:
+        """
+        Возвращает число страниц, элементы которых уже запрошены.
+        """
+        return max(1, -(-len(self._items) // self.page_size))
+
+    def items(self) -> List:
+        """
+        Возвращает элементы текущей страницы.
+        """
+        start = self.page * self.page_size
+        self._fill(start + self.page_size)
+        return self._items[start:start + self.page_size]
+
+    def has_next(self) -> bool:
+        """
+        Проверяет, есть ли страница после текущей.
+        """
+        end = (self.page + 1) * self.page_size
+        self._fill(end + 1)
+        return len(self._items) > end
+
+    def next(self) -> bool:
+        """
+        Переходит к следующей странице, если она есть.
+
+        :return: True, если страница сменилась.
+        """
+        if not self.has_next():
+            return False
+        self.page += 1
+        return True
+
+    def prev(self) -> bool:
+        """
+        Переходит к предыдущей странице, если она есть.
+
+        :return: True, если страница сменилась.
+        """
+        if self.page == 0:
+            return False
+        self.page -= 1
+        return True
+
+    def jump(self, page: int) -> None:
+        """
+        Переходит к странице с указанным номером (начиная с 1).
+
+        Номер за пределами диапазона заменяется ближайшей
+        существующей страницей.
+
+        :param page: Номер страницы.
+        """
+        page = max(page, 1) - 1
+        self._fill(page * self.page_size + 1)
+        last = max(0, (len(self._items) - 1) // self.page_size)
+        self.page = min(page, last)
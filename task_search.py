@@ -0,0 +1,187 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from task import Task
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Разбивает текст на слова без учета регистра.
+
+    Слова выделяются по Unicode-классу \\w, поэтому кириллица
+    обрабатывается так же, как латиница.
+
+    :param text: Текст для разбиения.
+    :return: Множество слов, приведенных через casefold.
+    """
+    return set(_WORD.findall(text.casefold()))
+
+
+def task_tokens(title: str, description: str) -> Set[str]:
+    """
+    Возвращает множество слов названия и описания задачи.
+
+    :param title: Название задачи.
+    :param description: Описание задачи.
+    :return: Множество слов.
+    """
+    return tokenize(title) | tokenize(description)
+
+
+def words_match(terms: Set[str], words: Set[str], prefix: bool) -> bool:
+    """
+    Проверяет, что каждому слову запроса соответствует слово задачи.
+
+    :param terms: Слова запроса.
+    :param words: Слова задачи.
+    :param prefix: Если True, слово запроса совпадает
+    с любым словом задачи, которое с него начинается.
+    :return: True, если совпали все слова запроса.
+    """
+    if not prefix:
+        return terms <= words
+    return all(any(word.startswith(term) for word in words)
+               for term in terms)
+
+
+class TextIndex:
+    """
+    Инвертированный индекс слов названий и описаний задач.
+
+    Для каждого слова хранится множество ID задач, в которых оно
+    встречается, а отсортированный словарь позволяет искать слова
+    по префиксу бинарным поиском.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        """
+        Инициализирует индекс и заполняет его задачами.
+
+        :param tasks: Начальный набор задач.
+        """
+        self._postings: Dict[str, Set[int]] = {}
+        for task in tasks:
+            for token in task_tokens(task.title, task.description):
+                self._postings.setdefault(token, set()).add(task.id)
+        self._vocabulary: List[str] = sorted(self._postings)
+
+    def add(self, task: Task) -> None:
+        """
+        Добавляет задачу в индекс.
+
+        :param task: Задача.
+        """
+        self._insert(task.id, task_tokens(task.title, task.description))
+
+    def remove(self, task: Task) -> None:
+        """
+        Удаляет задачу из индекса.
+
+        :param task: Задача.
+        """
+        self._discard(task.id, task_tokens(task.title, task.description))
+
+    def update(self, task: Task, old_title: str,
+               old_description: str) -> None:
+        """
+        Обновляет слова задачи после изменения названия или описания.
+
+        :param task: Измененная задача.
+        :param old_title: Прежнее название задачи.
+        :param old_description: Прежнее описание задачи.
+        """
+        old = task_tokens(old_title, old_description)
+        new = task_tokens(task.title, task.description)
+        self._discard(task.id, old - new)
+        self._insert(task.id, new - old)
+
+    def _insert(self, task_id: int, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            ids.add(task_id)
+
+    def _discard(self, task_id: int, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            ids = self._postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def _with_prefix(self, prefix: str) -> Iterator[str]:
+        i = bisect_left(self._vocabulary, prefix)
+        while (i < len(self._vocabulary)
+               and self._vocabulary[i].startswith(prefix)):
+            yield self._vocabulary[i]
+            i += 1
+
+    def _ids(self, tokens: Iterable[str]) -> Set[int]:
+        ids: Set[int] = set()
+        for token in tokens:
+            ids |= self._postings[token]
+        return ids
+
+    def match(self, query: str, prefix: bool = True) -> Set[int]:
+        """
+        Ищет задачи, содержащие все слова запроса.
+
+        :param query: Слова запроса через пробел.
+        :param prefix: Если True, слово запроса совпадает
+        с любым словом задачи, которое с него начинается.
+        :return: Множество ID найденных задач.
+        """
+        result: Optional[Set[int]] = None
+        for term in sorted(tokenize(query), key=len, reverse=True):
+            if prefix:
+                ids = self._ids(self._with_prefix(term))
+            else:
+                ids = set(self._postings.get(term, ()))
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result or set()
+
+    def candidates(self, keyword: str) -> Optional[Set[int]]:
+        """
+        Возвращает ID задач, которые могут содержать ключевое
+        слово как подстроку.
+
+        Каждое слово ключевого слова, ограниченное разделителями
+        с обеих сторон, должно совпасть со словом задачи целиком,
+        ограниченное только слева - быть его префиксом, только
+        справа - суффиксом, а неограниченное - подстрокой.
+        Результат является надмножеством точного ответа и требует
+        проверки подстрокой.
+
+        :param keyword: Ключевое слово.
+        :return: Множество ID задач или None, если ключевое слово
+        не содержит слов и индекс не может сузить поиск.
+        """
+        keyword = keyword.casefold()
+        result: Optional[Set[int]] = None
+        for match in _WORD.finditer(keyword):
+            term = match.group()
+            left = match.start() > 0
+            right = match.end() < len(keyword)
+            if left and right:
+                tokens: Iterable[str] = (
+                    [term] if term in self._postings else [])
+            elif left:
+                tokens = self._with_prefix(term)
+            elif right:
+                tokens = [token for token in self._vocabulary
+                          if token.endswith(term)]
+            else:
+                tokens = [token for token in self._vocabulary
+                          if term in token]
+            ids = self._ids(tokens)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
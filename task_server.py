@@ -0,0 +1,315 @@
+import argparse
+import json
+import re
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from task import Task
+from task_lock import ReadWriteLock
+from task_manager import TaskManager
+from task_query import Query
+from task_snapshot import is_snapshot_file
+from task_sqlite import is_sqlite_file
+
+# Поля задачи, которые можно изменить запросом PATCH.
+EDITABLE_FIELDS = ('title', 'description', 'category', 'due_date',
+                   'priority', 'status')
+_TASK_PATH = re.compile(r'/tasks/(\d+)')
+
+
+class TaskServer(HTTPServer):
+    """
+    HTTP-сервер с пулом потоков вокруг одного менеджера задач.
+
+    Каждое соединение обрабатывается потоком из пула фиксированного
+    размера, а не новым потоком. Соединения поддерживаются между
+    запросами (keep-alive) и закрываются после простоя idle_timeout
+    секунд, чтобы не занимать поток пула. Запросы на чтение
+    выполняются под разделяемой блокировкой и, если хранилище это
+    допускает, параллельно, а изменения - под исключительной.
+    """
+
+    def __init__(self, address: Tuple[str, int], task_manager: TaskManager,
+                 workers: int = 8, idle_timeout: float = 5.0):
+        """
+        :param address: Адрес и порт; порт 0 выбирается системой.
+        :param task_manager: Менеджер задач, общий для всех запросов.
+        :param workers: Число потоков обработки соединений.
+        :param idle_timeout: Время простоя соединения в секундах,
+        после которого оно закрывается.
+        """
+        super().__init__(address, TaskRequestHandler)
+        self.task_manager = task_manager
+        self.idle_timeout = idle_timeout
+        self.lock = ReadWriteLock()
+        self._pool = ThreadPoolExecutor(workers,
+                                        thread_name_prefix='task-server')
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def reading(self):
+        """
+        Возвращает блокировку для запроса на чтение: разделяемую,
+        если хранилище допускает параллельные запросы, иначе
+        исключительную.
+        """
+        if self.task_manager.concurrent_reads:
+            return self.lock.read()
+        return self.lock.write()
+
+    def process_request(self, request, client_address) -> None:
+        with self._connections_lock:
+            self._connections.add(request)
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._connections_lock:
+                self._connections.discard(request)
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        """
+        Закрывает сокет сервера и открытые соединения и дожидается
+        завершения начатых запросов.
+        """
+        super().server_close()
+        with self._connections_lock:
+            for connection in self._connections:
+                try:
+                    connection.shutdown(socket.SHUT_RD)
+                except OSError:
+                    pass
+        self._pool.shutdown(wait=True)
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик REST API задач.
+
+    GET /tasks?category=&status=&priority=&keyword=&due_from=&due_to=
+    &sort=&limit=&offset= - список задач, GET /tasks/<id> - задача,
+    GET /categories - категории, POST /tasks - добавить задачу,
+    PATCH /tasks/<id> - изменить поля задачи, DELETE /tasks/<id> -
+    удалить задачу, DELETE /tasks?category= - удалить категорию,
+    POST /save - сохранить задачи в файл. Тела запросов и ответов -
+    JSON в UTF-8, ошибки возвращаются как {"error": сообщение}.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело ответа пишутся отдельно; без TCP_NODELAY
+    # каждый ответ по keep-alive соединению ждал бы подтверждения
+    # клиента десятки миллисекунд.
+    disable_nagle_algorithm = True
+    server: TaskServer
+
+    def setup(self) -> None:
+        self.timeout = self.server.idle_timeout
+        super().setup()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: HTTPStatus, body: Any = None) -> None:
+        data = (b'' if body is None
+                else json.dumps(body, ensure_ascii=False).encode())
+        self.send_response(status)
+        if data:
+            self.send_header('Content-Type',
+                             'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, 'Некорректный JSON')
+        if not isinstance(body, dict):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, 'Ожидался объект JSON')
+        return body
+
+    def _task(self, task_id: str) -> Task:
+        task = self.server.task_manager.get_task(int(task_id))
+        if task is None:
+            raise _HTTPError(HTTPStatus.NOT_FOUND, 'Задача не найдена')
+        return task
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        params = {name: values[-1]
+                  for name, values in parse_qs(url.query).items()}
+        match = _TASK_PATH.fullmatch(url.path)
+        try:
+            if method != 'GET' and (url.path == '/tasks' or match):
+                body = self._body() if method in ('POST', 'PATCH') else {}
+                with self.server.lock.write():
+                    status, result = self._change(method, match, params,
+                                                  body)
+            elif method == 'POST' and url.path == '/save':
+                with self.server.lock.write():
+                    manager = self.server.task_manager
+                    manager.save_tasks(manager.storage_file)
+                status, result = HTTPStatus.NO_CONTENT, None
+            elif method == 'GET':
+                with self.server.reading():
+                    result = self._read(url.path, match, params)
+                status = HTTPStatus.OK
+            else:
+                raise _HTTPError(HTTPStatus.NOT_FOUND, 'Неизвестный адрес')
+        except _HTTPError as error:
+            status, result = error.status, {'error': str(error)}
+        except (KeyError, TypeError, ValueError) as error:
+            status = HTTPStatus.BAD_REQUEST
+            result = {'error': str(error) if isinstance(error, ValueError)
+                      else f'Некорректные данные задачи: {error}'}
+        except OSError as error:
+            # Например, при сохранении на заполненный диск: клиент
+            # получает ответ вместо разорванного соединения.
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            result = {'error': f'Ошибка записи задач: {error}'}
+        self._send(status, result)
+
+    def _read(self, path: str, match, params: Dict[str, str]) -> Any:
+        manager = self.server.task_manager
+        if match:
+            return self._task(match.group(1)).to_dict()
+        if path == '/categories':
+            return manager.get_categories()
+        if path != '/tasks':
+            raise _HTTPError(HTTPStatus.NOT_FOUND, 'Неизвестный адрес')
+        return [task.to_dict() for task in manager.query(query_of(params))]
+
+    def _change(self, method: str, match, params: Dict[str, str],
+                body: Dict) -> Tuple[HTTPStatus, Any]:
+        manager = self.server.task_manager
+        if method == 'POST' and not match:
+            manager.add_task(body['title'], body['description'],
+                             body['category'], body['due_date'],
+                             body['priority'])
+            task = manager.get_task(manager.task_id - 1)
+            return HTTPStatus.CREATED, task.to_dict()
+        if method == 'PATCH' and match:
+            task = self._task(match.group(1))
+            unknown = set(body) - set(EDITABLE_FIELDS)
+            if unknown:
+                raise ValueError('Неизвестные поля: '
+                                 + ', '.join(sorted(unknown)))
+            fields = [field for field in EDITABLE_FIELDS if field in body]
+            old = {field: getattr(task, field) for field in fields}
+            with manager.batch():
+                try:
+                    for field in fields:
+                        setattr(task, field, body[field])
+                except (TypeError, ValueError):
+                    # Задача изменяется целиком или не изменяется.
+                    for field, value in old.items():
+                        setattr(task, field, value)
+                    raise
+            return HTTPStatus.OK, task.to_dict()
+        if method == 'DELETE' and match:
+            manager.delete_task(self._task(match.group(1)))
+            return HTTPStatus.NO_CONTENT, None
+        if method == 'DELETE' and 'category' in params:
+            manager.delete_task(params['category'])
+            return HTTPStatus.NO_CONTENT, None
+        raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED,
+                         'Метод не поддерживается')
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def do_PATCH(self) -> None:
+        self._dispatch('PATCH')
+
+    def do_DELETE(self) -> None:
+        self._dispatch('DELETE')
+
+
+def query_of(params: Dict[str, str]) -> Query:
+    """
+    Составляет запрос к задачам из параметров адреса.
+
+    :param params: Параметры category, status, priority, keyword,
+    due_from, due_to, sort (ключи через запятую), limit и offset.
+    :return: Запрос.
+    :raise ValueError: Если значение параметра некорректно.
+    """
+    query = Query().where(**{field: params[field] for field in
+                             ('category', 'status', 'priority')
+                             if field in params})
+    if 'due_from' in params or 'due_to' in params:
+        query.due_between(params.get('due_from'), params.get('due_to'))
+    if 'keyword' in params:
+        query.keyword(params['keyword'])
+    if 'sort' in params:
+        query.order_by(*params['sort'].split(','))
+    if 'limit' in params:
+        query.limit(int(params['limit']))
+    if 'offset' in params:
+        query.offset(int(params['offset']))
+    return query
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Запускает сервер задач до прерывания с клавиатуры.
+
+    :param argv: Аргументы командной строки.
+    :return: Код завершения.
+    """
+    parser = argparse.ArgumentParser(
+        description='HTTP-сервер с JSON API для общего файла задач.')
+    parser.add_argument('storage', help='файл задач (JSON, снимок '
+                                        'или база SQLite)')
+    parser.add_argument('--host', default='127.0.0.1', help='адрес')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='порт (0 - выбрать свободный)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='число потоков обработки запросов')
+    args = parser.parse_args(argv)
+    task_manager = TaskManager(args.storage, shared=True)
+    if task_manager.load_error is not None:
+        print(f'Файл задач поврежден. {task_manager.load_error}',
+              file=sys.stderr)
+        task_manager.close()
+        return 1
+    if not (is_sqlite_file(args.storage) or is_snapshot_file(args.storage)):
+        task_manager.start_autosave()
+    server = TaskServer((args.host, args.port), task_manager, args.workers)
+    host, port = server.server_address[:2]
+    print(f'Сервер задач запущен на http://{host}:{port}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with server.lock.write():
+            task_manager.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
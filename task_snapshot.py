@@ -0,0 +1,382 @@
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from task import STATUSES, Task
+from task_index import due_date_key
+from task_json import atomic_file
+from task_store import TaskStore
+
+SNAPSHOT_EXTENSIONS = ('.snapshot',)
+
+_MAGIC = b'TASKSNP1'
+# Сигнатура, порядок байтов (True - little-endian), число задач,
+# размер словаря категорий в байтах.
+_HEADER = struct.Struct('<8s?7xQQ')
+# Столбцы таблицы задач: название и код типа array.
+_COLUMNS = (('ids', 'q'), ('due', 'i'), ('priority', 'b'), ('status', 'b'),
+            ('category', 'i'), ('title_size', 'I'), ('description_size', 'I'),
+            ('offsets', 'Q'), ('id_order', 'i'))
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """
+    Импортирует NumPy при первом обращении, чтобы не замедлять
+    запуск программы, которой он не нужен.
+
+    :return: Модуль numpy или None, если он не установлен.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def is_snapshot_file(file_name: str) -> bool:
+    """
+    Проверяет по расширению, что файл задач является снимком.
+
+    :param file_name: Путь к файлу.
+    :return: True для расширения .snapshot.
+    """
+    return os.path.splitext(file_name)[1].lower() in SNAPSHOT_EXTENSIONS
+
+
+def _padding(size: int) -> bytes:
+    return b'\0' * (-size % 8)
+
+
+def write_snapshot(file_name: str, tasks: Iterable[Task]) -> None:
+    """
+    Атомарно записывает задачи в двоичный снимок.
+
+    Файл состоит из заголовка, словаря категорий в JSON, таблицы
+    задач фиксированной ширины и кучи строк. Таблица хранится
+    по столбцам (ID, срок выполнения, приоритет, статус, код
+    категории, размеры и смещения строк, порядок строк по ID),
+    каждый столбец выровнен на 8 байт. Строки таблицы упорядочены
+    по сроку выполнения.
+
+    :param file_name: Путь к файлу.
+    :param tasks: Задачи для записи.
+    """
+    tasks = sorted(tasks, key=due_date_key)
+    columns = {name: array(typecode) for name, typecode in _COLUMNS}
+    codes: Dict[str, int] = {}
+    for task in sorted(tasks, key=lambda task: task.id):
+        codes.setdefault(task.category, len(codes))
+    heap = bytearray()
+    for task in tasks:
+        title = task.title.encode()
+        description = task.description.encode()
+        columns['ids'].append(task.id)
+        columns['due'].append(task.due_ordinal)
+        columns['priority'].append(task.priority_code)
+        columns['status'].append(task.status_code)
+        columns['category'].append(codes[task.category])
+        columns['title_size'].append(len(title))
+        columns['description_size'].append(len(description))
+        columns['offsets'].append(len(heap))
+        heap += title + description + task.due_date.encode()
+    columns['offsets'].append(len(heap))
+    ids = columns['ids']
+    columns['id_order'].extend(sorted(range(len(tasks)),
+                                      key=ids.__getitem__))
+    categories = json.dumps(list(codes)).encode()
+    with atomic_file(file_name, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, sys.byteorder == 'little',
+                                len(tasks), len(categories)))
+        file.write(categories + _padding(len(categories)))
+        for name, _ in _COLUMNS:
+            data = columns[name].tobytes()
+            file.write(data + _padding(len(data)))
+        file.write(heap)
+
+
+class SnapshotFile:
+    """
+    Двоичный снимок задач, открытый через mmap.
+
+    При открытии читаются только заголовок и словарь категорий;
+    столбцы таблицы доступны как memoryview поверх отображенного
+    файла, а строки декодируются при обращении к задаче.
+    """
+
+    def __init__(self, file_name: str):
+        """
+        :param file_name: Путь к файлу снимка.
+        :raise ValueError: Если файл не является снимком задач
+        или записан на системе с другим порядком байтов.
+        """
+        with open(file_name, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError('Файл не является снимком задач')
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, little, count, categories_size = _HEADER.unpack_from(
+            self._map)
+        if magic != _MAGIC:
+            raise ValueError('Файл не является снимком задач')
+        if little != (sys.byteorder == 'little'):
+            raise ValueError('Снимок записан с другим порядком байтов')
+        self.count = count
+        offset = _HEADER.size
+        self.categories: List[str] = json.loads(
+            self._map[offset:offset + categories_size])
+        offset += categories_size + len(_padding(categories_size))
+        view = memoryview(self._map)
+        for name, typecode in _COLUMNS:
+            length = count + 1 if name == 'offsets' else count
+            size = length * array(typecode).itemsize
+            setattr(self, name, view[offset:offset + size].cast(typecode))
+            offset += size + len(_padding(size))
+        self._heap = offset
+
+    def close(self) -> None:
+        """
+        Закрывает отображение файла.
+        """
+        for name, _ in _COLUMNS:
+            getattr(self, name).release()
+        self._map.close()
+
+    def column(self, name: str):
+        """
+        Возвращает столбец как массив NumPy без копирования
+        или как memoryview, если NumPy не установлен.
+
+        :param name: Название столбца.
+        """
+        data = getattr(self, name)
+        numpy = _numpy()
+        if numpy is None:
+            return data
+        return numpy.frombuffer(data, dtype=data.format)
+
+    def row_of(self, task_id: int) -> Optional[int]:
+        """
+        Находит строку задачи по ID бинарным поиском.
+
+        :param task_id: ID задачи.
+        :return: Номер строки или None.
+        """
+        i = bisect_left(self.id_order, task_id, key=self.ids.__getitem__)
+        if i < self.count and self.ids[self.id_order[i]] == task_id:
+            return self.id_order[i]
+        return None
+
+    def task(self, row: int) -> Task:
+        """
+        Декодирует задачу из строки таблицы.
+
+        :param row: Номер строки.
+        :return: Новый объект задачи.
+        """
+        start = self._heap + self.offsets[row]
+        title_end = start + self.title_size[row]
+        description_end = title_end + self.description_size[row]
+        end = self._heap + self.offsets[row + 1]
+        data = self._map
+        return Task.restore(self.ids[row], data[start:title_end].decode(),
+                            data[title_end:description_end].decode(),
+                            sys.intern(self.categories[self.category[row]]),
+                            sys.intern(data[description_end:end].decode()),
+                            self.due[row], self.priority[row],
+                            self.status[row])
+
+
+class SnapshotTaskStore(TaskStore):
+    """
+    Хранилище задач поверх двоичного снимка.
+
+    Задачи снимка не загружаются при открытии: фильтры выполняются
+    по столбцам снимка, а объекты Task декодируются только
+    для возвращаемых задач. Добавленные и измененные задачи хранятся
+    в памяти поверх снимка, а удаленные и измененные строки снимка
+    скрываются.
+    """
+
+    def __init__(self, owner, file_name: str):
+        """
+        :param owner: Менеджер задач, которому сообщают
+        об изменениях задачи.
+        :param file_name: Путь к файлу снимка; если файла нет,
+        создается пустой снимок.
+        :raise ValueError: Если файл не является снимком задач.
+        """
+        super().__init__(owner)
+        if not os.path.exists(file_name):
+            write_snapshot(file_name, [])
+        self._snapshot = SnapshotFile(file_name)
+        self._hidden: Set[int] = set()
+        self._overlay: Dict[int, Task] = {}
+        self._base_counts: Optional[Counter] = None
+        self._cache: weakref.WeakValueDictionary = (
+            weakref.WeakValueDictionary())
+
+    def close(self) -> None:
+        self._snapshot.close()
+
+    def _task(self, row: int) -> Task:
+        task_id = self._snapshot.ids[row]
+        task = self._cache.get(task_id)
+        if task is None:
+            task = self._snapshot.task(row)
+            task._manager = self.owner
+            self._cache[task_id] = task
+        return task
+
+    def _rows(self, rows: Iterable[int]) -> Iterator[Task]:
+        """
+        Перебирает задачи видимых строк снимка.
+
+        :param rows: Номера строк в порядке срока выполнения.
+        """
+        ids, hidden = self._snapshot.ids, self._hidden
+        for row in rows:
+            if ids[row] not in hidden:
+                yield self._task(row)
+
+    def _merge(self, rows: Iterable[int], predicate) -> Iterator[Task]:
+        """
+        Сливает видимые строки снимка с задачами в памяти,
+        удовлетворяющими условию, по сроку выполнения.
+
+        :param rows: Номера строк снимка в порядке срока выполнения.
+        :param predicate: Условие на задачу в памяти.
+        """
+        overlay = sorted(filter(predicate, self._overlay.values()),
+                         key=due_date_key)
+        if not overlay:
+            return self._rows(rows)
+        return heapq.merge(self._rows(rows), overlay, key=due_date_key)
+
+    def _select(self, name: str, code: int) -> List[int]:
+        column = self._snapshot.column(name)
+        numpy = _numpy()
+        if numpy is not None:
+            return numpy.flatnonzero(column == code).tolist()
+        return [row for row, value in enumerate(column) if value == code]
+
+    def __len__(self) -> int:
+        return self._snapshot.count - len(self._hidden) + len(self._overlay)
+
+    def __iter__(self) -> Iterator[Task]:
+        snapshot = self._snapshot
+        for row in list(snapshot.id_order):
+            task_id = snapshot.ids[row]
+            if task_id in self._overlay:
+                yield self._overlay[task_id]
+            elif task_id not in self._hidden:
+                yield self._task(row)
+        for task_id, task in list(self._overlay.items()):
+            if snapshot.row_of(task_id) is None:
+                yield task
+
+    def get(self, task_id: int) -> Optional[Task]:
+        task = self._overlay.get(task_id)
+        if task is not None or task_id in self._hidden:
+            return task
+        row = self._snapshot.row_of(task_id)
+        return None if row is None else self._task(row)
+
+    def add(self, task: Task) -> None:
+        self.remove([task.id])
+        self._overlay[task.id] = task
+        task._manager = self.owner
+        self._cache[task.id] = task
+
+    def remove(self, task_ids: Iterable[int]) -> None:
+        for task_id in task_ids:
+            task = self._overlay.pop(task_id, None) or self._cache.get(task_id)
+            if task is not None:
+                task._manager = None
+                self._cache.pop(task_id, None)
+            if self._snapshot.row_of(task_id) is not None:
+                self._hidden.add(task_id)
+
+    def changed(self, task: Task, field: str, old) -> None:
+        if task.id not in self._overlay:
+            self._overlay[task.id] = task
+            self._hidden.add(task.id)
+
+    def max_id(self) -> int:
+        snapshot = self._snapshot
+        for i in range(snapshot.count - 1, -1, -1):
+            task_id = snapshot.ids[snapshot.id_order[i]]
+            if task_id not in self._hidden:
+                break
+        else:
+            task_id = 0
+        return max(task_id, max(self._overlay, default=0))
+
+    def categories(self) -> List[str]:
+        snapshot = self._snapshot
+        if self._base_counts is None:
+            numpy = _numpy()
+            if numpy is not None:
+                self._base_counts = Counter(dict(enumerate(numpy.bincount(
+                    snapshot.column('category')).tolist())))
+            else:
+                self._base_counts = Counter(snapshot.category)
+        counts = self._base_counts.copy()
+        for task_id in self._hidden:
+            counts[snapshot.category[snapshot.row_of(task_id)]] -= 1
+        names = {name: None for code, name in enumerate(snapshot.categories)
+                 if counts[code] > 0}
+        for task in self._overlay.values():
+            names.setdefault(task.category)
+        return list(names)
+
+    def iter_category(self, category: Optional[str] = None
+                      ) -> Iterator[Task]:
+        if category is None:
+            return self._merge(range(self._snapshot.count),
+                               lambda task: True)
+        try:
+            code = self._snapshot.categories.index(category)
+        except ValueError:
+            rows: List[int] = []
+        else:
+            rows = self._select('category', code)
+        return self._merge(rows, lambda task: task.category == category)
+
+    def by_category(self, category: Optional[str] = None) -> List[Task]:
+        return list(self.iter_category(category))
+
+    def by_status(self, status: str) -> List[Task]:
+        if status not in STATUSES:
+            return []
+        return list(self._merge(self._select('status',
+                                             STATUSES.index(status)),
+                                lambda task: task.status == status))
+
+    def _due_rows(self, start: Optional[int],
+                  end: Optional[int]) -> range:
+        due = self._snapshot.due
+        lo = 0 if start is None else bisect_left(due, start)
+        hi = len(due) if end is None else bisect_left(due, end + 1)
+        return range(lo, max(lo, hi))
+
+    def iter_due(self, start: Optional[int],
+                 end: Optional[int]) -> Iterator[Task]:
+        return self._merge(
+            self._due_rows(start, end),
+            lambda task: (start is None or task.due_ordinal >= start)
+            and (end is None or task.due_ordinal <= end))
+
+    def count_due(self, start: Optional[int],
+                  end: Optional[int]) -> Optional[int]:
+        # Оценка сверху: задачи в памяти считаются подходящими.
+        return len(self._due_rows(start, end)) + len(self._overlay)
@@ -0,0 +1,363 @@
+import os
+import sqlite3
+import weakref
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from task import STATUSES, Task
+from task_search import task_tokens, tokenize, words_match
+from task_store import TaskStore
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+_COLUMNS = ('id, title, description, category, due_date, due_ordinal, '
+            'priority, status')
+_ORDER = ' ORDER BY due_ordinal, id'
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    due_ordinal INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    status INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_due ON tasks (due_ordinal, id);
+CREATE INDEX IF NOT EXISTS tasks_category
+    ON tasks (category, due_ordinal, id);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, due_ordinal, id);
+CREATE INDEX IF NOT EXISTS tasks_urgency
+    ON tasks (status, due_ordinal, priority DESC, id);
+'''
+_FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description, content='tasks', content_rowid='id',
+    tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+AFTER UPDATE OF title, description ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO tasks_fts (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+'''
+# Триграммный индекс FTS5 находит только подстроки из трех и более символов.
+_FTS_MIN_LENGTH = 3
+
+
+def is_sqlite_file(file_name: str) -> bool:
+    """
+    Проверяет по расширению, что файл задач является базой SQLite.
+
+    :param file_name: Путь к файлу.
+    :return: True для расширений .db, .sqlite и .sqlite3.
+    """
+    return os.path.splitext(file_name)[1].lower() in SQLITE_EXTENSIONS
+
+
+def _row(task: Task) -> tuple:
+    return (task.id, task.title, task.description, task.category,
+            task.due_date, task.due_ordinal, task.priority_code,
+            task.status_code)
+
+
+class SqliteTaskStore(TaskStore):
+    """
+    Хранилище задач в базе SQLite.
+
+    Задачи не загружаются в память при открытии: запросы выполняются
+    в базе по индексам на категории, статусе и сроке выполнения,
+    а поиск по ключевым словам использует полнотекстовый индекс FTS5,
+    если SQLite собран с его поддержкой. Каждое изменение сразу
+    фиксируется в базе.
+    """
+
+    def __init__(self, owner, file_name: str):
+        """
+        Открывает базу, создавая таблицы и индексы при необходимости.
+
+        :param owner: Менеджер задач, которому сообщают
+        об изменениях задачи.
+        :param file_name: Путь к файлу базы.
+        """
+        super().__init__(owner)
+        self.file_name = file_name
+        # Соединение может использоваться из разных потоков
+        # (например, потоков сервера), но не одновременно: запросы
+        # к этому хранилищу выполняются под исключительной блокировкой.
+        self._db = sqlite3.connect(file_name, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+        self._db.create_function('py_lower', 1, str.lower,
+                                 deterministic=True)
+        try:
+            self._db.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self._count = self._db.execute(
+            'SELECT count(*) FROM tasks').fetchone()[0]
+        self._cache: weakref.WeakValueDictionary = (
+            weakref.WeakValueDictionary())
+
+    def close(self) -> None:
+        self._db.close()
+
+    def write(self, tasks: Iterable[Task]) -> None:
+        """
+        Заменяет содержимое базы задачами за одну транзакцию.
+
+        В отличие от extend, задачи не становятся задачами хранилища,
+        поэтому так можно сохранить в базу задачи другого менеджера.
+
+        :param tasks: Задачи.
+        """
+        self._detach(list(self._cache.keys()))
+        with self._db:
+            self._db.execute('BEGIN')
+            self._db.execute('DELETE FROM tasks')
+            self._db.executemany(f'INSERT INTO tasks ({_COLUMNS}) '
+                                 'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                 map(_row, tasks))
+        self._count = self._db.execute(
+            'SELECT count(*) FROM tasks').fetchone()[0]
+
+    def _task(self, row: tuple) -> Task:
+        """
+        Возвращает объект задачи для строки таблицы.
+
+        Пока на задачу есть ссылки, для того же ID возвращается
+        тот же объект.
+
+        :param row: Строка таблицы tasks.
+        :return: Задача.
+        """
+        task = self._cache.get(row[0])
+        if task is None:
+            task = Task.restore(*row)
+            task._manager = self.owner
+            self._cache[row[0]] = task
+        return task
+
+    def _query(self, sql: str, parameters: Iterable = ()) -> List[Task]:
+        return [self._task(row)
+                for row in self._db.execute(sql, tuple(parameters))]
+
+    def _detach(self, task_ids: Iterable[int]) -> None:
+        for task_id in task_ids:
+            task = self._cache.pop(task_id, None)
+            if task is not None:
+                task._manager = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Task]:
+        for row in self._db.execute(f'SELECT {_COLUMNS} FROM tasks '
+                                    'ORDER BY id').fetchall():
+            yield self._task(row)
+
+    def get(self, task_id: int) -> Optional[Task]:
+        row = self._db.execute(f'SELECT {_COLUMNS} FROM tasks WHERE id = ?',
+                               (task_id,)).fetchone()
+        return None if row is None else self._task(row)
+
+    def add(self, task: Task) -> None:
+        self.extend([task])
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        tasks = list({task.id: task for task in tasks}.values())
+        self._detach(task.id for task in tasks)
+        with self._db:
+            self._db.execute('BEGIN')
+            self._count -= self._db.executemany(
+                'DELETE FROM tasks WHERE id = ?',
+                [(task.id,) for task in tasks]).rowcount
+            self._db.executemany(f'INSERT INTO tasks ({_COLUMNS}) '
+                                 'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                 map(_row, tasks))
+        self._count += len(tasks)
+        for task in tasks:
+            task._manager = self.owner
+            self._cache[task.id] = task
+
+    def remove(self, task_ids: Iterable[int]) -> None:
+        task_ids = list(task_ids)
+        self._detach(task_ids)
+        with self._db:
+            self._db.execute('BEGIN')
+            self._count -= self._db.executemany(
+                'DELETE FROM tasks WHERE id = ?',
+                [(task_id,) for task_id in task_ids]).rowcount
+
+    def remove_category(self, category: str) -> None:
+        self.remove([task_id for task_id, in self._db.execute(
+            'SELECT id FROM tasks WHERE category = ?', (category,))])
+
+    def changed(self, task: Task, field: str, old) -> None:
+        if field == 'due_date':
+            self._db.execute('UPDATE tasks SET due_date = ?, due_ordinal = ? '
+                             'WHERE id = ?',
+                             (task.due_date, task.due_ordinal, task.id))
+            return
+        value = {'priority': task.priority_code,
+                 'status': task.status_code}.get(field, getattr(task, field))
+        self._db.execute(f'UPDATE tasks SET {field} = ? WHERE id = ?',
+                         (value, task.id))
+
+    def max_id(self) -> int:
+        return self._db.execute(
+            'SELECT coalesce(max(id), 0) FROM tasks').fetchone()[0]
+
+    def data_version(self) -> int:
+        # Меняется после фиксации транзакции другим соединением.
+        return self._db.execute('PRAGMA data_version').fetchone()[0]
+
+    def categories(self) -> List[str]:
+        return [category for category, in self._db.execute(
+            'SELECT category FROM tasks GROUP BY category ORDER BY min(id)')]
+
+    def by_category(self, category: Optional[str] = None) -> List[Task]:
+        if category is None:
+            return self._query(f'SELECT {_COLUMNS} FROM tasks' + _ORDER)
+        return self._query(f'SELECT {_COLUMNS} FROM tasks '
+                           'WHERE category = ?' + _ORDER, (category,))
+
+    def iter_category(self, category: Optional[str] = None
+                      ) -> Iterator[Task]:
+        if category is None:
+            rows = self._db.execute(f'SELECT {_COLUMNS} FROM tasks' + _ORDER)
+        else:
+            rows = self._db.execute(f'SELECT {_COLUMNS} FROM tasks '
+                                    'WHERE category = ?' + _ORDER,
+                                    (category,))
+        for row in rows:
+            yield self._task(row)
+
+    @staticmethod
+    def _due_condition(start: Optional[int],
+                       end: Optional[int]) -> Tuple[str, tuple]:
+        if start is None:
+            start = 0
+        if end is None:
+            return 'due_ordinal >= ?', (start,)
+        return 'due_ordinal BETWEEN ? AND ?', (start, end)
+
+    def iter_due(self, start: Optional[int],
+                 end: Optional[int]) -> Iterator[Task]:
+        condition, parameters = self._due_condition(start, end)
+        for row in self._db.execute(f'SELECT {_COLUMNS} FROM tasks '
+                                    f'WHERE {condition}' + _ORDER,
+                                    parameters):
+            yield self._task(row)
+
+    def next_due(self, count: int) -> List[Task]:
+        return self._query(f'SELECT {_COLUMNS} FROM tasks WHERE status = 0 '
+                           'ORDER BY due_ordinal, priority DESC, id LIMIT ?',
+                           (max(count, 0),))
+
+    def open_between(self, start: Optional[int],
+                     end: Optional[int]) -> List[Task]:
+        condition, parameters = self._due_condition(start, end)
+        return self._query(f'SELECT {_COLUMNS} FROM tasks '
+                           f'WHERE status = 0 AND {condition} '
+                           'ORDER BY due_ordinal, priority DESC, id',
+                           parameters)
+
+    def count(self, field: str, value: str) -> Optional[int]:
+        if field == 'status':
+            if value not in STATUSES:
+                return 0
+            value = STATUSES.index(value)
+        elif field != 'category':
+            return None
+        return self._db.execute(f'SELECT count(*) FROM tasks '
+                                f'WHERE {field} = ?', (value,)).fetchone()[0]
+
+    def count_due(self, start: Optional[int],
+                  end: Optional[int]) -> Optional[int]:
+        condition, parameters = self._due_condition(start, end)
+        return self._db.execute(f'SELECT count(*) FROM tasks '
+                                f'WHERE {condition}',
+                                parameters).fetchone()[0]
+
+    def by_status(self, status: str) -> List[Task]:
+        if status not in STATUSES:
+            return []
+        return self._query(f'SELECT {_COLUMNS} FROM tasks '
+                           'WHERE status = ?' + _ORDER,
+                           (STATUSES.index(status),))
+
+    def _fts_query(self, fragments: Iterable[str]) -> Optional[str]:
+        """
+        Составляет запрос FTS5, находящий задачи, название или описание
+        которых содержит все фрагменты.
+
+        Триграммный индекс не учитывает регистр и может находить
+        лишние задачи, поэтому результат нужно проверить.
+
+        :param fragments: Искомые подстроки.
+        :return: Запрос или None, если индекс недоступен
+        или все фрагменты слишком короткие для него.
+        """
+        fragments = [fragment for fragment in fragments
+                     if len(fragment) >= _FTS_MIN_LENGTH]
+        if not self.fts or not fragments:
+            return None
+        return ' AND '.join('"{}"'.format(fragment.replace('"', '""'))
+                            for fragment in fragments)
+
+    def _by_fts(self, query: str) -> List[Task]:
+        return self._query(f'SELECT {_COLUMNS} FROM tasks WHERE id IN '
+                           '(SELECT rowid FROM tasks_fts '
+                           'WHERE tasks_fts MATCH ?)' + _ORDER, (query,))
+
+    def by_keyword(self, keyword: str) -> List[Task]:
+        lowered = keyword.lower()
+        query = self._fts_query([keyword])
+        if query is None:
+            return self._query(
+                f'SELECT {_COLUMNS} FROM tasks '
+                'WHERE instr(py_lower(title), ?) '
+                'OR instr(py_lower(description), ?)' + _ORDER,
+                (lowered, lowered))
+        return [task for task in self._by_fts(query)
+                if lowered in task.title.lower()
+                or lowered in task.description.lower()]
+
+    def search(self, query: str, prefix: bool = True) -> List[Task]:
+        terms = tokenize(query)
+        fts_query = self._fts_query(terms)
+        if fts_query is None:
+            return super().search(query, prefix)
+        return [task for task in self._by_fts(fts_query)
+                if words_match(terms, task_tokens(task.title,
+                                                  task.description), prefix)]
+
+
+def write_sqlite(file_name: str, tasks: Iterable[Task]) -> None:
+    """
+    Записывает задачи в базу SQLite, заменяя ее содержимое.
+
+    Замена выполняется одной транзакцией, поэтому при сбое в базе
+    остаются либо старые, либо новые задачи.
+
+    :param file_name: Путь к файлу базы.
+    :param tasks: Задачи для записи.
+    """
+    store = SqliteTaskStore(None, file_name)
+    try:
+        store.write(tasks)
+    finally:
+        store.close()
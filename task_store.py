@@ -0,0 +1,578 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+from task import PRIORITIES, STATUSES, Task
+from task_index import SortedTaskList, due_date_key, urgency_key
+from task_search import TextIndex, task_tokens, tokenize, words_match
+
+
+class TaskStore:
+    """
+    Базовый класс хранилища задач, которое TaskManager использует
+    для хранения задач и выполнения запросов.
+
+    Хранилище назначает себя владельцем задач через owner, поэтому
+    изменения задач через сеттеры попадают в метод changed.
+    Все запросы возвращают задачи, отсортированные по сроку выполнения.
+    """
+
+    # True, если запросы не изменяют состояние хранилища и их можно
+    # выполнять из нескольких потоков одновременно.
+    concurrent_reads = False
+    # True, если хранилище держит все задачи в памяти; иначе задачи
+    # создаются по запросу, и кэш запросов учитывает их размер.
+    owns_tasks = False
+
+    def __init__(self, owner):
+        """
+        Инициализирует хранилище.
+
+        :param owner: Менеджер задач, которому сообщают
+        об изменениях задачи.
+        """
+        self.owner = owner
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Task]:
+        """
+        Перебирает задачи в порядке их добавления.
+        """
+        raise NotImplementedError
+
+    def copy_tasks(self) -> Iterable[Task]:
+        """
+        Возвращает задачи в порядке их добавления так, что их можно
+        перебрать в другом потоке, пока хранилище изменяется.
+
+        Вызывается в потоке, изменяющем хранилище; сами задачи
+        и их словари создаются при переборе.
+        """
+        return list(self)
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """
+        Возвращает задачу по ID или None.
+
+        :param task_id: ID задачи.
+        """
+        raise NotImplementedError
+
+    def add(self, task: Task) -> None:
+        """
+        Добавляет задачу.
+
+        :param task: Задача.
+        """
+        raise NotImplementedError
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """
+        Добавляет набор задач.
+
+        Задача с уже существующим ID заменяет прежнюю.
+
+        :param tasks: Задачи.
+        """
+        for task in tasks:
+            if self.get(task.id) is not None:
+                self.remove([task.id])
+            self.add(task)
+
+    def remove(self, task_ids: Iterable[int]) -> None:
+        """
+        Удаляет задачи с указанными ID, игнорируя отсутствующие.
+
+        :param task_ids: ID задач.
+        """
+        raise NotImplementedError
+
+    def remove_category(self, category: str) -> None:
+        """
+        Удаляет все задачи категории.
+
+        :param category: Категория.
+        """
+        self.remove([task.id for task in self.by_category(category)])
+
+    def changed(self, task: Task, field: str, old) -> None:
+        """
+        Обновляет внутренние структуры после изменения поля задачи.
+
+        :param task: Измененная задача.
+        :param field: Название измененного поля.
+        :param old: Прежнее значение поля.
+        """
+        raise NotImplementedError
+
+    def max_id(self) -> int:
+        """
+        Возвращает наибольший ID задачи или 0.
+        """
+        raise NotImplementedError
+
+    def data_version(self) -> int:
+        """
+        Возвращает номер версии данных, который меняется, когда задачи
+        хранилища изменяет другой процесс. Хранилища, которые другие
+        процессы не изменяют, возвращают 0.
+        """
+        return 0
+
+    def categories(self) -> List[str]:
+        """
+        Возвращает список категорий задач.
+        """
+        raise NotImplementedError
+
+    def by_category(self, category: Optional[str] = None) -> List[Task]:
+        """
+        Возвращает задачи категории или все задачи, если категория None.
+
+        :param category: Категория.
+        """
+        raise NotImplementedError
+
+    def iter_category(self, category: Optional[str] = None
+                      ) -> Iterator[Task]:
+        """
+        Перебирает задачи категории или все задачи в порядке
+        срока выполнения, по возможности не собирая их в список.
+
+        :param category: Категория.
+        """
+        return iter(self.by_category(category))
+
+    def by_status(self, status: str) -> List[Task]:
+        """
+        Возвращает задачи с указанным статусом.
+
+        :param status: Статус.
+        """
+        raise NotImplementedError
+
+    def iter_due(self, start: Optional[int],
+                 end: Optional[int]) -> Iterator[Task]:
+        """
+        Перебирает задачи со сроком выполнения в диапазоне
+        в порядке срока выполнения.
+
+        :param start: Первый день диапазона (порядковый номер)
+        или None, если диапазон не ограничен снизу.
+        :param end: Последний день диапазона включительно
+        или None, если диапазон не ограничен сверху.
+        """
+        for task in self.iter_category():
+            if end is not None and task.due_ordinal > end:
+                return
+            if start is None or task.due_ordinal >= start:
+                yield task
+
+    def next_due(self, count: int) -> List[Task]:
+        """
+        Возвращает самые срочные невыполненные задачи.
+
+        Задачи перебираются по сроку выполнения, пока не наберется
+        count невыполненных и не закончится их последний срок.
+
+        :param count: Число задач.
+        :return: Задачи в порядке срочности (urgency_key).
+        """
+        tasks: List[Task] = []
+        if count <= 0:
+            return tasks
+        for task in self.iter_category():
+            if (len(tasks) >= count
+                    and task.due_ordinal > tasks[-1].due_ordinal):
+                break
+            if task.status == STATUSES[0]:
+                tasks.append(task)
+        tasks.sort(key=urgency_key)
+        return tasks[:count]
+
+    def open_between(self, start: Optional[int],
+                     end: Optional[int]) -> List[Task]:
+        """
+        Возвращает невыполненные задачи со сроком выполнения
+        в диапазоне.
+
+        :param start: Первый день диапазона (порядковый номер)
+        или None, если диапазон не ограничен снизу.
+        :param end: Последний день диапазона включительно
+        или None, если диапазон не ограничен сверху.
+        :return: Задачи в порядке срочности (urgency_key).
+        """
+        return sorted((task for task in self.iter_due(start, end)
+                       if task.status == STATUSES[0]), key=urgency_key)
+
+    def count(self, field: str, value: str) -> Optional[int]:
+        """
+        Возвращает число задач с указанным значением поля,
+        если его можно узнать по индексу, не перебирая задачи.
+
+        :param field: Поле ('category' или 'status').
+        :param value: Значение поля.
+        :return: Число задач или None, если подходящего индекса нет.
+        """
+        return None
+
+    def count_due(self, start: Optional[int],
+                  end: Optional[int]) -> Optional[int]:
+        """
+        Возвращает число задач со сроком выполнения в диапазоне,
+        если его можно узнать по индексу, не перебирая задачи.
+
+        :param start: Первый день диапазона или None.
+        :param end: Последний день диапазона включительно или None.
+        :return: Число задач или None, если подходящего индекса нет.
+        """
+        return None
+
+    def _group_keys(self, field: str) -> Sequence[str]:
+        """
+        Возвращает значения поля в порядке следования групп.
+
+        :param field: Поле группировки.
+        :raise ValueError: Если по полю нельзя группировать.
+        """
+        if field == 'category':
+            return self.categories()
+        if field == 'priority':
+            return PRIORITIES
+        if field == 'status':
+            return STATUSES
+        raise ValueError(f'Нельзя группировать задачи по полю {field!r}')
+
+    def group_by(self, field: str) -> Dict[str, List[Task]]:
+        """
+        Группирует задачи по значению поля за один проход.
+
+        Группы следуют в порядке категорий или в порядке возрастания
+        приоритета и статуса, пустые группы не включаются.
+
+        :param field: Поле группировки ('category', 'priority'
+        или 'status').
+        :return: Словарь значения поля в задачи, отсортированные
+        по сроку выполнения.
+        :raise ValueError: Если по полю нельзя группировать.
+        """
+        groups: Dict[str, List[Task]] = {
+            key: [] for key in self._group_keys(field)}
+        for task in self.iter_category():
+            groups[getattr(task, field)].append(task)
+        return {key: tasks for key, tasks in groups.items() if tasks}
+
+    def by_keyword(self, keyword: str) -> List[Task]:
+        """
+        Возвращает задачи, содержащие ключевое слово
+        в названии или описании без учета регистра.
+
+        :param keyword: Ключевое слово.
+        """
+        keyword = keyword.lower()
+        return [task for task in self.by_category()
+                if keyword in task.title.lower()
+                or keyword in task.description.lower()]
+
+    def search(self, query: str, prefix: bool = True) -> List[Task]:
+        """
+        Возвращает задачи, содержащие все слова запроса.
+
+        :param query: Слова запроса через пробел.
+        :param prefix: Если True, слово запроса совпадает
+        с любым словом задачи, которое с него начинается.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        return [task for task in self.by_category()
+                if words_match(terms, task_tokens(task.title,
+                                                  task.description), prefix)]
+
+    def close(self) -> None:
+        """
+        Освобождает ресурсы хранилища.
+        """
+
+
+class MemoryTaskStore(TaskStore):
+    """
+    Хранилище задач в памяти в виде объектов Task.
+
+    Задачи хранятся в словаре по ID, а упорядоченные индексы
+    по категории, статусу и сроку выполнения, а также индекс
+    невыполненных задач по срочности обновляются инкрементально.
+    """
+
+    concurrent_reads = True
+    owns_tasks = True
+
+    def __init__(self, owner, tasks: Iterable[Task] = (),
+                 text_index: bool = False):
+        """
+        Инициализирует хранилище и строит индексы.
+
+        Каждый индекс хранит задачи уже отсортированными по сроку
+        выполнения и в дальнейшем обновляется инкрементально.
+
+        :param owner: Менеджер задач, которому сообщают
+        об изменениях задачи.
+        :param tasks: Начальный набор задач.
+        :param text_index: Если True, поиск по ключевым словам
+        использует инвертированный индекс слов задач.
+        """
+        super().__init__(owner)
+        self._tasks: Dict[int, Task] = {}
+        self._by_due_date = SortedTaskList()
+        self._by_category: Dict[str, SortedTaskList] = {}
+        self._by_status: Dict[str, SortedTaskList] = {}
+        self._open = SortedTaskList(key=urgency_key)
+        self._text_index = TextIndex() if text_index else None
+        self.extend(tasks)
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """
+        Добавляет набор задач, обновляя каждый индекс один раз.
+
+        Задача с уже существующим ID заменяет прежнюю.
+
+        :param tasks: Задачи.
+        """
+        added = {task.id: task for task in tasks}
+        self.remove([task_id for task_id in added if task_id in self._tasks])
+        by_category: Dict[str, List[Task]] = {}
+        by_status: Dict[str, List[Task]] = {}
+        for task in added.values():
+            self._tasks[task.id] = task
+            task._manager = self.owner
+            by_category.setdefault(task.category, []).append(task)
+            by_status.setdefault(task.status, []).append(task)
+            if self._text_index is not None:
+                self._text_index.add(task)
+        self._by_due_date.update(added.values())
+        self._open.update(by_status.get(STATUSES[0], ()))
+        for index, groups in ((self._by_category, by_category),
+                              (self._by_status, by_status)):
+            for value, group in groups.items():
+                if value in index:
+                    index[value].update(group)
+                else:
+                    index[value] = SortedTaskList(group)
+
+    @staticmethod
+    def _index_add(index: Dict[str, SortedTaskList],
+                   value: str, task: Task) -> None:
+        """
+        Добавляет задачу в группу индекса.
+
+        :param index: Индекс по значению поля.
+        :param value: Значение поля задачи.
+        :param task: Задача.
+        """
+        group = index.get(value)
+        if group is None:
+            group = index[value] = SortedTaskList()
+        group.add(task)
+
+    @staticmethod
+    def _index_remove(index: Dict[str, SortedTaskList], value: str,
+                      task: Task, key: Optional[tuple] = None) -> None:
+        """
+        Удаляет задачу из группы индекса; пустая группа удаляется.
+
+        :param index: Индекс по значению поля.
+        :param value: Значение поля задачи.
+        :param task: Задача.
+        :param key: Ключ сортировки, под которым задача была добавлена.
+        """
+        group = index[value]
+        group.remove(task, key)
+        if not group:
+            del index[value]
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(list(self._tasks.values()))
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    def add(self, task: Task) -> None:
+        self._tasks[task.id] = task
+        task._manager = self.owner
+        self._by_due_date.add(task)
+        self._index_add(self._by_category, task.category, task)
+        self._index_add(self._by_status, task.status, task)
+        if task.status == STATUSES[0]:
+            self._open.add(task)
+        if self._text_index is not None:
+            self._text_index.add(task)
+
+    def remove(self, task_ids: Iterable[int]) -> None:
+        """
+        Удаляет задачи с указанными ID.
+
+        Индексы обновляются за один проход, поэтому удаление
+        большого числа задач выполняется за линейное время.
+
+        :param task_ids: ID задач.
+        """
+        removed: Dict[int, Task] = {}
+        for task_id in task_ids:
+            task = self._tasks.pop(task_id, None)
+            if task is not None:
+                task._manager = None
+                removed[task_id] = task
+                if self._text_index is not None:
+                    self._text_index.remove(task)
+        if len(removed) == 1:
+            task, = removed.values()
+            self._by_due_date.remove(task)
+            self._index_remove(self._by_category, task.category, task)
+            self._index_remove(self._by_status, task.status, task)
+            if task.status == STATUSES[0]:
+                self._open.remove(task)
+        elif removed:
+            def is_removed(task: Task) -> bool:
+                return removed.get(task.id) is task
+
+            self._by_due_date.remove_if(is_removed)
+            self._open.remove_if(is_removed)
+            for index, field in ((self._by_category, 'category'),
+                                 (self._by_status, 'status')):
+                for value in {getattr(task, field)
+                              for task in removed.values()}:
+                    index[value].remove_if(is_removed)
+                    if not index[value]:
+                        del index[value]
+
+    def changed(self, task: Task, field: str, old) -> None:
+        if field in ('title', 'description'):
+            if self._text_index is not None:
+                old_title = old if field == 'title' else task.title
+                old_description = (old if field == 'description'
+                                   else task.description)
+                self._text_index.update(task, old_title, old_description)
+        elif field == 'category':
+            self._index_remove(self._by_category, old, task)
+            self._index_add(self._by_category, task.category, task)
+        elif field == 'status':
+            self._index_remove(self._by_status, old, task)
+            self._index_add(self._by_status, task.status, task)
+            if old == STATUSES[0]:
+                self._open.remove(task)
+            else:
+                self._open.add(task)
+        elif field == 'priority':
+            if task.status == STATUSES[0]:
+                self._open.remove(task, urgency_key(task, priority=old))
+                self._open.add(task)
+        elif field == 'due_date':
+            key = due_date_key(task, old)
+            self._by_due_date.remove(task, key)
+            self._index_remove(self._by_category, task.category, task, key)
+            self._index_remove(self._by_status, task.status, task, key)
+            self._by_due_date.add(task)
+            self._index_add(self._by_category, task.category, task)
+            self._index_add(self._by_status, task.status, task)
+            if task.status == STATUSES[0]:
+                self._open.remove(task, urgency_key(task, old))
+                self._open.add(task)
+
+    def max_id(self) -> int:
+        return max(self._tasks, default=0)
+
+    def categories(self) -> List[str]:
+        return list(self._by_category)
+
+    def by_category(self, category: Optional[str] = None) -> List[Task]:
+        if category is None:
+            return list(self._by_due_date)
+        return list(self._by_category.get(category, ()))
+
+    def iter_category(self, category: Optional[str] = None
+                      ) -> Iterator[Task]:
+        if category is None:
+            return iter(self._by_due_date)
+        return iter(self._by_category.get(category, ()))
+
+    def by_status(self, status: str) -> List[Task]:
+        return list(self._by_status.get(status, ()))
+
+    def iter_due(self, start: Optional[int],
+                 end: Optional[int]) -> Iterator[Task]:
+        return self._by_due_date.between(start, end)
+
+    def next_due(self, count: int) -> List[Task]:
+        return self._open.head(count)
+
+    def open_between(self, start: Optional[int],
+                     end: Optional[int]) -> List[Task]:
+        return list(self._open.between(start, end))
+
+    def count(self, field: str, value: str) -> Optional[int]:
+        index = {'category': self._by_category,
+                 'status': self._by_status}.get(field)
+        if index is None:
+            return None
+        return len(index.get(value, ()))
+
+    def count_due(self, start: Optional[int],
+                  end: Optional[int]) -> Optional[int]:
+        return self._by_due_date.count_between(start, end)
+
+    def group_by(self, field: str) -> Dict[str, List[Task]]:
+        """
+        Группирует задачи по значению поля.
+
+        Группы по категории и статусу берутся из индексов,
+        остальные строятся за один проход.
+
+        :param field: Поле группировки ('category', 'priority'
+        или 'status').
+        :return: Словарь значения поля в задачи, отсортированные
+        по сроку выполнения.
+        :raise ValueError: Если по полю нельзя группировать.
+        """
+        index = {'category': self._by_category,
+                 'status': self._by_status}.get(field)
+        if index is None:
+            return super().group_by(field)
+        return {key: list(index[key]) for key in self._group_keys(field)
+                if key in index}
+
+    def by_keyword(self, keyword: str) -> List[Task]:
+        candidates = (self._text_index.candidates(keyword)
+                      if self._text_index is not None else None)
+        if candidates is None:
+            tasks: Iterable[Task] = self._by_due_date
+        else:
+            tasks = self._sorted_by_id(candidates)
+        keyword = keyword.lower()
+        return [task for task in tasks
+                if keyword in task.title.lower()
+                or keyword in task.description.lower()]
+
+    def search(self, query: str, prefix: bool = True) -> List[Task]:
+        if self._text_index is None:
+            return super().search(query, prefix)
+        return self._sorted_by_id(self._text_index.match(query, prefix))
+
+    def _sorted_by_id(self, task_ids: Set[int]) -> List[Task]:
+        """
+        Возвращает задачи с указанными ID, отсортированные
+        по сроку выполнения.
+
+        Если выбрана значительная часть задач, вместо сортировки
+        выполняется проход по индексу сроков выполнения.
+
+        :param task_ids: ID задач.
+        :return: Список задач.
+        """
+        if len(task_ids) * 4 > len(self._tasks):
+            return [task for task in self._by_due_date
+                    if task.id in task_ids]
+        return sorted((self._tasks[task_id] for task_id in task_ids),
+                      key=due_date_key)
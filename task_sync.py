@@ -0,0 +1,135 @@
+import json
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from task import Task
+from task_json import iter_tasks, open_tasks
+from task_lock import locked_file
+
+META_SUFFIX = '.meta'
+
+
+class SharedTaskFile:
+    """
+    JSON-файл задач, который могут изменять несколько процессов.
+
+    Рядом с файлом задач хранится файл метаданных file_name + '.meta'
+    с номером версии файла задач (generation) и следующим свободным
+    ID (next_id). Файл метаданных служит и блокировкой: запись
+    файла задач и выдача ID выполняются под исключительной
+    блокировкой (task_lock.locked_file).
+
+    Процесс запоминает версию файла, прочитанную до загрузки задач.
+    Если при сохранении версия в файле метаданных другая, файл задач
+    изменил другой процесс, и вместо перезаписи выполняется слияние:
+    задачи, измененные в этом процессе, заменяют свои версии
+    в файле, а остальные задачи берутся из файла. Если одну задачу
+    изменили оба процесса, сохраняется версия последнего.
+    """
+
+    def __init__(self, file_name: str):
+        """
+        :param file_name: Путь к файлу задач.
+        """
+        self.file_name = file_name
+        self.meta_file = file_name + META_SUFFIX
+        # Версия файла задач, с которой согласовано состояние процесса.
+        self.generation = 0
+
+    def read_generation(self) -> int:
+        """
+        Читает версию файла задач без блокировки.
+
+        Версию нужно читать до файла задач: запись увеличивает ее
+        только после замены файла, поэтому прочитанные задачи
+        не старше прочитанной версии. Недочитанный файл метаданных
+        дает версию 0, что при сохранении приводит лишь к лишнему
+        слиянию.
+
+        :return: Номер версии (0, если файла метаданных нет).
+        """
+        try:
+            with open(self.meta_file, 'rb') as file:
+                return _parse_meta(file.read())['generation']
+        except OSError:
+            return 0
+
+    @contextmanager
+    def lock(self) -> Iterator[Dict[str, int]]:
+        """
+        Удерживает блокировку файла задач на время блока.
+
+        :return: Метаданные (generation, next_id); измененные
+        в блоке значения записываются при выходе из него.
+        """
+        with locked_file(self.meta_file) as file:
+            file.seek(0)
+            meta = _parse_meta(file.read())
+            before = dict(meta)
+            yield meta
+            if meta != before:
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(meta).encode())
+
+    def allocate_ids(self, count: int, minimum: int) -> int:
+        """
+        Выделяет диапазон ID, не занятых ни одним процессом.
+
+        Если файл метаданных создать нельзя (например, каталога
+        файла задач нет), другие процессы не могут изменять файл
+        задач, и выдается minimum.
+
+        :param count: Число ID.
+        :param minimum: Наименьший допустимый ID (следующий ID
+        по задачам процесса).
+        :return: Первый ID диапазона.
+        """
+        try:
+            with self.lock() as meta:
+                start = max(meta['next_id'], minimum)
+                meta['next_id'] = start + count
+        except OSError:
+            return minimum
+        return start
+
+    def read_tasks(self) -> Dict[int, Task]:
+        """
+        Читает текущие задачи файла; вызывается под блокировкой.
+
+        :return: Задачи по ID.
+        """
+        try:
+            file = open_tasks(self.file_name)
+        except FileNotFoundError:
+            return {}
+        with file:
+            return {task.id: task for task in iter_tasks(file)}
+
+
+def _parse_meta(data: bytes) -> Dict[str, int]:
+    try:
+        meta = json.loads(data or b'{}')
+        return {'generation': int(meta.get('generation', 0)),
+                'next_id': int(meta.get('next_id', 1))}
+    except (AttributeError, TypeError, ValueError):
+        return {'generation': 0, 'next_id': 1}
+
+
+def merge_records(remote: Dict[int, Dict],
+                  changes: Dict[int, Optional[Dict]]) -> Dict[int, Dict]:
+    """
+    Применяет изменения процесса к задачам, прочитанным из файла.
+
+    :param remote: Словари задач из файла по ID.
+    :param changes: Измененные процессом задачи: словарь задачи
+    или None, если задача удалена.
+    :return: Словари задач после слияния по ID.
+    """
+    merged = dict(remote)
+    for task_id, record in changes.items():
+        if record is None:
+            merged.pop(task_id, None)
+        else:
+            merged[task_id] = record
+    return merged
@@ -0,0 +1,220 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from task import Task
+from task_json import atomic_file, codec_of
+from task_manager import TaskManager
+
+FORMATS = ('csv', 'jsonl')
+FIELDS = ('id', 'title', 'description', 'category', 'due_date',
+          'priority', 'status')
+# Расширения файлов обмена и их форматы.
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+# Число записей, которые проверяются и добавляются за один раз.
+IMPORT_BATCH_SIZE = 100_000
+
+
+def format_of(file_name: str) -> str:
+    """
+    Определяет формат файла обмена по расширению.
+
+    Расширение сжатия (.gz, .bz2, .xz) пропускается, поэтому
+    tasks.csv.gz считается файлом CSV.
+
+    :param file_name: Путь к файлу.
+    :return: 'csv' или 'jsonl'.
+    :raise ValueError: Если расширение не соответствует
+    ни одному формату.
+    """
+    name = file_name
+    if codec_of(name) is not None:
+        name = os.path.splitext(name)[0]
+    extension = os.path.splitext(name)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f'Неизвестный формат файла {file_name}; '
+                         f'укажите формат: {", ".join(FORMATS)}')
+    return _EXTENSIONS[extension]
+
+
+def read_records(file: TextIO, file_format: str) -> Iterator[Dict]:
+    """
+    Читает записи задач из файла CSV или JSON Lines по одной.
+
+    Файл CSV должен начинаться со строки заголовков с названиями
+    полей задачи.
+
+    :param file: Файл, открытый в текстовом режиме (для CSV -
+    с newline='').
+    :param file_format: 'csv' или 'jsonl'.
+    :return: Итератор словарей с полями задачи.
+    :raise ValueError: Если строка JSON Lines некорректна.
+    """
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f'Строка {number}: {exc.msg}')
+        if not isinstance(record, dict):
+            raise ValueError(f'Строка {number}: ожидался объект задачи')
+        yield record
+
+
+def write_records(file: TextIO, tasks: Iterable[Task],
+                  file_format: str) -> int:
+    """
+    Записывает задачи в файл CSV или JSON Lines по одной.
+
+    :param file: Файл, открытый в текстовом режиме (для CSV -
+    с newline='').
+    :param tasks: Задачи.
+    :param file_format: 'csv' или 'jsonl'.
+    :return: Количество записанных задач.
+    """
+    count = 0
+    if file_format == 'csv':
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        for task in tasks:
+            writer.writerow((task.id, task.title, task.description,
+                             task.category, task.due_date, task.priority,
+                             task.status))
+            count += 1
+        return count
+    for task in tasks:
+        file.write(json.dumps(task.to_dict(), ensure_ascii=False))
+        file.write('\n')
+        count += 1
+    return count
+
+
+def _open_input(file_name: str) -> TextIO:
+    codec = codec_of(file_name)
+    if codec is None:
+        return open(file_name, 'r', encoding='utf-8', newline='')
+    return codec.open(file_name, 'rt', encoding='utf-8', newline='')
+
+
+def import_tasks(task_manager: TaskManager, file_name: str,
+                 file_format: Optional[str] = None,
+                 batch_size: int = IMPORT_BATCH_SIZE) -> int:
+    """
+    Добавляет в менеджер задачи из файла CSV или JSON Lines.
+
+    Файл читается потоково и добавляется порциями по batch_size
+    записей через add_tasks_bulk. Задачам выдаются новые ID,
+    поле id файла не используется. Импорт выполняется целиком или
+    не выполняется: если запись некорректна, уже добавленные порции
+    удаляются из менеджера (и из базы SQLite), так что задачи
+    остаются прежними при любом хранилище.
+
+    :param task_manager: Менеджер задач.
+    :param file_name: Путь к файлу; сжатые файлы (.gz, .bz2, .xz)
+    распаковываются по мере чтения.
+    :param file_format: 'csv' или 'jsonl'; по умолчанию определяется
+    по расширению файла.
+    :param batch_size: Число записей в порции.
+    :return: Количество добавленных задач.
+    :raise ValueError: Если формат неизвестен или запись некорректна;
+    в этом случае ни одна задача не добавлена.
+    """
+    file_format = file_format or format_of(file_name)
+    added: List[int] = []
+    with _open_input(file_name) as file:
+        records = read_records(file, file_format)
+        try:
+            while True:
+                batch: List[Dict] = list(islice(records, batch_size))
+                if not batch:
+                    return len(added)
+                added.extend(task_manager.add_tasks_bulk(batch))
+        except ValueError as exc:
+            task_manager.delete_tasks(added)
+            raise ValueError(f'Задачи не импортированы: {exc}')
+
+
+def export_tasks(task_manager: TaskManager, file_name: str,
+                 file_format: Optional[str] = None,
+                 category: Optional[str] = None) -> int:
+    """
+    Атомарно записывает задачи менеджера в файл CSV или JSON Lines.
+
+    Задачи перебираются по сроку выполнения и записываются по одной,
+    не собираясь в памяти.
+
+    :param task_manager: Менеджер задач.
+    :param file_name: Путь к файлу; при расширении сжатия
+    (.gz, .bz2, .xz) файл сжимается по мере записи.
+    :param file_format: 'csv' или 'jsonl'; по умолчанию определяется
+    по расширению файла.
+    :param category: Категория задач или None для всех задач.
+    :return: Количество записанных задач.
+    :raise ValueError: Если формат неизвестен.
+    """
+    file_format = file_format or format_of(file_name)
+    with atomic_file(file_name, encoding='utf-8', newline='') as file:
+        return write_records(file, task_manager.iter_tasks(category),
+                             file_format)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Импортирует задачи из файлов CSV и JSON Lines и экспортирует
+    их в такие файлы без интерактивного ввода.
+
+    :param argv: Аргументы командной строки.
+    :return: Код завершения.
+    """
+    parser = argparse.ArgumentParser(
+        description='Импорт и экспорт задач в форматах CSV и JSON Lines.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, help_text, file_help in (
+            ('import', 'добавить задачи из файла', 'файл с задачами'),
+            ('export', 'записать задачи в файл', 'файл для записи задач')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('storage', help='файл задач менеджера '
+                                             '(JSON, снимок или база SQLite)')
+        command.add_argument('file', help=file_help)
+        command.add_argument('--format', choices=FORMATS,
+                             help='формат файла (по умолчанию '
+                                  'по расширению)')
+        if name == 'export':
+            command.add_argument('--category',
+                                 help='экспортировать только категорию')
+    args = parser.parse_args(argv)
+    if args.command == 'import' and not os.path.exists(args.file):
+        print(f'Файл {args.file} не найден', file=sys.stderr)
+        return 1
+    # Файл задач может быть открыт и в других процессах (меню, сервер):
+    # импорт сохраняет его под их общей блокировкой.
+    task_manager = TaskManager(args.storage, shared=True)
+    try:
+        if task_manager.load_error is not None:
+            raise task_manager.load_error
+        if args.command == 'import':
+            count = import_tasks(task_manager, args.file, args.format)
+            task_manager.save_tasks(args.storage)
+            print(f'Импортировано задач: {count}')
+        else:
+            count = export_tasks(task_manager, args.file, args.format,
+                                 args.category)
+            print(f'Экспортировано задач: {count}')
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        task_manager.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
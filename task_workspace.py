@@ -0,0 +1,410 @@
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote, unquote
+
+from task import Task, TaskChange
+from task_index import due_date_key
+from task_json import write_tasks
+from task_manager import TaskManager
+from task_snapshot import is_snapshot_file, write_snapshot
+from task_sqlite import is_sqlite_file, write_sqlite
+
+
+def split_by_category(source_file: str, directory: str,
+                      extension: str = '.json') -> List[str]:
+    """
+    Разделяет файл задач на файлы по категориям.
+
+    Имя файла категории - название категории, закодированное
+    для файловой системы, поэтому Workspace с by_category=True
+    находит файл категории, не загружая задачи. ID задач
+    сохраняются.
+
+    :param source_file: Файл задач.
+    :param directory: Каталог для файлов категорий; создается,
+    если его нет.
+    :param extension: Расширение файлов (.json, .json.gz, .db,
+    .snapshot и т.д.).
+    :return: Пути к созданным файлам.
+    """
+    os.makedirs(directory, exist_ok=True)
+    source = TaskManager(source_file)
+    files = []
+    try:
+        for category in sorted(source.get_categories()):
+            file_name = os.path.join(directory, quote(category, safe='')
+                                     + extension)
+            if is_sqlite_file(file_name):
+                write_sqlite(file_name, source.iter_tasks(category))
+            elif is_snapshot_file(file_name):
+                write_snapshot(file_name, source.iter_tasks(category))
+            else:
+                write_tasks(file_name, source.iter_tasks(category))
+            files.append(file_name)
+    finally:
+        source.close()
+    return files
+
+
+class _Shard:
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.manager: Optional[TaskManager] = None
+        self.saved_generation = 0
+
+
+class Workspace:
+    """
+    Набор файлов задач (шардов), с которыми можно работать как
+    с одним списком.
+
+    Каждый файл обслуживается своим TaskManager, который создается
+    при первом обращении к шарду; load загружает оставшиеся шарды
+    параллельно. Запросы по всем задачам объединяют отсортированные
+    по сроку выполнения результаты шардов через heapq.merge, не
+    собирая задачи в общий список.
+
+    ID задач уникальны во всем наборе: новые задачи получают ID
+    из общего счетчика, а задачи загружаемого шарда, ID которых
+    уже заняты в загруженных шардах, получают новые ID в памяти
+    (шард при этом считается измененным). База SQLite записывает
+    изменения сразу, поэтому шард SQLite с занятыми ID не
+    загружается. Сохраняются только измененные шарды.
+
+    Если by_category=True, каждый шард хранит одну категорию, а имя
+    его файла - закодированное название категории (см.
+    split_by_category). Тогда запросы по категории загружают только
+    шард своей категории, а категории известны без загрузки задач.
+    Для новой задачи загружаются все шарды, чтобы выдать ей
+    уникальный ID. Задача, категорию которой изменили, переносится
+    с тем же ID в шард новой категории (он создается, если его нет);
+    прежний объект Task после этого не связан с набором, и задачу
+    нужно снова получить через get_task.
+    """
+
+    def __init__(self, files: Iterable[str], by_category: bool = False,
+                 workers: int = 4, **options: Any):
+        """
+        :param files: Пути к файлам задач.
+        :param by_category: Если True, шарды разделены по категориям.
+        :param workers: Число потоков загрузки шардов.
+        :param options: Параметры TaskManager для каждого шарда.
+        """
+        self._shards = [_Shard(file_name) for file_name in files]
+        self.by_category = by_category
+        self.workers = workers
+        self._options = options
+        self._owners: Dict[int, _Shard] = {}
+        self._next_id = 1
+
+    @property
+    def files(self) -> List[str]:
+        """
+        Возвращает пути к файлам шардов.
+        """
+        return [shard.file_name for shard in self._shards]
+
+    @property
+    def load_errors(self) -> Dict[str, Exception]:
+        """
+        Возвращает ошибки загрузки поврежденных шардов по путям
+        к их файлам.
+        """
+        return {shard.file_name: shard.manager.load_error
+                for shard in self._shards if shard.manager is not None
+                and shard.manager.load_error is not None}
+
+    def _category_of(self, shard: _Shard) -> str:
+        name = os.path.basename(shard.file_name)
+        return unquote(name[:len(name) - len(_extension(name))])
+
+    def _register(self, shard: _Shard, manager: TaskManager) -> None:
+        """
+        Подключает загруженный шард и выдает новые ID его задачам,
+        ID которых заняты в других шардах.
+
+        :param shard: Шард.
+        :param manager: Менеджер задач шарда.
+        :raise ValueError: Если ID задач шарда SQLite заняты в других
+        шардах: новые ID пришлось бы записать в базу при загрузке.
+        """
+        ids = [task.id for task in manager.iter_tasks()]
+        taken = [task_id for task_id in ids if task_id in self._owners]
+        if taken and is_sqlite_file(shard.file_name):
+            manager.close()
+            raise ValueError(f'ID задач шарда {shard.file_name!r} уже '
+                             f'заняты в других шардах: '
+                             + ', '.join(map(str, taken[:10])))
+        shard.manager = manager
+        if self.by_category:
+            manager.subscribe(
+                lambda changes: self._category_changed(shard, changes))
+        for task_id in ids:
+            self._owners.setdefault(task_id, shard)
+        self._next_id = max(self._next_id, manager.task_id)
+        shard.saved_generation = manager.generation
+        if taken:
+            records = [manager.get_task(task_id).to_dict()
+                       for task_id in taken]
+            manager.delete_tasks(taken)
+            manager.task_id = self._next_id
+            for task_id in manager.add_tasks_bulk(records):
+                self._owners[task_id] = shard
+            self._next_id = manager.task_id
+
+    def _manager(self, shard: _Shard) -> TaskManager:
+        """
+        Возвращает менеджер задач шарда, загружая шард при первом
+        обращении.
+        """
+        if shard.manager is None:
+            self._register(shard, TaskManager(shard.file_name,
+                                              **self._options))
+        return shard.manager
+
+    def load(self) -> None:
+        """
+        Загружает все еще не загруженные шарды параллельно.
+
+        ID задач проверяются в порядке шардов, поэтому результат
+        не зависит от того, какой шард загрузился раньше.
+
+        :raise ValueError: Если ID задач шарда SQLite заняты в других
+        шардах.
+        """
+        pending = [shard for shard in self._shards if shard.manager is None]
+        if not pending:
+            return
+        with ThreadPoolExecutor(self.workers) as executor:
+            managers = list(executor.map(
+                lambda shard: TaskManager(shard.file_name, **self._options),
+                pending))
+        for index, (shard, manager) in enumerate(zip(pending, managers)):
+            try:
+                self._register(shard, manager)
+            except ValueError:
+                for other in managers[index + 1:]:
+                    other.close()
+                raise
+
+    def _merge(self, results: Iterable[List[Task]]) -> List[Task]:
+        return list(heapq.merge(*results, key=due_date_key))
+
+    def _all(self) -> List[TaskManager]:
+        self.load()
+        return [shard.manager for shard in self._shards]
+
+    def _category_shard(self, category: str) -> Optional[_Shard]:
+        for shard in self._shards:
+            if self._category_of(shard) == category:
+                return shard
+        return None
+
+    def _new_category_shard(self, category: str) -> _Shard:
+        """
+        Возвращает шард категории, добавляя его в набор, если его нет.
+
+        Файл нового шарда создается при сохранении в каталоге первого
+        шарда и с его расширением.
+
+        :param category: Категория.
+        :return: Шард.
+        """
+        shard = self._category_shard(category)
+        if shard is None:
+            directory = os.path.dirname(self._shards[0].file_name) \
+                if self._shards else '.'
+            extension = (_extension(self._shards[0].file_name)
+                         if self._shards else '.json')
+            shard = _Shard(os.path.join(
+                directory, quote(category, safe='') + extension))
+            self._shards.append(shard)
+        return shard
+
+    def _category_changed(self, shard: _Shard,
+                          changes: List[TaskChange]) -> None:
+        """
+        Переносит задачи, категория которых изменилась, в шарды
+        их новых категорий, сохраняя ID.
+
+        :param shard: Шард, в котором изменились задачи.
+        :param changes: Изменения задач шарда.
+        """
+        moved = {change.task.id: change.task for change in changes
+                 if change.field == 'category'}
+        for task in moved.values():
+            if task._manager is not shard.manager:
+                continue
+            target = self._new_category_shard(task.category)
+            if target is shard:
+                continue
+            manager = self._manager(target)
+            record = task.to_dict()
+            shard.manager.delete_tasks([task.id])
+            next_id = manager.task_id
+            manager.task_id = task.id
+            manager.add_tasks_bulk([record])
+            manager.task_id = max(next_id, task.id + 1)
+            self._owners[task.id] = target
+
+    def get_tasks(self, category: Optional[str] = None) -> List[Task]:
+        """
+        Возвращает задачи категории (если указана) или все задачи
+        в порядке срока выполнения.
+
+        :param category: Категория для фильтрации задач.
+        :return: Список задач.
+        """
+        if category is not None and self.by_category:
+            shard = self._category_shard(category)
+            return ([] if shard is None
+                    else self._manager(shard).get_tasks(category))
+        return self._merge(manager.get_tasks(category)
+                           for manager in self._all())
+
+    def get_tasks_by_status(self, status: str) -> List[Task]:
+        """
+        Возвращает задачи с указанным статусом в порядке срока
+        выполнения.
+
+        :param status: Статус задачи.
+        :return: Список задач.
+        """
+        return self._merge(manager.get_tasks_by_status(status)
+                           for manager in self._all())
+
+    def get_tasks_by_keyword(self, keyword: str) -> List[Task]:
+        """
+        Возвращает задачи, которые содержат ключевое слово в названии
+        или описании, в порядке срока выполнения.
+
+        :param keyword: Ключевое слово для поиска.
+        :return: Список задач.
+        """
+        return self._merge(manager.get_tasks_by_keyword(keyword)
+                           for manager in self._all())
+
+    def get_categories(self) -> List[str]:
+        """
+        Возвращает список категорий всех шардов.
+
+        Если шарды разделены по категориям, задачи не загружаются,
+        а пропускаются только загруженные шарды, в которых не осталось
+        задач.
+        """
+        if self.by_category:
+            return [self._category_of(shard) for shard in self._shards
+                    if shard.manager is None or shard.manager.size]
+        categories: Dict[str, None] = {}
+        for manager in self._all():
+            categories.update(dict.fromkeys(manager.get_categories()))
+        return list(categories)
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Возвращает задачу по ID или None.
+
+        :param task_id: ID задачи.
+        """
+        self.load()
+        shard = self._owners.get(task_id)
+        return None if shard is None else shard.manager.get_task(task_id)
+
+    def add_task(self, title: str, description: str, category: str,
+                 due_date: str, priority: str,
+                 file_name: Optional[str] = None) -> Task:
+        """
+        Добавляет задачу в шард.
+
+        :param file_name: Файл шарда. Если шарды разделены
+        по категориям, задача добавляется в шард своей категории
+        (он создается, если его нет), и параметр не нужен; иначе
+        он обязателен, если шардов несколько.
+        :return: Добавленная задача.
+        :raise ValueError: Если шард не указан или не найден
+        либо поле задачи некорректно.
+        """
+        if self.by_category:
+            shard = self._new_category_shard(category)
+        elif file_name is not None:
+            shard = next((shard for shard in self._shards
+                          if shard.file_name == file_name), None)
+            if shard is None:
+                raise ValueError(f'Шард {file_name!r} не найден')
+        elif len(self._shards) == 1:
+            shard = self._shards[0]
+        else:
+            raise ValueError('Укажите файл шарда для новой задачи')
+        # Новый ID должен быть больше ID всех шардов, включая
+        # еще не загруженные.
+        self.load()
+        manager = shard.manager
+        manager.task_id = self._next_id
+        manager.add_task(title, description, category, due_date, priority)
+        task = manager.get_task(self._next_id)
+        self._owners[task.id] = shard
+        self._next_id = manager.task_id
+        return task
+
+    def delete_task(self, value: Task | str) -> None:
+        """
+        Удаляет задачу или все задачи категории во всех шардах.
+
+        :param value: Задача или название категории.
+        :raise ValueError: Если задача не принадлежит набору.
+        """
+        if isinstance(value, Task):
+            shard = self._owners.get(value.id)
+            if shard is None or value._manager is not shard.manager:
+                raise ValueError('Задача не найдена')
+            shard.manager.delete_task(value)
+        elif self.by_category:
+            shard = self._category_shard(value)
+            if shard is not None:
+                self._manager(shard).delete_task(value)
+        else:
+            for manager in self._all():
+                manager.delete_task(value)
+
+    def changed_files(self) -> List[str]:
+        """
+        Возвращает пути к файлам шардов, измененных после загрузки
+        или последнего сохранения.
+        """
+        return [shard.file_name for shard in self._shards
+                if shard.manager is not None
+                and shard.manager.generation != shard.saved_generation]
+
+    def save(self) -> List[str]:
+        """
+        Сохраняет измененные шарды в их файлы.
+
+        :return: Пути к сохраненным файлам.
+        """
+        saved = self.changed_files()
+        for shard in self._shards:
+            if shard.file_name in saved:
+                shard.manager.save_tasks(shard.file_name)
+                shard.saved_generation = shard.manager.generation
+        return saved
+
+    def close(self) -> None:
+        """
+        Закрывает менеджеры задач загруженных шардов.
+        """
+        for shard in self._shards:
+            if shard.manager is not None:
+                shard.manager.close()
+
+
+def _extension(file_name: str) -> str:
+    """
+    Возвращает расширение файла задач вместе с расширением сжатия
+    (например, .json.gz).
+    """
+    root, extension = os.path.splitext(file_name)
+    if extension.lower() in ('.gz', '.bz2', '.xz'):
+        extension = os.path.splitext(root)[1] + extension
+    return extension
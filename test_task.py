@@ -1,4 +1,6 @@
 import pytest
+from datetime import date
+
 from task import Task
 
 
@@ -93,3 +95,20 @@ def test_from_dict():
     assert task.due_date == '2024-12-01'
     assert task.priority == 'Низкий'
     assert task.status == 'Выполнена'
+
+
+def test_due_ordinal():
+    task = Task(10, 'Title', 'Desc', 'Category', '2024-12-01', 'Низкий')
+    assert task.due_ordinal == date(2024, 12, 1).toordinal()
+    task.due_date = '2025-01-01'
+    assert task.due_ordinal == date(2025, 1, 1).toordinal()
+    with pytest.raises(ValueError):
+        task.due_date = '2025-02-30'
+    assert task.due_ordinal == date(2025, 1, 1).toordinal()
+
+
+def test_slots():
+    task = Task(11, 'Title', 'Desc', 'Category', '2024-12-01', 'Низкий')
+    assert not hasattr(task, '__dict__')
+    with pytest.raises(AttributeError):
+        task.extra = 1
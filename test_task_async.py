@@ -0,0 +1,116 @@
+import asyncio
+import threading
+
+import pytest
+from task_async import AsyncTaskManager
+from task_manager import TaskManager
+from task_query import Query
+
+TASKS = [
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    file_name = str(tmp_path / 'tasks.json')
+    manager = TaskManager(file_name)
+    for task in TASKS:
+        manager.add_task(*task)
+    manager.save_tasks(file_name)
+    return file_name
+
+
+async def collect(iterator):
+    return [task async for task in iterator]
+
+
+def test_open_shares_in_flight_load(storage, monkeypatch):
+    threads = []
+    original = TaskManager._load
+
+    def load(self, on_progress):
+        threads.append(threading.current_thread())
+        original(self, on_progress)
+
+    monkeypatch.setattr(TaskManager, '_load', load)
+
+    async def main():
+        first, second = await asyncio.gather(AsyncTaskManager.open(storage),
+                                             AsyncTaskManager.open(storage))
+        assert first is second
+        third = await AsyncTaskManager.open(storage)
+        assert third is not first
+        await first.close()
+        await third.close()
+
+    asyncio.run(main())
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_methods_and_iterators(storage):
+    async def main():
+        async with await AsyncTaskManager.open(storage) as manager:
+            assert await manager.size() == 3
+            task = await manager.add_task('Врач', 'Записаться', 'Здоровье',
+                                          '2024-11-30', 'Средний')
+            assert task.id == 4
+            tasks = await collect(manager.iter_tasks(chunk_size=2))
+            assert [task.id for task in tasks] == [4, 2, 3, 1]
+            tasks = await collect(manager.iter_tasks('Работа', chunk_size=1))
+            assert [task.id for task in tasks] == [2, 3]
+            query = Query().where(category='Работа').order_by('-priority')
+            assert [task.id for task in
+                    await collect(manager.iter_query(query))] == [2, 3]
+            assert [task.id for task in await manager.query(query)] == [2, 3]
+            tasks = await collect(manager.load_tasks(chunk_size=2))
+            assert [task.id for task in tasks] == [1, 2, 3]
+            assert sorted(await manager.get_categories()) == [
+                'Дом', 'Здоровье', 'Работа']
+            await manager.delete_task('Здоровье')
+            await manager.save_tasks()
+        assert [task.id for task in TaskManager(storage).tasks] == [1, 2, 3]
+
+    asyncio.run(main())
+
+
+def test_update_task_and_subscribe(storage):
+    async def main():
+        manager = await AsyncTaskManager.open(storage)
+        received = []
+        loop_thread = threading.current_thread()
+
+        def callback(changes):
+            assert threading.current_thread() is loop_thread
+            received.append([(change.field, change.new)
+                             for change in changes])
+
+        unsubscribe = manager.subscribe(callback)
+        task = await manager.update_task(1, status='Выполнена',
+                                         priority='Высокий')
+        assert (task.status, task.priority) == ('Выполнена', 'Высокий')
+        await asyncio.sleep(0)
+        assert received == [[('status', 'Выполнена'),
+                             ('priority', 'Высокий')]]
+        async with manager.batch():
+            await manager.update_task(2, status='Выполнена')
+            await manager.update_task(3, status='Выполнена')
+        await asyncio.sleep(0)
+        assert len(received) == 2 and len(received[1]) == 2
+        unsubscribe()
+        with pytest.raises(ValueError, match='№10'):
+            await manager.update_task(10, status='Выполнена')
+        with pytest.raises(ValueError, match='id'):
+            await manager.update_task(1, id=5)
+        with pytest.raises(ValueError):
+            await manager.update_task(1, title='Новое', due_date='2024-02-30')
+        assert (await manager.get_task(1)).title == 'Купить молоко'
+        with pytest.raises(TypeError):
+            await manager.update_task(1, title='Новое', due_date=5)
+        assert (await manager.get_task(1)).title == 'Купить молоко'
+        await manager.close()
+
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+
+import pytest
+from task import Task
+from task_json import TaskFileError
+from task_manager import TaskManager
+from task_sync import SharedTaskFile
+
+
+def read_records(file_name):
+    with open(file_name) as file:
+        return json.load(file)
+
+
+def read(file_name):
+    return [task['id'] for task in read_records(file_name)]
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def storage_file(tmp_path):
+    return str(tmp_path / 'tasks.json')
+
+
+def add(manager, count):
+    for i in range(count):
+        manager.add_task(f'Task {i}', 'D', 'Work', '2024-12-01', 'Низкий')
+
+
+def test_flush_after_max_changes(storage_file):
+    manager = TaskManager(storage_file)
+    manager.start_autosave(interval=60, max_changes=3)
+    add(manager, 2)
+    time.sleep(0.05)
+    assert manager.unsaved_changes == 2
+    add(manager, 1)
+    assert wait_for(lambda: manager.unsaved_changes == 0)
+    assert read(storage_file) == [1, 2, 3]
+    assert manager.close()
+
+
+def test_flush_after_interval(storage_file):
+    manager = TaskManager(storage_file)
+    manager.start_autosave(interval=0.05, max_changes=1000)
+    add(manager, 1)
+    assert wait_for(lambda: manager.unsaved_changes == 0)
+    assert read(storage_file) == [1]
+    manager.close()
+
+
+def test_close_writes_all_changes(storage_file):
+    manager = TaskManager(storage_file)
+    add(manager, 4)
+    manager.save_tasks(storage_file)
+    manager.start_autosave(interval=60, max_changes=1000)
+    manager.get_task(2).title = 'Новое'
+    manager.delete_task(manager.get_task(1))
+    add(manager, 1)
+    manager.delete_task('Work')
+    manager.add_task('Home task', 'D', 'Home', '2024-12-01', 'Низкий')
+    manager.get_task(6).status = 'Выполнена'
+    assert manager.close()
+    loaded = TaskManager(storage_file)
+    assert [task.to_dict() for task in loaded.tasks] == [
+        task.to_dict() for task in manager.tasks]
+    assert loaded.get_task(6).status == 'Выполнена'
+
+
+def test_save_tasks_waits_for_autosave(storage_file):
+    manager = TaskManager(storage_file)
+    manager.start_autosave(interval=60, max_changes=1000)
+    add(manager, 2)
+    manager.save_tasks(storage_file)
+    assert manager.unsaved_changes == 0
+    assert read(storage_file) == [1, 2]
+    manager.close()
+
+
+def test_write_error_keeps_changes(tmp_path):
+    manager = TaskManager(str(tmp_path / 'missing' / 'tasks.json'))
+    manager.start_autosave(interval=60, max_changes=1000)
+    add(manager, 1)
+    assert not manager.flush(timeout=0.5)
+    assert manager._autosaver.error is not None
+    assert manager.unsaved_changes == 1
+    assert not manager.close(timeout=0.5)
+
+
+def test_autosave_needs_json_file(tmp_path):
+    with pytest.raises(ValueError):
+        TaskManager('').start_autosave()
+    manager = TaskManager(str(tmp_path / 'tasks.db'))
+    with pytest.raises(ValueError):
+        manager.start_autosave()
+    manager.close()
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_writer_thread_serializes(storage_file, columnar, monkeypatch):
+    manager = TaskManager(storage_file, columnar=columnar)
+    add(manager, 4)
+    manager.save_tasks(storage_file)
+    threads = set()
+    to_dict = Task.to_dict
+
+    def recording_to_dict(task):
+        threads.add(threading.current_thread())
+        return to_dict(task)
+
+    monkeypatch.setattr(Task, 'to_dict', recording_to_dict)
+    manager.start_autosave(interval=60, max_changes=1000)
+    manager.get_task(2).title = 'Новое'
+    manager.delete_tasks([1, 3])
+    add(manager, 1)
+    assert manager.flush()
+    assert threads and threading.current_thread() not in threads
+    assert [task['title'] for task in read_records(storage_file)] == [
+        'Новое', 'Task 3', 'Task 0']
+    manager.close()
+
+
+def test_shared_read_error_keeps_thread(storage_file):
+    manager = TaskManager(storage_file, shared=True)
+    add(manager, 1)
+    manager.save_tasks(storage_file)
+    manager.start_autosave(interval=0.05, max_changes=1000)
+    # Другой процесс оставил поврежденный файл.
+    with SharedTaskFile(storage_file).lock() as meta:
+        with open(storage_file, 'w') as file:
+            file.write('[{"id": 1')
+        meta['generation'] += 1
+    add(manager, 1)
+    assert not manager.flush(timeout=0.5)
+    assert isinstance(manager._autosaver.error, TaskFileError)
+    with open(storage_file, 'w') as file:
+        file.write('[]')
+    assert wait_for(lambda: manager.unsaved_changes == 0)
+    assert manager._autosaver.error is None
+    assert read(storage_file) == [2]
+    assert manager.close()
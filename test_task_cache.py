@@ -0,0 +1,99 @@
+import sys
+
+from task_cache import QueryCache
+from task_manager import TaskManager
+
+TASKS = [
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-05', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-04', 'Низкий'),
+]
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+def make_manager(file_name=''):
+    manager = TaskManager(file_name)
+    for task in TASKS:
+        manager.add_task(*task)
+    return manager
+
+
+def test_repeated_queries_hit_cache():
+    manager = make_manager()
+    assert ids(manager.get_tasks()) == [2, 3, 1]
+    assert ids(manager.get_tasks()) == [2, 3, 1]
+    assert manager.get_categories() == ['Работа', 'Дом']
+    assert ids(manager.get_tasks_by_keyword('отчет')) == [1]
+    assert ids(manager.get_tasks_by_keyword('отчет')) == [1]
+    stats = manager.cache_stats
+    assert (stats.hits, stats.misses, stats.entries) == (2, 3, 3)
+    assert stats.size > 0
+    # Изменение возвращенного списка не затрагивает кэш.
+    manager.get_tasks().clear()
+    assert ids(manager.get_tasks()) == [2, 3, 1]
+    assert TaskManager('', cache=False).cache_stats is None
+
+
+def test_changes_invalidate_cache():
+    manager = make_manager()
+    assert ids(manager.get_tasks_by_status('Выполнена')) == []
+    manager.get_task(2).status = 'Выполнена'
+    assert ids(manager.get_tasks_by_status('Выполнена')) == [2]
+    manager.add_task('Отчет за год', 'Итоги', 'Работа', '2024-12-01',
+                     'Низкий')
+    assert ids(manager.get_tasks_by_keyword('отчет')) == [4, 1]
+    manager.delete_task('Дом')
+    assert manager.get_categories() == ['Работа']
+    manager.delete_task(manager.get_task(4))
+    assert ids(manager.get_tasks_by_keyword('отчет')) == [1]
+    manager.add_tasks_bulk([{'title': 'Счет', 'description': 'Оплатить',
+                             'category': 'Дом', 'due_date': '2024-12-03',
+                             'priority': 'Средний'}])
+    assert ids(manager.next_due(2)) == [5, 1]
+    stats = manager.cache_stats
+    assert stats.hits == 0 and stats.invalidations == 5
+
+
+def test_lru_bounds():
+    cache = QueryCache(max_entries=2)
+    for key in ('a', 'b', 'a', 'c'):
+        cache.get(key, 0, lambda: [key])
+    assert cache.get('a', 0, list) == ['a']
+    assert cache.get('b', 0, list) == []
+    stats = cache.stats()
+    assert (stats.hits, stats.evictions, stats.entries) == (2, 2, 2)
+    small = QueryCache(max_size=200)
+    assert small.get('big', 0, lambda: list(range(100))) == list(range(100))
+    assert small.stats().entries == 0
+
+
+def test_sqlite_changes_by_other_connection(tmp_path):
+    file_name = str(tmp_path / 'tasks.db')
+    manager = make_manager(file_name)
+    other = TaskManager(file_name)
+    assert ids(manager.get_tasks('Дом')) == [3]
+    other.get_task(3).category = 'Работа'
+    assert manager.get_tasks('Дом') == []
+    other.close()
+    manager.close()
+
+
+def test_counts_tasks_of_created_on_demand():
+    memory = make_manager()
+    columnar = TaskManager('', columnar=True)
+    for task in TASKS:
+        columnar.add_task(*task)
+    for manager in (memory, columnar):
+        manager.get_tasks()
+        manager.group_by('category')
+    # Столбцовое хранилище создает задачи по запросу, и они живут,
+    # пока результат в кэше.
+    assert columnar.cache_stats.size > memory.cache_stats.size + 3 * 100
+    tasks = columnar.get_tasks()
+    cache = QueryCache(max_size=sys.getsizeof(tasks) + 50)
+    cache.get('tasks', 0, lambda: tasks)
+    cache.get('counted', 0, lambda: tasks, count_tasks=True)
+    assert cache.stats().entries == 1
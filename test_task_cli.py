@@ -0,0 +1,112 @@
+import json
+from datetime import date
+
+import pytest
+from task_cli import main, read_tasks, task_stats
+from task_json import TaskFileError
+from task_manager import TaskManager
+
+TASKS = [
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+]
+
+
+@pytest.fixture(params=['tasks.json', 'tasks.json.gz', 'tasks.db',
+                        'tasks.snapshot'])
+def storage(request, tmp_path):
+    file_name = str(tmp_path / request.param)
+    manager = TaskManager(file_name)
+    for task in TASKS:
+        manager.add_task(*task)
+    manager.save_tasks(file_name)
+    manager.close()
+    return file_name
+
+
+def run(capsys, *argv):
+    code = main(list(argv))
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def run_json(capsys, *argv):
+    code, out, err = run(capsys, *argv, '--json')
+    assert code == 0, err
+    return json.loads(out)
+
+
+def test_list_and_search(storage, capsys):
+    tasks = run_json(capsys, 'list', storage)
+    assert [task['id'] for task in tasks] == [2, 3, 1]
+    tasks = run_json(capsys, 'list', storage, '--category', 'Работа',
+                     '--sort=-priority,id', '--limit', '1')
+    assert [task['id'] for task in tasks] == [2]
+    tasks = run_json(capsys, 'list', storage, '--due-from', '2024-12-02')
+    assert [task['id'] for task in tasks] == [3, 1]
+    tasks = run_json(capsys, 'search', storage, 'ОТЧЕТ')
+    assert [task['title'] for task in tasks] == ['Отчет']
+    code, out, _ = run(capsys, 'list', storage, '--status', 'Выполнена')
+    assert (code, out) == (0, 'Задачи не найдены\n')
+    code, _, err = run(capsys, 'list', storage, '--sort', 'title')
+    assert (code, err) == (1, "Неизвестный ключ сортировки 'title'\n")
+    code, out, _ = run(capsys, 'list', storage)
+    assert out.splitlines()[3].startswith('|  2 | Отчет')
+
+
+def test_changes(storage, capsys):
+    task = run_json(capsys, 'add', storage, 'Врач', 'Записаться',
+                    'Здоровье', '2024-11-30', 'Средний')
+    assert task['id'] == 4
+    assert run_json(capsys, 'done', storage, '1', '4') == {'ids': [1, 4]}
+    code, out, _ = run(capsys, 'delete', storage, '2')
+    assert (code, out) == (0, 'Удалено задач: 1\n')
+    tasks = run_json(capsys, 'list', storage, '--status', 'Выполнена')
+    assert [task['id'] for task in tasks] == [4, 1]
+    assert run_json(capsys, 'stats', storage)['total'] == 3
+    code, _, err = run(capsys, 'done', storage, '1', '10')
+    assert (code, err) == (1, 'Задачи не найдены: 10\n')
+    code, _, err = run(capsys, 'add', storage, 'A', 'B', 'C', '2024-02-30',
+                       'Низкий')
+    assert code == 1 and 'ГГГГ-ММ-ДД' in err
+
+
+def test_stats(tmp_path):
+    manager = TaskManager('')
+    for task in TASKS:
+        manager.add_task(*task)
+    manager.get_task(2).status = 'Выполнена'
+    stats = task_stats(manager.tasks, today=date(2024, 12, 3))
+    assert stats == {
+        'total': 3, 'overdue': 1,
+        'categories': {'Работа': 2, 'Дом': 1},
+        'statuses': {'Не выполнена': 2, 'Выполнена': 1},
+        'priorities': {'Низкий': 1, 'Средний': 1, 'Высокий': 1}}
+
+
+def test_read_tasks_errors(tmp_path):
+    file_name = tmp_path / 'tasks.json'
+    assert read_tasks(str(file_name)) == []
+    file_name.write_text('[{"id": 1}')
+    with pytest.raises(TaskFileError, match='позиция 1'):
+        read_tasks(str(file_name))
+    file_name.write_text('[{"id": 1, "title": "A"}]')
+    with pytest.raises(ValueError, match='№1'):
+        read_tasks(str(file_name))
+    # Задачу без статуса, как и менеджер задач, команды не принимают.
+    file_name.write_text(json.dumps([{
+        'id': 1, 'title': 'A', 'description': 'B', 'category': 'C',
+        'due_date': '2024-12-01', 'priority': 'Низкий', 'status': ''}]))
+    with pytest.raises(TaskFileError, match='№1'):
+        read_tasks(str(file_name))
+    assert TaskManager(str(file_name)).load_error is not None
+    assert main(['list', str(file_name)]) == 1
+
+
+def test_file_errors(tmp_path, capsys):
+    assert main(['list', str(tmp_path)]) == 1
+    assert 'Ошибка работы с файлом задач' in capsys.readouterr().err
+    missing = str(tmp_path / 'нет' / 'tasks.json')
+    assert main(['add', missing, 'A', 'B', 'C', '2024-12-01', 'Низкий']) == 1
+    assert 'Ошибка работы с файлом задач' in capsys.readouterr().err
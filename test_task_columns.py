@@ -0,0 +1,105 @@
+import pytest
+import task_columns
+from task_manager import TaskManager
+
+TASKS = [
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+    ('Врач', 'Записаться к врачу', 'Здоровье', '2024-12-01', 'Средний'),
+]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def managers(request, tmp_path, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(task_columns, 'numpy', None)
+    elif task_columns.numpy is None:
+        pytest.skip('NumPy не установлен')
+    file_name = str(tmp_path / 'tasks.json')
+    memory = TaskManager(file_name)
+    columnar = TaskManager(file_name, columnar=True)
+    for manager in (memory, columnar):
+        for task in TASKS:
+            manager.add_task(*task)
+    return memory, columnar
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+def test_queries_match_memory_store(managers):
+    memory, columnar = managers
+    assert columnar.get_categories() == memory.get_categories()
+    assert ids(columnar.get_tasks()) == ids(memory.get_tasks())
+    assert ids(columnar.get_tasks('Работа')) == ids(memory.get_tasks('Работа'))
+    assert columnar.get_tasks('Нет такой') == []
+    assert (ids(columnar.get_tasks_by_keyword('ОТЧЕТ'))
+            == ids(memory.get_tasks_by_keyword('ОТЧЕТ')))
+    assert ids(columnar.search_tasks('позв клиент')) == [3]
+
+
+def test_edit_through_task(managers):
+    memory, columnar = managers
+    for manager in (memory, columnar):
+        task = manager.get_task(1)
+        task.status = 'Выполнена'
+        task.category = 'Работа'
+        task.due_date = '2024-11-30'
+        task.title = 'Купить хлеб'
+    assert ids(columnar.get_tasks_by_status('Выполнена')) == [1]
+    assert ids(columnar.get_tasks('Работа')) == ids(memory.get_tasks('Работа'))
+    assert columnar.get_categories() == ['Работа', 'Здоровье']
+    assert columnar.get_tasks_by_keyword('хлеб')[0].title == 'Купить хлеб'
+
+
+def test_tasks_created_lazily(managers):
+    _, columnar = managers
+    task = columnar.get_task(2)
+    assert columnar.get_task(2) is task
+    assert columnar.get_tasks('Работа')[0] is task
+    assert columnar.get_task(42) is None
+
+
+def test_delete(managers):
+    _, columnar = managers
+    task = columnar.get_task(1)
+    columnar.delete_task(task)
+    columnar.delete_task('Работа')
+    assert ids(columnar.tasks) == [4]
+    assert columnar.get_categories() == ['Здоровье']
+    assert columnar.size == 1
+    columnar.add_task('Новая', 'Описание', 'Дом', '2024-12-05', 'Низкий')
+    assert ids(columnar.get_tasks()) == [4, 5]
+    with pytest.raises(ValueError):
+        columnar.delete_task(task)
+
+
+def test_save_and_load(managers, tmp_path):
+    _, columnar = managers
+    file_name = str(tmp_path / 'columns.json')
+    columnar.save_tasks(file_name)
+    loaded = TaskManager(file_name, columnar=True)
+    assert ([task.to_dict() for task in loaded.tasks]
+            == [task.to_dict() for task in columnar.tasks])
+
+
+def test_urgency_queries(managers):
+    memory, columnar = managers
+    for manager in (memory, columnar):
+        manager.get_task(2).status = 'Выполнена'
+        manager.get_task(1).priority = 'Высокий'
+    assert ids(columnar.next_due(2)) == ids(memory.next_due(2)) == [4, 3]
+    assert ids(columnar.overdue('2024-12-04')) == [4, 3, 1]
+    assert (ids(columnar.due_between('2024-12-02', '2024-12-03'))
+            == ids(memory.due_between('2024-12-02', '2024-12-03')))
+    assert columnar.next_due(0) == []
+    # Объекты Task создаются только для возвращаемых задач.
+    lazy = TaskManager('', columnar=True, cache=False)
+    lazy.add_tasks_bulk([dict(zip(('title', 'description', 'category',
+                                   'due_date', 'priority'), task))
+                         for task in TASKS])
+    assert len(lazy._store._cache) == 0
+    first = lazy.next_due(1)
+    assert ids(first) == [2] and len(lazy._store._cache) == 1
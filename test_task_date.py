@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from datetime import date, datetime, timedelta
+
+from task import Task
+from task_cli import main
+from task_date import is_date, parse_date
+from task_io import input_date
+from task_manager import TaskManager
+
+
+def test_matches_strptime():
+    day = date(1999, 12, 25)
+    for _ in range(800):
+        value = day.isoformat()
+        text, ordinal = parse_date(value)
+        assert text == value
+        assert ordinal == datetime.strptime(value, '%Y-%m-%d').toordinal()
+        day += timedelta(days=3)
+
+
+@pytest.mark.parametrize('value', ['2024-02-30', '2024-13-01', '20241201',
+                                   '2024-W01-1', '2024-01-01T00:00', '',
+                                   '2024-01-1 ', '01-12-2024', '2024/12/01',
+                                   '2024-1-5', '2024-01-5', ' 2024-1-05',
+                                   '２０２４-01-01', '+024-01-01'])
+def test_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_date(value)
+    assert not is_date(value)
+    with pytest.raises(ValueError, match='ГГГГ-ММ-ДД'):
+        Task(1, 'Задача', 'Описание', 'Дом', value, 'Низкий')
+
+
+def test_memo_shares_strings():
+    parse_date.cache_clear()
+    first = Task(1, 'Задача', 'Описание', 'Дом', '2024-12-01', 'Низкий')
+    value = ''.join(['2024-12-', '01'])
+    second = Task(2, 'Задача', 'Описание', 'Дом', value, 'Низкий')
+    assert second.due_date is first.due_date
+    assert second.due_ordinal == date(2024, 12, 1).toordinal()
+    info = parse_date.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert not is_date(None)
+
+
+def test_input_date(monkeypatch, capsys):
+    answers = iter(['2024-02-30', 'завтра', '2024-02-29'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    assert input_date('Дата: ') == '2024-02-29'
+    assert capsys.readouterr().out.count('Некорректная дата') == 2
+
+
+def test_loads_unpadded_dates(tmp_path):
+    # Файл прежней версии: сеттер принимал даты без ведущих нулей.
+    file_name = tmp_path / 'old.json'
+    file_name.write_text(json.dumps([
+        {'id': 1, 'title': 'Задача', 'description': 'Описание',
+         'category': 'Дом', 'due_date': '2024-1-5', 'priority': 'Низкий',
+         'status': 'Не выполнена'}], ensure_ascii=False))
+    manager = TaskManager(str(file_name))
+    assert manager.load_error is None
+    [task] = manager.get_tasks()
+    assert task.due_date == '2024-01-05'
+    assert task.due_ordinal == date(2024, 1, 5).toordinal()
+    assert main(['list', str(file_name)]) == 0
+    # Ввод по-прежнему проверяется строго.
+    with pytest.raises(ValueError):
+        task.due_date = '2024-1-6'
@@ -0,0 +1,72 @@
+import pytest
+from task import Task
+from task_index import SortedTaskList, due_date_key, urgency_key
+
+
+def make_task(task_id, due_date):
+    return Task(task_id, 'Title', 'Desc', 'Work', due_date, 'Средний')
+
+
+def test_sorted_on_creation():
+    tasks = [make_task(1, '2024-12-03'), make_task(2, '2024-12-01'),
+             make_task(3, '2024-12-03')]
+    index = SortedTaskList(tasks)
+    assert [task.id for task in index] == [2, 1, 3]
+
+
+def test_add_keeps_order():
+    index = SortedTaskList()
+    for task_id, due_date in ((1, '2024-12-02'), (2, '2024-12-01'),
+                              (3, '2024-12-02')):
+        index.add(make_task(task_id, due_date))
+    assert [task.id for task in index] == [2, 1, 3]
+    assert len(index) == 3
+
+
+def test_remove():
+    task = make_task(1, '2024-12-01')
+    index = SortedTaskList([task, make_task(2, '2024-12-02')])
+    index.remove(task)
+    assert [t.id for t in index] == [2]
+    with pytest.raises(ValueError):
+        index.remove(task)
+
+
+def test_remove_with_old_key():
+    task = make_task(1, '2024-12-01')
+    index = SortedTaskList([task])
+    task.due_date = '2025-01-01'
+    index.remove(task, due_date_key(task, '2024-12-01'))
+    assert len(index) == 0
+
+
+def test_remove_if():
+    index = SortedTaskList(make_task(i, '2024-12-0%d' % i)
+                           for i in range(1, 5))
+    index.remove_if(lambda task: task.id % 2 == 0)
+    assert [task.id for task in index] == [1, 3]
+
+
+def test_between():
+    index = SortedTaskList([make_task(i, f'2024-12-0{i}')
+                            for i in range(1, 6)])
+    start, end = make_task(0, '2024-12-02'), make_task(0, '2024-12-04')
+    assert [task.id for task in index.between(start.due_ordinal,
+                                              end.due_ordinal)] == [2, 3, 4]
+    assert index.count_between(None, start.due_ordinal) == 2
+    assert index.count_between(end.due_ordinal, start.due_ordinal) == 0
+    assert [task.id for task in index.between(end.due_ordinal, None)] == [4, 5]
+
+
+def test_urgency_key():
+    tasks = [Task(1, 'T', 'D', 'Work', '2024-12-02', 'Низкий'),
+             Task(2, 'T', 'D', 'Work', '2024-12-02', 'Высокий'),
+             Task(3, 'T', 'D', 'Work', '2024-12-01', 'Низкий')]
+    index = SortedTaskList(tasks, key=urgency_key)
+    assert [task.id for task in index.head(2)] == [3, 2]
+    old_key = urgency_key(tasks[0])
+    tasks[0].priority = 'Высокий'
+    index.remove(tasks[0], old_key)
+    index.add(tasks[0])
+    assert [task.id for task in index] == [3, 1, 2]
+    assert urgency_key(tasks[0], priority='Низкий') == old_key
@@ -0,0 +1,88 @@
+import json
+import os
+
+import pytest
+from task_journal import TaskJournal
+from task_json import write_tasks
+from task_manager import TaskManager
+
+
+@pytest.fixture
+def storage_file(tmp_path):
+    return str(tmp_path / 'tasks.json')
+
+
+def fill(manager):
+    manager.add_task('Task 1', 'Description 1', 'Work',
+                     '2024-12-02', 'Высокий')
+    manager.add_task('Task 2', 'Description 2', 'Home',
+                     '2024-12-01', 'Средний')
+    manager.add_task('Task 3', 'Description 3', 'Home',
+                     '2024-12-03', 'Низкий')
+    manager.get_task(1).status = 'Выполнена'
+    manager.get_task(2).due_date = '2024-12-05'
+    manager.delete_task(manager.get_task(3))
+
+
+def dump(manager):
+    return [task.to_dict() for task in manager.get_tasks()]
+
+
+def test_journal_replayed_without_save(storage_file):
+    manager = TaskManager(storage_file, journal=True)
+    fill(manager)
+    manager.close()
+    assert not os.path.exists(storage_file)
+    reloaded = TaskManager(storage_file, journal=True)
+    assert dump(reloaded) == dump(manager)
+    assert reloaded.task_id == 3
+    reloaded.delete_task('Home')
+    assert [task.id for task in TaskManager(storage_file,
+                                            journal=True).tasks] == [1]
+
+
+def test_save_compacts_journal(storage_file):
+    manager = TaskManager(storage_file, journal=True)
+    fill(manager)
+    manager.save_tasks(storage_file)
+    assert os.path.getsize(storage_file + '.journal') == 0
+    with open(storage_file) as file:
+        assert len(json.load(file)) == 2
+    assert dump(TaskManager(storage_file, journal=True)) == dump(manager)
+
+
+def test_automatic_compaction(storage_file, monkeypatch):
+    monkeypatch.setattr(TaskJournal, 'MIN_SIZE', 0)
+    manager = TaskManager(storage_file, journal=True)
+    fill(manager)
+    assert os.path.exists(storage_file)
+    assert dump(TaskManager(storage_file, journal=True)) == dump(manager)
+
+
+def test_torn_record_is_dropped(storage_file):
+    manager = TaskManager(storage_file, journal=True)
+    fill(manager)
+    manager.close()
+    size = os.path.getsize(storage_file + '.journal')
+    with open(storage_file + '.journal', 'ab') as file:
+        file.write(b'{"op": "delete", "ids": [')
+    reloaded = TaskManager(storage_file, journal=True)
+    assert reloaded.load_error is None
+    assert dump(reloaded) == dump(manager)
+    assert os.path.getsize(storage_file + '.journal') == size
+
+
+def test_replay_over_newer_snapshot(storage_file):
+    manager = TaskManager(storage_file, journal=True)
+    fill(manager)
+    write_tasks(storage_file, manager.tasks)
+    assert dump(TaskManager(storage_file, journal=True)) == dump(manager)
+
+
+def test_corrupt_journal_disables_journaling(storage_file):
+    with open(storage_file + '.journal', 'w') as file:
+        file.write('not json\n')
+    manager = TaskManager(storage_file, journal=True)
+    assert manager.load_error.offset == 0
+    manager.add_task('Task', 'Description', 'Work', '2024-12-01', 'Низкий')
+    assert os.path.getsize(storage_file + '.journal') == 9
@@ -0,0 +1,72 @@
+import io
+import json
+
+import pytest
+from task_json import (TaskFileError, iter_json_array, iter_tasks, open_tasks,
+                       write_records)
+
+TASK = {
+    'id': 1,
+    'title': 'Задача',
+    'description': 'Описание',
+    'category': 'Work',
+    'due_date': '2024-12-01',
+    'priority': 'Высокий',
+    'status': 'Не выполнена'
+}
+
+
+def test_iter_json_array_small_chunks():
+    data = [TASK, {'nested': [1, 2, {'a': 'b'}]}, [], 'строка', 12345]
+    text = ' \n' + json.dumps(data, indent=2, ensure_ascii=False)
+    items = list(iter_json_array(io.StringIO(text), chunk_size=3))
+    assert [value for _, value in items] == data
+    decoder = json.JSONDecoder()
+    for offset, value in items:
+        assert decoder.raw_decode(text, offset)[0] == value
+
+
+@pytest.mark.parametrize('text', ['', '  \n', '[]', '[ ]'])
+def test_iter_json_array_empty(text):
+    assert list(iter_json_array(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize('text, offset', [
+    ('{"id": 1}', 0),
+    ('[{"id": 1}, {"id": ', 12),
+    ('[{"id": 1} {"id": 2}]', 11),
+    ('[{"id": 1}] x', 12),
+])
+def test_iter_json_array_corrupt(text, offset):
+    with pytest.raises(TaskFileError) as info:
+        list(iter_json_array(io.StringIO(text), chunk_size=4))
+    assert info.value.offset == offset
+
+
+def test_iter_tasks_reports_bad_record():
+    bad = dict(TASK, id=2, due_date='2024-13-01')
+    text = json.dumps([TASK, bad])
+    tasks = iter_tasks(io.StringIO(text))
+    assert next(tasks).id == 1
+    with pytest.raises(TaskFileError) as info:
+        next(tasks)
+    assert info.value.index == 2
+    assert text[info.value.offset:].startswith('{"id": 2')
+
+
+@pytest.mark.parametrize('extension, magic', [
+    ('.json', b'['),
+    ('.json.gz', b'\x1f\x8b'),
+    ('.json.bz2', b'BZh'),
+    ('.json.xz', b'\xfd7zXZ'),
+])
+def test_compressed_round_trip(tmp_path, extension, magic):
+    file_name = str(tmp_path / f'tasks{extension}')
+    records = [dict(TASK, id=i) for i in range(1, 1001)]
+    write_records(file_name, iter(records))
+    with open(file_name, 'rb') as file:
+        assert file.read(len(magic)) == magic
+    with open_tasks(file_name) as file:
+        tasks = list(iter_tasks(file))
+    assert [task.to_dict() for task in tasks] == records
+    assert list(tmp_path.iterdir()) == [tmp_path / f'tasks{extension}']
@@ -135,3 +135,210 @@ def test_load_tasks(setup_temp_file):
     task = manager.tasks[0]
     assert task.title == 'Task 1'
     assert task.id == 1
+
+
+def test_indexes_follow_task_setters(setup_task_manager):
+    manager = setup_task_manager
+    manager.add_task('Task 1', 'Description 1', 'Work',
+                     '2024-12-01', 'Высокий')
+    manager.add_task('Task 2', 'Description 2', 'Work',
+                     '2024-12-02', 'Средний')
+    task = manager.tasks[0]
+    task.category = 'Personal'
+    task.status = 'Выполнена'
+    task.due_date = '2024-12-03'
+    assert [t.title for t in manager.get_tasks('Work')] == ['Task 2']
+    assert manager.get_tasks('Personal') == [task]
+    assert manager.get_tasks_by_status('Выполнена') == [task]
+    assert [t.title for t in manager.get_tasks()] == ['Task 2', 'Task 1']
+    task.category = 'Work'
+    assert sorted(manager.get_categories()) == ['Work']
+
+
+def test_deleted_task_leaves_indexes(setup_task_manager):
+    manager = setup_task_manager
+    manager.add_task('Task 1', 'Description 1', 'Work',
+                     '2024-12-01', 'Высокий')
+    manager.add_task('Task 2', 'Description 2', 'Personal',
+                     '2024-12-02', 'Средний')
+    task = manager.tasks[0]
+    manager.delete_task(task)
+    task.status = 'Выполнена'
+    assert manager.get_tasks_by_status('Выполнена') == []
+    manager.delete_task('Personal')
+    assert manager.get_tasks() == []
+    assert manager.get_categories() == []
+    assert manager.get_tasks_by_status('Не выполнена') == []
+
+
+def test_get_task(setup_task_manager):
+    manager = setup_task_manager
+    manager.add_task('Task 1', 'Description 1', 'Work',
+                     '2024-12-01', 'Высокий')
+    assert manager.get_task(1) is manager.tasks[0]
+    assert manager.get_task(2) is None
+
+
+def test_delete_tasks(setup_task_manager):
+    manager = setup_task_manager
+    for i in range(1, 6):
+        manager.add_task(f'Task {i}', 'Description', 'Work',
+                         f'2024-12-0{6 - i}', 'Высокий')
+    manager.delete_tasks([2, 4, 42])
+    assert [task.id for task in manager.tasks] == [1, 3, 5]
+    assert [task.id for task in manager.get_tasks()] == [5, 3, 1]
+    assert [task.id for task in manager.get_tasks('Work')] == [5, 3, 1]
+    assert manager.get_task(2) is None
+
+
+def test_text_index_matches_scan(setup_temp_file):
+    indexed = TaskManager(setup_temp_file, text_index=True)
+    scanned = TaskManager(setup_temp_file)
+    for manager in (indexed, scanned):
+        manager.add_task('Купить молоко', 'В магазине у дома', 'Дом',
+                         '2024-12-02', 'Средний')
+        manager.add_task('Another Task', 'Some description', 'Work',
+                         '2024-12-01', 'Высокий')
+        manager.add_task('Task 3', 'Позвонить в магазин', 'Work',
+                         '2024-12-03', 'Низкий')
+        manager.tasks[2].title = 'Молоко и хлеб'
+    for keyword in ('молоко', 'МАГАЗ', 'task', 'her ta', 'e d', ' ', 'хлеб'):
+        assert ([task.id for task in indexed.get_tasks_by_keyword(keyword)]
+                == [task.id for task in scanned.get_tasks_by_keyword(keyword)])
+    for query in ('молок', 'магазин молоко', 'купить'):
+        assert ([task.id for task in indexed.search_tasks(query)]
+                == [task.id for task in scanned.search_tasks(query)])
+    indexed.delete_task('Дом')
+    assert [task.id for task in indexed.search_tasks('молоко')] == [3]
+
+
+def test_load_corrupt_file_keeps_loaded_tasks(setup_temp_file):
+    with open(setup_temp_file, 'w') as file:
+        file.write('[{"id": 1, "title": "Task 1", "description": "D", '
+                   '"category": "Work", "due_date": "2024-12-01", '
+                   '"priority": "Высокий", "status": "Не выполнена"}, '
+                   '{"id": 2, "title": ')
+    manager = TaskManager(setup_temp_file)
+    assert [task.id for task in manager.tasks] == [1]
+    assert manager.load_error.index == 2
+    assert manager.task_id == 2
+
+
+def test_load_progress(setup_task_manager, setup_temp_file, monkeypatch):
+    manager = setup_task_manager
+    for i in range(10):
+        manager.add_task(f'Task {i}', 'Description', 'Work',
+                         f'2024-12-{i + 10}', 'Средний')
+    manager.save_tasks(setup_temp_file)
+    monkeypatch.setattr(TaskManager, 'LOAD_BATCH_SIZE', 2)
+    sizes = []
+    loaded = TaskManager(setup_temp_file,
+                         on_progress=lambda m: sizes.append(m.size))
+    assert sizes == [2, 6]
+    assert loaded.size == 10
+    assert loaded.load_error is None
+    assert ([task.id for task in loaded.get_tasks()]
+            == [task.id for task in manager.get_tasks()])
+
+
+@pytest.mark.parametrize('options', [{}, {'columnar': True}, {'db': True}])
+def test_group_by(tmp_path, options):
+    if options.pop('db', False):
+        manager = TaskManager(str(tmp_path / 'tasks.db'))
+    else:
+        manager = TaskManager(str(tmp_path / 'tasks.json'), **options)
+    manager.add_task('Task 1', 'D', 'Work', '2024-12-03', 'Высокий')
+    manager.add_task('Task 2', 'D', 'Home', '2024-12-01', 'Низкий')
+    manager.add_task('Task 3', 'D', 'Work', '2024-12-02', 'Низкий')
+    manager.get_task(3).status = 'Выполнена'
+
+    def ids(groups):
+        return {key: [task.id for task in tasks]
+                for key, tasks in groups.items()}
+
+    assert list(manager.group_by('category')) == ['Work', 'Home']
+    assert ids(manager.group_by('category')) == {'Work': [3, 1],
+                                                 'Home': [2]}
+    assert list(manager.group_by('priority')) == ['Низкий', 'Высокий']
+    assert ids(manager.group_by('priority')) == {'Низкий': [2, 3],
+                                                 'Высокий': [1]}
+    assert list(manager.group_by('status')) == ['Не выполнена', 'Выполнена']
+    assert ids(manager.group_by('status'))['Выполнена'] == [3]
+    with pytest.raises(ValueError):
+        manager.group_by('title')
+    manager.close()
+
+
+@pytest.mark.parametrize('options', [{}, {'columnar': True}, {'db': True}])
+def test_urgent_tasks(tmp_path, options):
+    if options.pop('db', False):
+        manager = TaskManager(str(tmp_path / 'tasks.db'))
+    else:
+        manager = TaskManager(str(tmp_path / 'tasks.json'), **options)
+    manager.add_task('Task 1', 'D', 'Work', '2024-12-03', 'Низкий')
+    manager.add_task('Task 2', 'D', 'Home', '2024-12-03', 'Высокий')
+    manager.add_task('Task 3', 'D', 'Work', '2024-12-01', 'Средний')
+    manager.add_task('Task 4', 'D', 'Work', '2024-12-05', 'Высокий')
+
+    def ids(tasks):
+        return [task.id for task in tasks]
+
+    assert ids(manager.next_due(3)) == [3, 2, 1]
+    assert ids(manager.overdue('2024-12-03')) == [3]
+    assert ids(manager.due_between('2024-12-02', '2024-12-05')) == [2, 1, 4]
+    manager.get_task(3).status = 'Выполнена'
+    manager.get_task(1).priority = 'Высокий'
+    manager.get_task(4).due_date = '2024-12-02'
+    assert ids(manager.next_due(2)) == [4, 1]
+    assert ids(manager.overdue('2024-12-03')) == [4]
+    manager.get_task(3).status = 'Не выполнена'
+    manager.delete_task(manager.get_task(1))
+    assert ids(manager.next_due(10)) == [3, 4, 2]
+    assert manager.next_due(0) == []
+    assert ids(manager.overdue('2100-01-01')) == [3, 4, 2]
+    manager.close()
+
+
+def test_subscribe_and_batch(setup_task_manager):
+    manager = setup_task_manager
+    manager.add_task('Task 1', 'D', 'Work', '2024-12-01', 'Низкий')
+    manager.add_task('Task 2', 'D', 'Work', '2024-12-02', 'Низкий')
+    task = manager.get_task(1)
+    received = []
+    unsubscribe = manager.subscribe(received.append)
+    task.status = 'Выполнена'
+    assert [(c.task, c.field, c.old, c.new) for c in received[0]] == [
+        (task, 'status', 'Не выполнена', 'Выполнена')]
+    received.clear()
+    with manager.batch():
+        task.priority = 'Средний'
+        with manager.batch():
+            task.priority = 'Высокий'
+            task.title = 'Новое'
+            task.title = 'Task 1'
+        manager.get_task(2).category = 'Home'
+        assert received == []
+        assert [t.id for t in manager.get_tasks('Home')] == [2]
+    assert len(received) == 1
+    assert [(c.task.id, c.field, c.old, c.new) for c in received[0]] == [
+        (1, 'priority', 'Низкий', 'Высокий'), (2, 'category', 'Work', 'Home')]
+    unsubscribe()
+    task.title = 'Другое'
+    assert len(received) == 1
+
+
+@pytest.mark.parametrize('extension', ['.json.gz', '.json.bz2', '.json.xz'])
+def test_compressed_storage_file(tmp_path, extension):
+    file_name = str(tmp_path / f'tasks{extension}')
+    manager = TaskManager(file_name)
+    manager.add_task('Task 1', 'D', 'Work', '2024-12-01', 'Низкий')
+    manager.add_task('Task 2', 'D', 'Home', '2024-12-02', 'Высокий')
+    manager.save_tasks(file_name)
+    reopened = TaskManager(file_name)
+    assert reopened.load_error is None
+    assert [task.to_dict() for task in reopened.tasks] == [
+        task.to_dict() for task in manager.tasks]
+    reopened.start_autosave()
+    reopened.get_task(2).title = 'Новое'
+    assert reopened.close()
+    assert TaskManager(file_name).get_task(2).title == 'Новое'
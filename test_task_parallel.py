@@ -0,0 +1,80 @@
+import pytest
+from task_manager import TaskManager
+from task_parallel import ParallelSearcher
+
+TASKS = [
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный ОТЧЕТ', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту по отчету', 'Работа', '2024-12-02',
+     'Средний'),
+    ('Ремонт', 'Вызвать мастера', 'Дом', '2024-12-01', 'Низкий'),
+]
+KEYWORDS = ['отчет', 'ОТЧ', 'о', 'молоко в', 'ить', 'нет такого', 'т\0о', '']
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+def make_manager(parallel, **options):
+    manager = TaskManager('', parallel=parallel, **options)
+    for i in range(5):
+        for task in TASKS:
+            manager.add_task(*task)
+    return manager
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_searcher_matches_store(workers):
+    manager = make_manager(False)
+    searcher = ParallelSearcher(workers)
+    with pytest.raises(ValueError, match='не построен'):
+        searcher.search('отчет')
+    searcher.build(manager._store.by_category())
+    for keyword in KEYWORDS:
+        if '\0' in keyword:
+            with pytest.raises(ValueError):
+                searcher.search(keyword)
+        else:
+            assert ids(searcher.search(keyword)) == ids(
+                manager.get_tasks_by_keyword(keyword)), keyword
+    searcher.close()
+
+
+def test_manager_rebuilds_after_changes():
+    manager = make_manager(True)
+    serial = make_manager(False)
+    for keyword in KEYWORDS:
+        assert ids(manager.get_tasks_by_keyword(keyword)) == ids(
+            serial.get_tasks_by_keyword(keyword))
+    for changed in (manager, serial):
+        changed.get_task(1).title = 'Отчет о покупках'
+        changed.delete_task(changed.get_task(2))
+        changed.add_tasks_bulk([{'title': 'Новый отчет',
+                                 'description': 'Итоги',
+                                 'category': 'Работа',
+                                 'due_date': '2024-11-30',
+                                 'priority': 'Низкий'}])
+    assert ids(manager.get_tasks_by_keyword('отчет')) == ids(
+        serial.get_tasks_by_keyword('отчет'))
+    assert manager._searcher.generation == manager.generation
+    manager.close()
+    assert manager._searcher is None
+
+
+def test_automatic_mode(monkeypatch):
+    # Без кэша повторный поиск выполняется заново.
+    manager = make_manager(None, cache=False)
+    manager.get_tasks_by_keyword('отчет')
+    assert manager._searcher is None
+    monkeypatch.setattr(TaskManager, 'PARALLEL_THRESHOLD', 10)
+    expected = ids(manager.get_tasks_by_keyword('отчет'))
+    # Первый поиск после изменения выполняется в хранилище.
+    assert manager._searcher.generation is None
+    assert ids(manager.get_tasks_by_keyword('отчет')) == expected
+    assert manager._searcher.generation == manager.generation
+    manager.get_task(3).status = 'Выполнена'
+    manager.get_tasks_by_keyword('отчет')
+    assert manager._searcher.generation != manager.generation
+    manager.close()
+    assert TaskManager('', text_index=True, parallel=True)._parallel is False
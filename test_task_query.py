@@ -0,0 +1,84 @@
+import pytest
+from task_manager import TaskManager
+from task_query import Query
+
+TASKS = [
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-05', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+    ('Врач', 'Записаться к врачу', 'Здоровье', '2024-12-01', 'Средний'),
+    ('Отчет о поездке', 'Для бухгалтерии', 'Работа', '2024-12-03', 'Низкий'),
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-04', 'Высокий'),
+]
+
+
+@pytest.fixture(params=['memory', 'columnar', 'sqlite'])
+def manager(request, tmp_path):
+    if request.param == 'sqlite':
+        manager = TaskManager(str(tmp_path / 'tasks.db'))
+    else:
+        manager = TaskManager(str(tmp_path / 'tasks.json'),
+                              columnar=request.param == 'columnar')
+    for task in TASKS:
+        manager.add_task(*task)
+    manager.get_task(2).status = 'Выполнена'
+    yield manager
+    manager.close()
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+def test_combined_criteria(manager):
+    query = (Query().where(category='Работа', status='Не выполнена')
+             .due_between(end='2024-12-04').keyword('ОТЧЕТ'))
+    assert ids(manager.query(query)) == [4]
+    assert ids(manager.query(Query().where(priority='Средний'))) == [3, 2]
+    assert ids(manager.query(Query().where(id=5))) == [5]
+    assert manager.query(Query().where(id=42)) == []
+    assert manager.query(Query().where(category='Нет такой')) == []
+    assert ids(manager.query(Query().due_between('2024-12-02', '2024-12-03')
+                             .due_between(start='2024-12-03'))) == [4]
+    assert ids(manager.query(
+        Query().filter(lambda task: len(task.title) > 6))) == [2, 4, 5]
+
+
+def test_order_limit_offset(manager):
+    assert (ids(manager.query(Query().order_by('-priority', 'due_date')))
+            == [5, 1, 3, 2, 4])
+    assert ids(manager.query(Query().order_by('-id').limit(2))) == [5, 4]
+    assert ids(manager.query(Query().order_by('-id').limit(2)
+                             .offset(1))) == [4, 3]
+    assert ids(manager.query(Query().limit(3).offset(1))) == [2, 4, 5]
+    assert ids(manager.query(Query().order_by('priority'))) == [4, 2, 3, 1, 5]
+
+
+def test_plan_uses_most_selective_index(tmp_path):
+    manager = TaskManager(str(tmp_path / 'tasks.json'))
+    for task in TASKS:
+        manager.add_task(*task)
+    store = manager._store
+    query = Query().where(category='Работа', status='Не выполнена')
+    assert query.plan(store)[0] == 'category'
+    for task_id in (1, 3, 4, 5):
+        manager.get_task(task_id).status = 'Выполнена'
+    assert query.plan(store)[0] == 'status'
+    assert query.due_between('2024-12-05').plan(store)[0] == 'due_date'
+    assert Query().keyword('отчет').plan(store)[0] == 'keyword'
+    assert Query().plan(store)[0] == 'scan'
+
+
+def test_lazy_evaluation(manager):
+    checked = []
+    query = Query().filter(lambda task: checked.append(task.id) or True)
+    assert ids(query.limit(2).run(manager._store)) == [3, 2]
+    assert checked == [3, 2]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        Query().where(owner='Я')
+    with pytest.raises(ValueError):
+        Query().order_by('title')
+    with pytest.raises(ValueError):
+        Query().due_between('01.12.2024')
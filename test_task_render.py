@@ -0,0 +1,74 @@
+from itertools import count
+
+import pytest
+from task import Task
+from task_manager import TaskManager
+from task_render import MAX_WIDTHS, Pager, render_table, task_row
+
+
+def test_render_table_layout():
+    task = Task(1, 'Купить молоко', 'В магазине', 'Дом',
+                '2024-12-01', 'Низкий')
+    lines = list(render_table([task_row(task)]))
+    assert len(lines) == 5
+    assert lines[0] == lines[4]
+    assert lines[2] == lines[0].replace('-', '=')
+    assert len({len(line) for line in lines}) == 1
+    assert lines[3].startswith('|  1 | Купить молоко | В магазине |')
+
+
+def test_long_cells_truncated():
+    row = ('1', 'Н' * 100, 'О\nписание', 'Дом', '2024-12-01',
+           'Низкий', 'Выполнена')
+    line = list(render_table([row]))[3]
+    assert 'Н' * (MAX_WIDTHS[1] - 1) + '…' in line
+    assert 'О писание' in line
+
+
+def test_render_table_is_lazy():
+    rows = ((str(i),) * 7 for i in count())
+    lines = render_table(rows)
+    assert len([next(lines) for _ in range(5)]) == 5
+
+
+def test_pager_reads_only_needed_items():
+    read = []
+    pager = Pager((read.append(i) or i for i in count()), page_size=10)
+    assert pager.items() == list(range(10))
+    assert pager.has_next()
+    assert pager.page_count is None
+    assert len(read) == 11
+    pager.jump(3)
+    assert pager.items()[0] == 20
+    assert len(read) == 30
+
+
+def test_pager_navigation():
+    pager = Pager(range(25), page_size=10)
+    assert not pager.prev()
+    assert pager.next() and pager.next()
+    assert pager.items() == list(range(20, 25))
+    assert not pager.next()
+    assert pager.page_count == 3
+    assert pager.prev()
+    assert pager.items()[0] == 10
+    pager.jump(100)
+    assert pager.page == 2
+    pager.jump(0)
+    assert pager.page == 0
+    empty = Pager([])
+    assert empty.items() == []
+    assert empty.page_count == 1
+    with pytest.raises(ValueError):
+        Pager([], page_size=0)
+
+
+def test_iter_tasks(tmp_path):
+    manager = TaskManager(str(tmp_path / 'tasks.json'))
+    manager.add_task('Отчет', 'Квартальный', 'Работа', '2024-12-02',
+                     'Высокий')
+    manager.add_task('Врач', 'Записаться', 'Здоровье', '2024-12-01',
+                     'Средний')
+    assert [task.id for task in manager.iter_tasks()] == [2, 1]
+    assert [task.id for task in manager.iter_tasks('Работа')] == [1]
+    assert list(manager.iter_tasks('Нет такой')) == []
@@ -0,0 +1,40 @@
+from task import Task
+from task_search import TextIndex, tokenize
+
+
+def make_task(task_id, title, description='Описание'):
+    return Task(task_id, title, description, 'Work', '2024-12-01', 'Средний')
+
+
+def test_tokenize_cyrillic():
+    assert tokenize('Купить МОЛОКО, хлеб!') == {'купить', 'молоко', 'хлеб'}
+
+
+def test_match_and_prefix():
+    index = TextIndex([make_task(1, 'Купить молоко'),
+                       make_task(2, 'Купить хлеб'),
+                       make_task(3, 'Позвонить маме')])
+    assert index.match('купить') == {1, 2}
+    assert index.match('куп мол') == {1}
+    assert index.match('куп', prefix=False) == set()
+    assert index.match('купить чай') == set()
+
+
+def test_candidates():
+    index = TextIndex([make_task(1, 'Another Task'),
+                       make_task(2, 'Task 1')])
+    assert index.candidates('nothe') == {1}
+    assert index.candidates('sk 1') == {2}
+    assert index.candidates('ANOTHER TASK') == {1}
+    assert index.candidates('   ') is None
+
+
+def test_update_and_remove():
+    task = make_task(1, 'Купить молоко')
+    index = TextIndex([task])
+    task.title = 'Купить хлеб'
+    index.update(task, 'Купить молоко', task.description)
+    assert index.match('молоко') == set()
+    assert index.match('хлеб') == {1}
+    index.remove(task)
+    assert index.match('купить') == set()
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from http.client import HTTPConnection
+
+import pytest
+from task_lock import ReadWriteLock
+from task_manager import TaskManager
+from task_server import TaskServer
+
+TASKS = [
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+]
+
+
+@pytest.fixture(params=['tasks.json', 'tasks.db'])
+def server(request, tmp_path):
+    manager = TaskManager(str(tmp_path / request.param))
+    for task in TASKS:
+        manager.add_task(*task)
+    server = TaskServer(('127.0.0.1', 0), manager, workers=4)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+    manager.close()
+
+
+def call(server, method, path, body=None, connection=None):
+    connection = connection or HTTPConnection(*server.server_address[:2])
+    data = None if body is None else json.dumps(body).encode()
+    connection.request(method, path, data,
+                       {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    payload = response.read()
+    return response.status, json.loads(payload) if payload else None
+
+
+def test_read_endpoints(server):
+    status, tasks = call(server, 'GET', '/tasks')
+    assert status == 200
+    assert [task['id'] for task in tasks] == [2, 3, 1]
+    query = ('/tasks?category=%D0%A0%D0%B0%D0%B1%D0%BE%D1%82%D0%B0'
+             '&sort=-priority,id&limit=1')
+    assert [task['id'] for task in call(server, 'GET', query)[1]] == [2]
+    _, tasks = call(server, 'GET', '/tasks?due_from=2024-12-02&offset=1')
+    assert [task['id'] for task in tasks] == [1]
+    assert call(server, 'GET', '/tasks/2')[1]['title'] == 'Отчет'
+    assert sorted(call(server, 'GET', '/categories')[1]) == ['Дом', 'Работа']
+    assert call(server, 'GET', '/tasks/10') == (
+        404, {'error': 'Задача не найдена'})
+    assert call(server, 'GET', '/tasks?sort=title') == (
+        400, {'error': "Неизвестный ключ сортировки 'title'"})
+    assert call(server, 'GET', '/nothing')[0] == 404
+
+
+def test_changes_over_keep_alive(server):
+    connection = HTTPConnection(*server.server_address[:2])
+    status, task = call(server, 'POST', '/tasks', {
+        'title': 'Врач', 'description': 'Записаться',
+        'category': 'Здоровье', 'due_date': '2024-11-30',
+        'priority': 'Средний'}, connection)
+    assert (status, task['id']) == (201, 4)
+    status, task = call(server, 'PATCH', '/tasks/4',
+                        {'status': 'Выполнена', 'priority': 'Высокий'},
+                        connection)
+    assert (status, task['status'], task['priority']) == (
+        200, 'Выполнена', 'Высокий')
+    assert call(server, 'DELETE', '/tasks/1', connection=connection) == (
+        204, None)
+    assert call(server, 'DELETE', '/tasks?category=%D0%A0%D0%B0%D0%B1'
+                '%D0%BE%D1%82%D0%B0', connection=connection) == (204, None)
+    _, tasks = call(server, 'GET', '/tasks', connection=connection)
+    assert [task['id'] for task in tasks] == [4]
+    assert call(server, 'PATCH', '/tasks/4', {'id': 7})[0] == 400
+    assert call(server, 'PATCH', '/tasks/4', {'due_date': '2024-02-30'})[0] \
+        == 400
+    assert call(server, 'POST', '/tasks', {'title': 'A'})[0] == 400
+    assert call(server, 'POST', '/save') == (204, None)
+    manager = server.task_manager
+    assert [task.title for task in TaskManager(manager.storage_file).tasks] \
+        == ['Врач']
+
+
+def test_failed_requests(server, monkeypatch):
+    assert call(server, 'PATCH', '/tasks/1',
+                {'title': 'Новое', 'due_date': 'bad'})[0] == 400
+    assert call(server, 'PATCH', '/tasks/1',
+                {'category': 'Покупки', 'priority': 5})[0] == 400
+    task = call(server, 'GET', '/tasks/1')[1]
+    assert (task['title'], task['category']) == ('Купить молоко', 'Дом')
+
+    def fail(file_name):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(server.task_manager, 'save_tasks', fail)
+    status, result = call(server, 'POST', '/save')
+    assert status == 500 and 'No space left' in result['error']
+
+
+def test_concurrent_clients(server):
+    errors = []
+
+    def client(number):
+        connection = HTTPConnection(*server.server_address[:2])
+        try:
+            for i in range(20):
+                status, _ = call(server, 'POST', '/tasks', {
+                    'title': f'{number}-{i}', 'description': 'Тест',
+                    'category': 'Нагрузка', 'due_date': '2024-12-05',
+                    'priority': 'Низкий'}, connection)
+                assert status == 201
+                assert call(server, 'GET', '/tasks?limit=5',
+                            connection=connection)[0] == 200
+        except AssertionError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    _, tasks = call(server, 'GET', '/tasks?category=%D0%9D%D0%B0%D0%B3'
+                    '%D1%80%D1%83%D0%B7%D0%BA%D0%B0')
+    assert len({task['id'] for task in tasks}) == 120
+
+
+def test_read_write_lock():
+    lock = ReadWriteLock()
+    events = []
+
+    def write():
+        with lock.write():
+            events.append('writer')
+
+    with lock.read():
+        with lock.read():
+            events.append('readers')
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.05)
+        assert events == ['readers']
+    writer.join(1)
+    assert events == ['readers', 'writer']
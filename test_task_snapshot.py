@@ -0,0 +1,108 @@
+import pytest
+from task_manager import TaskManager
+from task_migrate import migrate
+from task_query import Query
+from task_snapshot import SnapshotFile, SnapshotTaskStore, write_snapshot
+
+TASKS = [
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+    ('Врач', 'Записаться к врачу «срочно»', 'Здоровье', '2024-12-01',
+     'Средний'),
+]
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    return str(tmp_path / 'tasks.snapshot')
+
+
+@pytest.fixture
+def managers(tmp_path, snapshot_file):
+    memory = TaskManager(str(tmp_path / 'tasks.json'))
+    for task in TASKS:
+        memory.add_task(*task)
+    memory.get_task(3).status = 'Выполнена'
+    memory.save_tasks(snapshot_file)
+    snapshot = TaskManager(snapshot_file)
+    assert isinstance(snapshot._store, SnapshotTaskStore)
+    yield memory, snapshot
+    snapshot.close()
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+def dump(tasks):
+    return [task.to_dict() for task in tasks]
+
+
+def check_same(memory, snapshot):
+    assert snapshot.size == memory.size
+    assert dump(snapshot.tasks) == dump(memory.tasks)
+    assert snapshot.get_categories() == memory.get_categories()
+    assert dump(snapshot.get_tasks()) == dump(memory.get_tasks())
+    for category in memory.get_categories() + ['Нет такой']:
+        assert (ids(snapshot.get_tasks(category))
+                == ids(memory.get_tasks(category)))
+    for status in ('Не выполнена', 'Выполнена'):
+        assert (ids(snapshot.get_tasks_by_status(status))
+                == ids(memory.get_tasks_by_status(status)))
+    assert ids(snapshot.get_tasks_by_keyword('ОТЧЕТ')) == ids(
+        memory.get_tasks_by_keyword('ОТЧЕТ'))
+    assert ids(snapshot.next_due(3)) == ids(memory.next_due(3))
+    query = Query().due_between('2024-12-01', '2024-12-02')
+    assert ids(snapshot.query(query)) == ids(memory.query(query))
+    assert snapshot.task_id == memory.task_id
+
+
+def test_queries_match_memory_store(managers):
+    memory, snapshot = managers
+    check_same(memory, snapshot)
+    assert snapshot.get_task(2) is snapshot.get_tasks('Работа')[0]
+    assert snapshot.get_task(10) is None
+
+
+def test_changes_overlay_snapshot(managers, snapshot_file):
+    memory, snapshot = managers
+    for manager in (memory, snapshot):
+        task = manager.get_task(1)
+        task.category = 'Работа'
+        task.due_date = '2024-11-30'
+        manager.delete_task(manager.get_task(4))
+        manager.add_task('Новая', 'Задача', 'Учеба', '2024-12-05', 'Низкий')
+    check_same(memory, snapshot)
+    snapshot.save_tasks(snapshot_file)
+    snapshot.close()
+    reopened = TaskManager(snapshot_file)
+    check_same(memory, reopened)
+    reopened.delete_task('Работа')
+    assert ids(reopened.get_tasks()) == [5]
+    reopened.close()
+
+
+def test_snapshot_file(snapshot_file, tmp_path):
+    write_snapshot(snapshot_file, [])
+    empty = SnapshotFile(snapshot_file)
+    assert empty.count == 0
+    assert empty.row_of(1) is None
+    empty.close()
+    other = tmp_path / 'tasks.json'
+    other.write_text('[]')
+    with pytest.raises(ValueError):
+        SnapshotFile(str(other))
+    created = TaskManager(str(tmp_path / 'new.snapshot'))
+    assert created.size == 0
+    with pytest.raises(ValueError):
+        created.start_autosave()
+    created.close()
+
+
+def test_migrate_round_trip(managers, tmp_path, snapshot_file):
+    memory, _ = managers
+    json_file = str(tmp_path / 'copy.json')
+    assert migrate(snapshot_file, json_file) == 4
+    copy = TaskManager(json_file)
+    assert dump(copy.tasks) == dump(memory.tasks)
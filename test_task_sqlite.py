@@ -0,0 +1,93 @@
+import pytest
+from task_manager import TaskManager
+from task_migrate import migrate
+from task_sqlite import SqliteTaskStore
+
+TASKS = [
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+    ('Врач', 'Записаться к врачу', 'Здоровье', '2024-12-01', 'Средний'),
+]
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / 'tasks.db')
+
+
+@pytest.fixture(params=['fts', 'scan'])
+def managers(request, tmp_path, db_file):
+    memory = TaskManager(str(tmp_path / 'tasks.json'))
+    sqlite = TaskManager(db_file)
+    assert isinstance(sqlite._store, SqliteTaskStore)
+    if request.param == 'scan':
+        sqlite._store.fts = False
+    elif not sqlite._store.fts:
+        pytest.skip('SQLite собран без FTS5')
+    for manager in (memory, sqlite):
+        for task in TASKS:
+            manager.add_task(*task)
+    yield memory, sqlite
+    sqlite.close()
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+def dump(tasks):
+    return [task.to_dict() for task in tasks]
+
+
+def test_queries_match_memory_store(managers):
+    memory, sqlite = managers
+    assert sqlite.size == 4
+    assert sqlite.get_categories() == memory.get_categories()
+    assert ids(sqlite.get_tasks()) == ids(memory.get_tasks())
+    assert ids(sqlite.get_tasks('Работа')) == ids(memory.get_tasks('Работа'))
+    assert sqlite.get_tasks('Нет такой') == []
+    assert (ids(sqlite.get_tasks_by_status('Не выполнена'))
+            == ids(memory.get_tasks_by_status('Не выполнена')))
+    for keyword in ('ОТЧЕТ', 'от', 'звон', 'нет такого', ''):
+        assert (ids(sqlite.get_tasks_by_keyword(keyword))
+                == ids(memory.get_tasks_by_keyword(keyword)))
+    assert ids(sqlite.search_tasks('позв клиент')) == [3]
+    assert sqlite.search_tasks('позв клиент', prefix=False) == []
+    assert sqlite.get_task(2) is sqlite.get_tasks('Работа')[0]
+
+
+def test_changes_persisted(managers, db_file):
+    memory, sqlite = managers
+    for manager in (memory, sqlite):
+        task = manager.get_task(1)
+        task.status = 'Выполнена'
+        task.category = 'Работа'
+        task.due_date = '2024-11-30'
+        task.title = 'Купить хлеб'
+        manager.delete_task(manager.get_task(4))
+    sqlite.close()
+    reopened = TaskManager(db_file)
+    assert dump(reopened.get_tasks()) == dump(memory.get_tasks())
+    assert ids(reopened.get_tasks_by_keyword('хлеб')) == [1]
+    assert reopened.get_tasks_by_keyword('молоко') == []
+    assert reopened.task_id == 4
+    reopened.delete_task('Работа')
+    assert reopened.size == 0
+    reopened.close()
+
+
+def test_migrate_round_trip(managers, tmp_path, db_file):
+    memory, sqlite = managers
+    json_file = str(tmp_path / 'tasks.json')
+    memory.save_tasks(json_file)
+    copy_file = str(tmp_path / 'copy.sqlite3')
+    assert migrate(json_file, copy_file) == 4
+    copy = TaskManager(copy_file)
+    assert dump(copy.tasks) == dump(sqlite.tasks)
+    copy.close()
+    back_file = str(tmp_path / 'back.json')
+    assert migrate(copy_file, back_file) == 4
+    assert dump(TaskManager(back_file).tasks) == dump(memory.tasks)
+    with pytest.raises(ValueError):
+        migrate(db_file, db_file)
@@ -0,0 +1,103 @@
+import multiprocessing
+
+from task_manager import TaskManager
+from task_sync import SharedTaskFile, merge_records
+
+WRITERS = 6
+ROUNDS = 15
+
+
+def setup_file(file_name, count):
+    manager = TaskManager(file_name, shared=True)
+    for i in range(count):
+        manager.add_task(f'Задача {i}', 'Описание', 'Общее', '2024-12-01',
+                         'Низкий')
+    manager.save_tasks(file_name)
+    manager.close()
+
+
+def test_concurrent_saves_merge(tmp_path):
+    file_name = str(tmp_path / 'tasks.json')
+    setup_file(file_name, 3)
+    first = TaskManager(file_name, shared=True)
+    second = TaskManager(file_name, shared=True)
+    first.add_task('Первая', 'От первого', 'Дом', '2024-12-02', 'Средний')
+    second.add_task('Вторая', 'От второго', 'Дом', '2024-12-03', 'Средний')
+    assert (first.task_id - 1, second.task_id - 1) == (4, 5)
+    first.get_task(1).status = 'Выполнена'
+    first.save_tasks(file_name)
+    second.get_task(2).priority = 'Высокий'
+    second.delete_task(second.get_task(3))
+    second.save_tasks(file_name)
+    # Второй менеджер получил задачи первого без полной перезагрузки.
+    assert second.get_task(1).status == 'Выполнена'
+    assert second.get_task(4).title == 'Первая'
+    tasks = {task.id: task for task in TaskManager(file_name).tasks}
+    assert sorted(tasks) == [1, 2, 4, 5]
+    assert tasks[1].status == 'Выполнена'
+    assert tasks[2].priority == 'Высокий'
+    first.save_tasks(file_name)
+    assert sorted(task.id for task in TaskManager(file_name).tasks) == [
+        1, 2, 4, 5]
+
+
+def test_autosave_merges(tmp_path):
+    file_name = str(tmp_path / 'tasks.json')
+    setup_file(file_name, 2)
+    saver = TaskManager(file_name, shared=True)
+    saver.get_task(1).title = 'До автосохранения'
+    saver.start_autosave(interval=60)
+    other = TaskManager(file_name, shared=True)
+    other.get_task(2).status = 'Выполнена'
+    other.save_tasks(file_name)
+    saver.add_task('Новая', 'Описание', 'Дом', '2024-12-05', 'Низкий')
+    assert saver.flush(timeout=5)
+    saver.close()
+    tasks = {task.id: task for task in TaskManager(file_name).tasks}
+    assert sorted(tasks) == [1, 2, 3]
+    assert tasks[1].title == 'До автосохранения'
+    assert tasks[2].status == 'Выполнена'
+
+
+def test_meta_file(tmp_path):
+    shared = SharedTaskFile(str(tmp_path / 'tasks.json'))
+    assert shared.read_generation() == 0
+    assert shared.allocate_ids(3, 5) == 5
+    assert shared.allocate_ids(1, 2) == 8
+    (tmp_path / 'tasks.json.meta').write_text('{"generation": ')
+    assert shared.allocate_ids(1, 2) == 2
+    merged = merge_records({1: {'id': 1}, 2: {'id': 2}},
+                           {2: None, 3: {'id': 3}})
+    assert merged == {1: {'id': 1}, 3: {'id': 3}}
+
+
+def writer(file_name, number):
+    manager = TaskManager(file_name, shared=True)
+    own = manager.get_task(number + 1)
+    for i in range(ROUNDS):
+        manager.add_task(f'{number}-{i}', 'Нагрузка', 'Нагрузка',
+                         '2024-12-10', 'Низкий')
+        own.description = f'Итерация {i}'
+        manager.save_tasks(file_name)
+    manager.close()
+
+
+def test_concurrent_writer_processes(tmp_path):
+    file_name = str(tmp_path / 'tasks.json')
+    setup_file(file_name, WRITERS)
+    processes = [multiprocessing.Process(target=writer,
+                                         args=(file_name, number))
+                 for number in range(WRITERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    tasks = TaskManager(file_name).tasks
+    assert len({task.id for task in tasks}) == len(tasks)
+    assert sorted(task.title for task in tasks
+                  if task.category == 'Нагрузка') == sorted(
+        f'{number}-{i}' for number in range(WRITERS) for i in range(ROUNDS))
+    last = f'Итерация {ROUNDS - 1}'
+    assert [task.description for task in tasks
+            if task.category == 'Общее'] == [last] * WRITERS
@@ -0,0 +1,145 @@
+import pytest
+from task_manager import TaskManager
+from task_migrate import migrate
+from task_transfer import export_tasks, format_of, import_tasks, main
+
+TASKS = [
+    ('Купить молоко', 'В магазине, "у дома"', 'Дом', '2024-12-03', 'Низкий'),
+    ('Отчет', 'Квартальный\nотчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Позвонить', 'Позвонить клиенту', 'Работа', '2024-12-02', 'Средний'),
+]
+
+
+def dump(tasks):
+    return [task.to_dict() for task in tasks]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = TaskManager(str(tmp_path / 'tasks.json'))
+    for task in TASKS:
+        manager.add_task(*task)
+    manager.get_task(2).status = 'Выполнена'
+    return manager
+
+
+def test_add_tasks_bulk(manager):
+    records = [{'title': 'A', 'description': 'B', 'category': 'Дом',
+                'due_date': '2024-11-30', 'priority': 'Низкий'},
+               {'title': 'C', 'description': 'D', 'category': 'Учеба',
+                'due_date': '2024-11-30', 'priority': 'Высокий',
+                'status': 'Выполнена', 'id': 100}]
+    assert manager.add_tasks_bulk(records) == range(4, 6)
+    assert manager.task_id == 6
+    assert [task.id for task in manager.get_tasks('Дом')] == [4, 1]
+    assert manager.get_task(5).status == 'Выполнена'
+    assert manager.get_task(4).due_date is manager.get_task(5).due_date
+    bad = dict(records[0], due_date='2024-02-30')
+    with pytest.raises(ValueError, match='№2'):
+        manager.add_tasks_bulk([records[0], bad])
+    with pytest.raises(ValueError, match="'priority'"):
+        manager.add_tasks_bulk([{'title': 'A', 'description': 'B',
+                                 'category': 'Дом',
+                                 'due_date': '2024-11-30'}])
+    assert manager.size == 5
+    assert manager.task_id == 6
+
+
+@pytest.mark.parametrize('name', ['tasks.csv', 'tasks.jsonl',
+                                  'tasks.csv.gz'])
+def test_export_import_round_trip(manager, tmp_path, name):
+    file_name = str(tmp_path / name)
+    assert export_tasks(manager, file_name) == 3
+    target = TaskManager(str(tmp_path / 'target.json'))
+    assert import_tasks(target, file_name, batch_size=2) == 3
+    assert ([dict(data, id=None) for data in dump(target.get_tasks())]
+            == [dict(data, id=None) for data in dump(manager.get_tasks())])
+    assert export_tasks(manager, file_name, category='Работа') == 2
+
+
+def test_format_of():
+    assert format_of('a.CSV') == 'csv'
+    assert format_of('a.ndjson.xz') == 'jsonl'
+    with pytest.raises(ValueError):
+        format_of('a.json')
+
+
+def test_import_reports_bad_record(tmp_path):
+    file_name = tmp_path / 'tasks.jsonl'
+    file_name.write_text('{"title": "A", "description": "B", '
+                         '"category": "C", "due_date": "2024-01-01", '
+                         '"priority": "Низкий"}\n\nnot json\n',
+                         encoding='utf-8')
+    target = TaskManager(str(tmp_path / 'target.json'))
+    with pytest.raises(ValueError, match='Строка 3'):
+        import_tasks(target, str(file_name))
+    # Импорт выполняется целиком или не выполняется.
+    with pytest.raises(ValueError, match='не импортированы'):
+        import_tasks(target, str(file_name), batch_size=1)
+    assert target.size == 0
+
+
+@pytest.mark.parametrize('name', ['tasks.json', 'tasks.db'])
+def test_main_import_is_atomic(manager, tmp_path, capsys, name):
+    jsonl_file = tmp_path / 'tasks.jsonl'
+    export_tasks(manager, str(jsonl_file))
+    with open(jsonl_file, 'a', encoding='utf-8') as file:
+        file.write('{"title": ""}\n')
+    storage = str(tmp_path / 'storage' / name)
+    (tmp_path / 'storage').mkdir()
+    source = TaskManager(storage)
+    source.add_task(*TASKS[0])
+    source.save_tasks(storage)
+    source.close()
+    assert main(['import', storage, str(jsonl_file)]) == 1
+    assert 'не импортированы' in capsys.readouterr().err
+    # Порции, добавленные до ошибки, удаляются и из базы SQLite.
+    target = TaskManager(storage)
+    with pytest.raises(ValueError):
+        import_tasks(target, str(jsonl_file), batch_size=1)
+    target.save_tasks(storage)
+    target.close()
+    result = TaskManager(storage)
+    assert [task.title for task in result.tasks] == ['Купить молоко']
+    result.close()
+
+
+def test_main(manager, tmp_path, capsys):
+    manager.save_tasks(manager.storage_file)
+    csv_file = str(tmp_path / 'out.csv')
+    storage = str(tmp_path / 'imported.db')
+    assert main(['export', manager.storage_file, csv_file]) == 0
+    assert main(['import', storage, csv_file]) == 0
+    assert main(['import', storage, csv_file, '--format', 'csv']) == 0
+    assert capsys.readouterr().out.splitlines()[-1] == 'Импортировано задач: 3'
+    imported = TaskManager(storage)
+    assert imported.size == 6
+    imported.close()
+    assert main(['import', storage, str(tmp_path / 'missing.csv')]) == 1
+
+
+def test_import_into_shared_file(tmp_path, capsys):
+    storage = str(tmp_path / 'tasks.json')
+    other = TaskManager(storage, shared=True)
+    other.add_task(*TASKS[0])
+    other.save_tasks(storage)
+    source = TaskManager(str(tmp_path / 'source.json'))
+    source.add_task(*TASKS[1])
+    source.save_tasks(source.storage_file)
+    jsonl_file = str(tmp_path / 'new.jsonl')
+    export_tasks(source, jsonl_file)
+    assert main(['import', storage, jsonl_file]) == 0
+    # Сохранение другого процесса не теряет импортированную задачу.
+    other.get_task(1).title = 'Изменено'
+    other.save_tasks(storage)
+    tasks = {task.id: task.title for task in TaskManager(storage).tasks}
+    assert tasks == {1: 'Изменено', 2: 'Отчет'}
+    assert other.get_task(2).title == 'Отчет'
+    # Перенос замещает задачи, и открытый менеджер видит это при
+    # следующем сохранении.
+    assert migrate(source.storage_file, storage) == 1
+    other.add_task(*TASKS[2])
+    other.save_tasks(storage)
+    tasks = {task.id: task.title for task in TaskManager(storage).tasks}
+    assert tasks == {1: 'Отчет', 3: 'Позвонить'}
+    other.close()
@@ -0,0 +1,143 @@
+import os
+
+import pytest
+from task_manager import TaskManager
+from task_workspace import Workspace, split_by_category
+
+TEAM_A = [
+    ('Отчет', 'Квартальный отчет', 'Работа', '2024-12-01', 'Высокий'),
+    ('Купить молоко', 'В магазине', 'Дом', '2024-12-03', 'Низкий'),
+]
+TEAM_B = [
+    ('Позвонить', 'Позвонить клиенту по отчету', 'Работа', '2024-12-02',
+     'Средний'),
+    ('Врач', 'Записаться', 'Здоровье', '2024-11-30', 'Средний'),
+    ('Релиз', 'Выпустить релиз', 'Работа', '2024-12-05', 'Высокий'),
+]
+
+
+def write(file_name, tasks):
+    manager = TaskManager(file_name)
+    for task in tasks:
+        manager.add_task(*task)
+    manager.save_tasks(file_name)
+    manager.close()
+    return file_name
+
+
+@pytest.fixture
+def files(tmp_path):
+    return [write(str(tmp_path / 'a.json'), TEAM_A),
+            write(str(tmp_path / 'b.json.gz'), TEAM_B)]
+
+
+def titles(tasks):
+    return [task.title for task in tasks]
+
+
+def test_federated_queries(files):
+    workspace = Workspace(files)
+    assert titles(workspace.get_tasks()) == [
+        'Врач', 'Отчет', 'Позвонить', 'Купить молоко', 'Релиз']
+    assert titles(workspace.get_tasks('Работа')) == [
+        'Отчет', 'Позвонить', 'Релиз']
+    assert titles(workspace.get_tasks_by_keyword('ОТЧЕТ')) == [
+        'Отчет', 'Позвонить']
+    workspace.get_task(1).status = 'Выполнена'
+    assert titles(workspace.get_tasks_by_status('Выполнена')) == ['Отчет']
+    assert sorted(workspace.get_categories()) == ['Дом', 'Здоровье',
+                                                  'Работа']
+    workspace.close()
+
+
+def test_unique_ids_and_changed_shards(files):
+    workspace = Workspace(files)
+    ids = [task.id for task in workspace.get_tasks()]
+    assert sorted(ids) == [1, 2, 3, 4, 5]
+    # Задачи второго файла с занятыми ID 1 и 2 получили новые ID,
+    # а задача с ID 3 сохранила свой.
+    assert workspace.changed_files() == [files[1]]
+    assert titles(workspace.get_task(i) for i in (3, 4, 5)) == [
+        'Релиз', 'Врач', 'Позвонить']
+    assert workspace.save() == [files[1]]
+    assert workspace.save() == []
+    with pytest.raises(ValueError, match='файл шарда'):
+        workspace.add_task('A', 'B', 'Дом', '2024-12-01', 'Низкий')
+    task = workspace.add_task('Ремонт', 'Вызвать мастера', 'Дом',
+                              '2024-12-04', 'Низкий', file_name=files[0])
+    assert task.id == 6
+    workspace.delete_task(workspace.get_task(2))
+    assert workspace.changed_files() == [files[0]]
+    workspace.save()
+    workspace.close()
+    reopened = Workspace(files)
+    assert [task.id for task in reopened.get_tasks()] == [4, 1, 5, 6, 3]
+    assert reopened.changed_files() == []
+    reopened.close()
+
+
+def test_sqlite_shard_ids(tmp_path):
+    db_file = write(str(tmp_path / 'b.db'), TEAM_B)
+    json_file = write(str(tmp_path / 'a.json'), TEAM_A)
+    modified = os.path.getmtime(db_file)
+    # ID задач шарда JSON меняются только в памяти.
+    workspace = Workspace([db_file, json_file])
+    assert sorted(task.id for task in workspace.get_tasks()) == [
+        1, 2, 3, 4, 5]
+    assert workspace.changed_files() == [json_file]
+    workspace.close()
+    # Для шарда SQLite новые ID пришлось бы записать в базу.
+    workspace = Workspace([json_file, db_file])
+    with pytest.raises(ValueError, match='уже заняты'):
+        workspace.load()
+    workspace.close()
+    assert os.path.getmtime(db_file) == modified
+    assert [task.id for task in TaskManager(db_file).tasks] == [1, 2, 3]
+
+
+def test_split_by_category(tmp_path):
+    source = write(str(tmp_path / 'all.json'), TEAM_A + TEAM_B)
+    files = split_by_category(source, str(tmp_path / 'shards'), '.json.gz')
+    assert sorted(os.path.basename(name) for name in files) == sorted(
+        ['%D0%94%D0%BE%D0%BC.json.gz',
+         '%D0%97%D0%B4%D0%BE%D1%80%D0%BE%D0%B2%D1%8C%D0%B5.json.gz',
+         '%D0%A0%D0%B0%D0%B1%D0%BE%D1%82%D0%B0.json.gz'])
+    workspace = Workspace(files, by_category=True)
+    assert workspace.get_categories() == ['Дом', 'Здоровье', 'Работа']
+    assert [task.id for task in workspace.get_tasks('Работа')] == [1, 3, 5]
+    assert workspace.changed_files() == []
+    assert sum(shard.manager is not None
+               for shard in workspace._shards) == 1
+    task = workspace.add_task('Курс', 'Записаться на курс', 'Учеба',
+                              '2024-12-10', 'Низкий')
+    assert task.id == 6
+    assert workspace.get_tasks('Учеба') == [task]
+    workspace.delete_task('Дом')
+    assert workspace.get_categories() == ['Здоровье', 'Работа', 'Учеба']
+    saved = workspace.save()
+    assert len(saved) == 2 and saved[1].endswith('.json.gz')
+    workspace.close()
+    reopened = Workspace(saved, by_category=True)
+    assert titles(reopened.get_tasks()) == ['Курс']
+    reopened.close()
+
+
+def test_category_change_moves_task(tmp_path):
+    source = write(str(tmp_path / 'all.json'), TEAM_A + TEAM_B)
+    files = split_by_category(source, str(tmp_path / 'shards'))
+    workspace = Workspace(files, by_category=True)
+    [task] = workspace.get_tasks('Дом')
+    task.category = 'Работа'
+    assert workspace.get_tasks('Дом') == []
+    assert [task.id for task in workspace.get_tasks('Работа')] == [
+        1, 3, 2, 5]
+    workspace.get_task(4).category = 'Учеба'
+    assert titles(workspace.get_tasks('Учеба')) == ['Врач']
+    workspace.delete_task('Работа')
+    assert titles(workspace.get_tasks()) == ['Врач']
+    saved = workspace.save()
+    workspace.close()
+    reopened = Workspace(saved, by_category=True)
+    assert titles(reopened.get_tasks('Учеба')) == ['Врач']
+    assert reopened.get_tasks('Работа') == reopened.get_tasks('Дом') == []
+    reopened.close()